@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import tick_list
+from src.data_loader import BloombergXMLAdapter, YahooFinanceAdapter, parsed_file_cache
+
+
+@pytest.fixture
+def vendor_files(scale, tmp_path_factory):
+    ticks = tick_list(scale["ticks"], scale["symbols"])
+    root = tmp_path_factory.mktemp(f"vendor-{scale['label']}")
+    yahoo, bbg = root / "yahoo.jsonl", root / "bloomberg.xml"
+    with open(yahoo, "w", encoding="utf-8") as f:
+        for t in ticks:
+            f.write(json.dumps({"symbol": t.symbol, "time": t.time.isoformat(), "price": t.price}) + "\n")
+    with open(bbg, "w", encoding="utf-8") as f:
+        f.write("<feed>")
+        for t in ticks:
+            f.write(f'<data symbol="{t.symbol}" time="{t.time.isoformat()}" price="{t.price}"/>')
+        f.write("</feed>")
+    return len(ticks), yahoo, bbg
+
+
+@pytest.mark.parametrize("adapter_cls, which", [(YahooFinanceAdapter, 1), (BloombergXMLAdapter, 2)])
+def test_adapter_iter_ticks(measure, vendor_files, adapter_cls, which):
+    n, path = vendor_files[0], vendor_files[which]
+    adapter = adapter_cls(path)
+    measure(lambda: sum(1 for _ in adapter.iter_ticks()), items=n, rounds=3)
+
+
+def test_adapter_cached_get_data(measure, vendor_files, scale):
+    adapter = YahooFinanceAdapter(vendor_files[1])
+    parsed_file_cache.clear()
+    adapter.get_data("S00000")  # parse once
+    symbols = [f"S{j:05d}" for j in range(scale["symbols"])]
+    measure(lambda: [adapter.get_data(s) for s in symbols], items=len(symbols))
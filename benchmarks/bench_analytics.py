@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import price_matrix
+from src import analytics
+from src.analytics import (BetaDecorator, DrawdownDecorator, VolatilityDecorator,
+                           universe_metrics)
+
+
+class _Instrument:
+    symbol = "S00000"
+    name = "Synthetic"
+    instrument_type = "Stock"
+
+
+def test_decorator_stack_cold(measure, scale):
+    m = price_matrix(scale["ticks"], 2)
+    prices, market = m[:, 0], m[:, 1]
+
+    def stack():
+        analytics._KERNELS.clear()  # measure the kernel, not the memo
+        d = DrawdownDecorator(BetaDecorator(VolatilityDecorator(_Instrument(), prices),
+                                            prices, market), prices)
+        return d.get_metrics()
+
+    measure(stack, items=len(prices))
+
+
+def test_universe_metrics(measure, scale):
+    rows = max(scale["ticks"] // scale["symbols"], 2)
+    m = price_matrix(rows, scale["symbols"] + 1)
+    measure(universe_metrics, m[:, 1:], m[:, 0], items=m[:, 1:].size)
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import tick_list
+from src.bars import BarAggregator, resample_panel
+from src.data_loader import ticks_to_panel
+
+
+def test_bar_aggregator_stream(measure, scale):
+    ticks = tick_list(scale["ticks"], scale["symbols"])
+
+    def aggregate():
+        for _ in BarAggregator(interval=60).stream(ticks):
+            pass
+
+    measure(aggregate, items=len(ticks), rounds=3)
+
+
+def test_resample_panel(measure, scale):
+    panel = ticks_to_panel(tick_list(min(scale["ticks"], 100_000), scale["symbols"]))
+    measure(resample_panel, panel, 60, items=panel.size, rounds=3)
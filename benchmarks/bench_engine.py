@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import tick_batch, tick_list
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.patterns.strategy import MeanReversionStrategy
+
+
+def _engine():
+    return Engine(StrategyTickAdapter(MeanReversionStrategy(window=20, k=1.0)))
+
+
+def test_engine_on_tick(measure, scale, capsys):
+    ticks = tick_list(scale["ticks"], scale["symbols"])
+
+    def replay():
+        engine = _engine()
+        for t in ticks:
+            engine.on_tick(t)
+
+    measure(replay, items=len(ticks), rounds=3)
+
+
+def test_engine_run_batch(measure, scale):
+    panel = tick_batch(scale["ticks"], scale["symbols"]).to_panel()
+    measure(lambda: _engine().run_batch(panel), items=scale["ticks"], rounds=3)
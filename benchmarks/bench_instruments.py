@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.patterns.factory import InstrumentFactory, InstrumentTable
+
+
+@pytest.fixture
+def security_master(scale, tmp_path_factory):
+    n = scale["ticks"]
+    path = tmp_path_factory.mktemp(f"master-{scale['label']}") / "instruments.csv"
+    kinds = ("Stock,NASDAQ,USD,,,,", "Bond,,,{c},2035-01-01,,", "ETF,,,,,S&P 500,0.09")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("symbol,issuer,type,exchange,currency,coupon,maturity,underlying_index,expense_ratio\n")
+        for i in range(n):
+            f.write(f"I{i:08d},Issuer {i}," + kinds[i % 3].format(c=i % 7) + "\n")
+    return n, path
+
+
+def test_factory_from_csv(measure, security_master):
+    n, path = security_master
+    measure(InstrumentFactory.from_csv, path, items=n, rounds=3)
+
+
+def test_instrument_table_from_csv(measure, security_master):
+    n, path = security_master
+    measure(InstrumentTable.from_csv, path, items=n, rounds=3)
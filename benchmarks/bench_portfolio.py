@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import portfolio_tree
+
+
+def _nodes(depth, fanout=4, positions=4):
+    return sum(fanout ** level for level in range(depth)) + fanout ** (depth - 1) * positions
+
+
+def test_portfolio_get_value_cold(measure, scale):
+    tree = portfolio_tree(scale["depth"])
+
+    groups = list(_groups(tree))
+
+    def cold():
+        for g in groups:
+            g._value = None
+        return tree.get_value()
+
+    measure(cold, items=_nodes(scale["depth"]))
+
+
+def test_portfolio_get_value_warm(measure, scale):
+    tree = portfolio_tree(scale["depth"])
+    tree.get_value()
+    measure(tree.get_value, items=1)
+
+
+def test_portfolio_update_price(measure, scale):
+    tree = portfolio_tree(scale["depth"])
+    tree.get_value()
+    prices = iter(range(1 << 30))
+    measure(lambda: tree.update_price("S00000", 100.0 + next(prices) % 7), items=1)
+
+
+def _groups(node):
+    stack = [node]
+    while stack:
+        g = stack.pop()
+        yield g
+        stack.extend(c for c in g.children if hasattr(c, "children"))
@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.startup import run_once
+
+
+def test_time_to_first_tick(benchmark):
+    """Fresh interpreter -> first processed tick; mean time is the regression metric."""
+    result = benchmark.pedantic(run_once, rounds=5, iterations=1)
+    benchmark.extra_info["import_ms"] = result["import_ms"]
+    benchmark.extra_info["heavy_modules"] = result["heavy_modules"]
+    assert "pandas" not in result["heavy_modules"]
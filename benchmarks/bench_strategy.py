@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.conftest import price_matrix
+from src.patterns.strategy import BreakoutStrategy, MeanReversionStrategy
+
+import pandas as pd  # type: ignore
+
+
+def test_mean_reversion_generate_signals(measure, scale):
+    prices = price_matrix(scale["ticks"], 1)[:, 0].tolist()
+    measure(MeanReversionStrategy(window=20, k=1.0).generate_signals, prices,
+            items=len(prices), rounds=3)
+
+
+def test_mean_reversion_streaming_update(measure, scale):
+    prices = price_matrix(scale["ticks"], 1)[:, 0].tolist()
+    strategy = MeanReversionStrategy(window=20, k=1.0)
+
+    def stream():
+        s = strategy.clone()
+        for p in prices:
+            s.update(p)
+
+    measure(stream, items=len(prices), rounds=3)
+
+
+@pytest.mark.parametrize("cls, params", [(MeanReversionStrategy, {"window": 20, "k": 1.0}),
+                                         (BreakoutStrategy, {"lookback": 20})])
+def test_generate_signal_frame(measure, scale, cls, params):
+    rows = scale["ticks"] // scale["symbols"]
+    panel = pd.DataFrame(price_matrix(rows, scale["symbols"]))
+    measure(cls(**params).generate_signal_frame, panel, items=panel.size, rounds=3)
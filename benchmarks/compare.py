@@ -0,0 +1,77 @@
+"""
+Compare a pytest-benchmark JSON run against the stored baseline.
+
+    pytest benchmarks --benchmark-json=current.json
+    python -m benchmarks.compare current.json                 # exit 1 on regression
+    python -m benchmarks.compare current.json --threshold 0.2
+    python -m benchmarks.compare current.json --update        # accept as new baseline
+
+The baseline keeps only what is compared: mean seconds and peak memory per
+benchmark. A benchmark regresses when either grows by more than `threshold`
+(relative) over the baseline.
+"""
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import json
+import sys
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def summarize(results: dict) -> dict[str, dict]:
+    """pytest-benchmark JSON -> {fullname: {"mean_s", "peak_mem_bytes"}}."""
+    out = {}
+    for b in results["benchmarks"]:
+        out[b["fullname"]] = {
+            "mean_s": b["stats"]["mean"],
+            "peak_mem_bytes": b.get("extra_info", {}).get("peak_mem_bytes"),
+        }
+    return out
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list[str]:
+    """Human-readable regression lines (empty when nothing regressed)."""
+    regressions = []
+    for name, cur in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("mean_s", "peak_mem_bytes"):
+            old, new = base.get(metric), cur.get(metric)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(f"{name}: {metric} {old:.6g} -> {new:.6g} (+{new / old - 1:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("results", type=Path, help="output of pytest --benchmark-json")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="allowed relative slowdown / memory growth (default 0.10)")
+    ap.add_argument("--update", action="store_true", help="merge these results into the baseline")
+    args = ap.parse_args(argv)
+
+    current = summarize(json.loads(args.results.read_text()))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    if args.update:
+        baseline.update(current)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline updated with {len(current)} benchmarks: {args.baseline}")
+        return 0
+
+    missing = sorted(set(current) - set(baseline))
+    if missing:
+        print(f"{len(missing)} benchmarks have no baseline (run with --update to add them)")
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print("REGRESSION", line)
+    print(f"{len(current) - len(missing)} compared, {len(regressions)} regressed "
+          f"(threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the pytest-benchmark suite.
+
+    pytest benchmarks                                   # 1k-tick scale only
+    BENCH_SCALE=1m pytest benchmarks                    # 1k, 100k and 1m scales
+    pytest benchmarks --benchmark-json=out.json && python -m benchmarks.compare out.json
+
+Every benchmark records `items` (ticks / rows / nodes processed per call),
+`items_per_s` and `peak_mem_bytes` (tracemalloc peak of one extra, untimed
+call) in the benchmark's extra_info.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from functools import lru_cache
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.models import MarketDataPoint, Position, PortfolioGroup, TickBatch, to_ns
+
+# label -> ticks, symbols, portfolio depth (fan-out 4 per level)
+SCALES = {
+    "1k": {"ticks": 1_000, "symbols": 10, "depth": 3},
+    "100k": {"ticks": 100_000, "symbols": 100, "depth": 5},
+    "1m": {"ticks": 1_000_000, "symbols": 1_000, "depth": 7},
+    "10m": {"ticks": 10_000_000, "symbols": 10_000, "depth": 8},
+}
+
+
+def active_scales() -> list[str]:
+    """Every scale up to and including $BENCH_SCALE (default 1k)."""
+    top = os.environ.get("BENCH_SCALE", "1k")
+    if top not in SCALES:
+        raise ValueError(f"BENCH_SCALE must be one of {list(SCALES)}")
+    labels = list(SCALES)
+    return labels[:labels.index(top) + 1]
+
+
+@pytest.fixture(params=active_scales())
+def scale(request) -> dict:
+    return {"label": request.param, **SCALES[request.param]}
+
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+@lru_cache(maxsize=None)
+def price_matrix(n_rows: int, n_symbols: int, seed: int = 0) -> np.ndarray:
+    """(rows x symbols) geometric random walk prices."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.01, (n_rows, n_symbols))
+    return 100 * np.exp(np.cumsum(steps, axis=0))
+
+
+@lru_cache(maxsize=None)
+def tick_batch(n_ticks: int, n_symbols: int, seed: int = 0) -> TickBatch:
+    """n_ticks round-robin across n_symbols, one second apart per row."""
+    rows = -(-n_ticks // n_symbols)
+    prices = price_matrix(rows, n_symbols, seed).ravel()[:n_ticks]
+    i = np.arange(n_ticks)
+    return TickBatch(to_ns(T0) + (i // n_symbols) * 1_000_000_000, prices, i % n_symbols,
+                     np.zeros(n_ticks), [f"S{j:05d}" for j in range(n_symbols)], [None])
+
+
+@lru_cache(maxsize=None)
+def tick_list(n_ticks: int, n_symbols: int, seed: int = 0) -> tuple[MarketDataPoint, ...]:
+    return tuple(tick_batch(n_ticks, n_symbols, seed))
+
+
+def portfolio_tree(depth: int, fanout: int = 4, positions: int = 4) -> PortfolioGroup:
+    """Balanced tree: `fanout` subgroups per level, `positions` leaves per bottom group."""
+    counter = iter(range(1 << 30))
+
+    def build(level: int) -> PortfolioGroup:
+        g = PortfolioGroup(f"G{level}")
+        if level == depth:
+            for _ in range(positions):
+                g.add(Position(f"S{next(counter) % 1000:05d}", 10, 100.0))
+        else:
+            for _ in range(fanout):
+                g.add(build(level + 1))
+        return g
+
+    return build(1)
+
+
+def peak_memory(fn, *args) -> int:
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture
+def measure(benchmark):
+    """
+    measure(fn, *args, items=n, rounds=None): benchmark fn(*args) and record
+    throughput and peak memory. `rounds` switches to a fixed number of rounds
+    for calls too slow for pytest-benchmark's calibration.
+    """
+    def run(fn, *args, items: int, rounds: int | None = None):
+        if rounds is None:
+            result = benchmark(fn, *args)
+        else:
+            result = benchmark.pedantic(fn, args=args, rounds=rounds, iterations=1)
+        benchmark.extra_info["items"] = items
+        if benchmark.stats is not None:  # None under --benchmark-disable
+            benchmark.extra_info["items_per_s"] = items / benchmark.stats.stats.mean
+            benchmark.extra_info["peak_mem_bytes"] = peak_memory(fn, *args)
+        return result
+    return run
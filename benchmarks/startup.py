@@ -0,0 +1,66 @@
+"""
+Cold-start cost of the simulation entry point.
+
+    python -m benchmarks.startup [runs]
+
+Starts fresh interpreters that import src.main, build an Engine with the
+default strategy and process one tick, and reports:
+
+  time_to_first_tick_ms   wall time from process spawn to the first processed tick
+  import_ms               cumulative -X importtime of src.main
+  heavy_modules           top-level packages costing over 10 ms to import
+"""
+from __future__ import annotations
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FIRST_TICK = """
+import time
+from src.main import Engine, StrategyTickAdapter, MeanReversionStrategy
+engine = Engine(StrategyTickAdapter(MeanReversionStrategy()))
+engine.on_tick({"symbol": "AAPL", "price": 100.0})
+print(time.time_ns())
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def run_once() -> dict:
+    t0 = time.time_ns()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", FIRST_TICK], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    first_tick_ns = int(proc.stdout.strip().splitlines()[-1])
+
+    cumulative = {}
+    for m in _IMPORTTIME.finditer(proc.stderr):
+        cumulative.setdefault(m.group(3), int(m.group(2)))
+    heavy = {name: us / 1000 for name, us in cumulative.items()
+             if "." not in name and name != "src" and us > 10_000}
+    return {
+        "time_to_first_tick_ms": (first_tick_ns - t0) / 1e6,
+        "import_ms": cumulative.get("src.main", 0) / 1000,
+        "heavy_modules": dict(sorted(heavy.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def run(runs: int = 5) -> dict:
+    results = [run_once() for _ in range(runs)]
+    return {
+        "time_to_first_tick_ms": statistics.median(r["time_to_first_tick_ms"] for r in results),
+        "import_ms": statistics.median(r["import_ms"] for r in results),
+        "heavy_modules": results[-1]["heavy_modules"],
+    }
+
+
+if __name__ == "__main__":
+    res = run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
+    print(f"time to first tick: {res['time_to_first_tick_ms']:.1f} ms (median)")
+    print(f"import src.main:    {res['import_ms']:.1f} ms")
+    for name, ms in res["heavy_modules"].items():
+        print(f"  {name:<24} {ms:8.1f} ms")
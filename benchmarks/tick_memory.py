@@ -0,0 +1,83 @@
+"""
+Per-tick memory and construction time of the tick representations.
+
+    python -m benchmarks.tick_memory [n_ticks]
+
+Compares the original dict-meta dataclass tick, the slotted MarketDataPoint
+with interned meta, and the TickBatch struct-of-arrays container.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import gc
+import sys
+import time
+import tracemalloc
+
+from src.models import MarketDataPoint, TickBatch, intern_meta
+
+
+@dataclass(frozen=True)
+class LegacyMarketDataPoint:
+    """The pre-slots tick: instance __dict__ plus a fresh meta dict per tick."""
+    symbol: str
+    time: datetime
+    price: float
+    meta: Optional[Dict[str, Any]] = None
+
+
+SYMBOLS = ["AAPL", "MSFT", "TSLA", "NVDA", "SPY"]
+
+
+def _measure(build):
+    # time without tracing (tracemalloc slows allocation down) and, like timeit,
+    # without the cyclic GC; then measure memory
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - t0
+    finally:
+        gc.enable()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def run(n: int = 200_000) -> dict:
+    t0 = datetime(2024, 1, 2, 9, 30)
+    times = [t0 + timedelta(seconds=i) for i in range(n)]  # shared by every variant
+    prices = [100.0 + (i % 97) * 0.01 for i in range(n)]
+    meta = intern_meta({"source": "yahoo"})
+
+    def legacy():
+        return [LegacyMarketDataPoint(SYMBOLS[i % 5], times[i], prices[i], {"source": "yahoo"})
+                for i in range(n)]
+
+    def slotted():
+        return [MarketDataPoint(SYMBOLS[i % 5], times[i], prices[i], meta) for i in range(n)]
+
+    results = {}
+    ticks = None
+    for name, build in (("legacy", legacy), ("slotted", slotted)):
+        ticks, mem, secs = _measure(build)
+        results[name] = (mem / n, secs / n * 1e9)
+    batch, mem, secs = _measure(lambda: TickBatch.from_ticks(ticks))
+    results["tickbatch"] = (mem / n, secs / n * 1e9)
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    print(f"{n} ticks (datetime/float objects shared, so only container cost is counted)")
+    print(f"{'representation':<16}{'bytes/tick':>12}{'ns/tick':>12}")
+    for name, (bytes_per_tick, ns_per_tick) in run(n).items():
+        print(f"{name:<16}{bytes_per_tick:>12.1f}{ns_per_tick:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,199 @@
-import pandas as pd # type: ignore
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+def _simple_returns(prices):
+    """Column-wise pct_change (row 0 dropped); NaN where either price is missing."""
+    p = np.asarray(prices, dtype=np.float64)
+    if len(p) < 2:
+        return np.empty((0,) + p.shape[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return p[1:] / p[:-1] - 1.0
+
+
+def _volatility(r):
+    """Column-wise sample std of returns, skipping NaN (0 if none, NaN if one)."""
+    ok = ~np.isnan(r)
+    n = ok.sum(axis=0)
+    z = np.where(ok, r, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = z.sum(axis=0) / n
+        ss = (np.where(ok, r - mean, 0.0) ** 2).sum(axis=0)
+        vol = np.sqrt(ss / (n - 1))
+    return np.where(n == 0, 0.0, np.where(n == 1, np.nan, vol))
+
+
+def _beta(r, rm):
+    """Column-wise cov(r, rm) / var(rm) with pairwise-complete overlap, as Series.cov."""
+    rm = np.asarray(rm, dtype=np.float64)
+    rm_ok = rm[~np.isnan(rm)]
+    cols = r.shape[1]
+    has_r = (~np.isnan(r)).any(axis=0)
+    if len(rm_ok) == 0:
+        return np.zeros(cols)
+    var = rm_ok.var(ddof=1) if len(rm_ok) > 1 else np.nan
+    if var == 0:
+        return np.zeros(cols)
+
+    k = min(len(r), len(rm))
+    a, b = r[:k], np.broadcast_to(rm[:k, None], (k, cols))
+    both = ~(np.isnan(a) | np.isnan(b))
+    n = both.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ma = np.where(both, a, 0.0).sum(axis=0) / n
+        mb = np.where(both, b, 0.0).sum(axis=0) / n
+        cov = np.where(both, (a - ma) * (b - mb), 0.0).sum(axis=0) / (n - 1)
+    cov = np.where(n > 1, cov, np.nan)
+    return np.where(has_r, cov / var, 0.0)
+
+
+def _max_drawdown(prices):
+    """Column-wise min of price / running peak - 1, skipping NaN (0 if no rows)."""
+    p = np.asarray(prices, dtype=np.float64)
+    if len(p) == 0:
+        return np.zeros(p.shape[1:])
+    peak = np.fmax.accumulate(p, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = p / peak - 1.0
+    ok = ~np.isnan(dd)
+    out = np.where(ok, dd, np.inf).min(axis=0)
+    return np.where(ok.any(axis=0), out, np.nan)
+
+
+def _sharpe(mean, vol, n, periods_per_year):
+    return float(mean / vol * np.sqrt(periods_per_year)) if n > 1 and vol > 0 else 0.0
+
+
+def _var(returns, level):
+    return -float(np.quantile(returns, 1.0 - level)) if len(returns) else 0.0
+
+
+class MetricsKernel:
+    """
+    Fused single-pass analytics for one price series.
+    Simple returns are computed once; volatility, drawdown, Sharpe and VaR are
+    derived from them together on first use, and beta is memoized per market
+    series. Semantics follow the pandas definitions the decorators started
+    with (pct_change().dropna(), sample std/cov, price / cummax - 1).
+    """
+    def __init__(self, prices, periods_per_year=252, var_level=0.95):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.periods_per_year = periods_per_year
+        self.var_level = var_level
+        self.returns = _simple_returns(self.prices)
+        self._stats = None
+        self._betas = {}
+
+    def stats(self):
+        if self._stats is None:
+            r = self.returns[~np.isnan(self.returns)]
+            n = len(r)
+            mean = float(r.mean()) if n else 0.0
+            vol = float(_volatility(self.returns[:, None])[0])
+            self._stats = {
+                "volatility": vol,
+                "mean_return": mean,
+                "sharpe": _sharpe(mean, vol, n, self.periods_per_year),
+                "var": _var(r, self.var_level),
+                "max_drawdown": float(_max_drawdown(self.prices[:, None])[0]),
+            }
+        return self._stats
+
+    def sharpe(self, periods_per_year=None):
+        """Sharpe annualized over `periods_per_year` (default: the kernel's)."""
+        s = self.stats()
+        if periods_per_year is None or periods_per_year == self.periods_per_year:
+            return s["sharpe"]
+        n = int(np.count_nonzero(~np.isnan(self.returns)))
+        return _sharpe(s["mean_return"], s["volatility"], n, periods_per_year)
+
+    def var(self, level=None):
+        """Historical VaR at confidence `level` (default: the kernel's)."""
+        if level is None or level == self.var_level:
+            return self.stats()["var"]
+        return _var(self.returns[~np.isnan(self.returns)], level)
+
+    def beta(self, market):
+        """Beta vs. another kernel's returns: cov(r, rm) / var(rm)."""
+        key = id(market)
+        if key not in self._betas:
+            beta = float(_beta(self.returns[:, None], market.returns)[0])
+            self._betas[key] = (market, beta)  # hold market so its id stays unique
+        return self._betas[key][1]
+
+
+def universe_metrics(prices, market_prices, instruments=None):
+    """
+    Volatility, beta and max drawdown for every column of a (time x instrument)
+    price matrix in one set of NumPy matrix operations.
+
+    `prices` is a DataFrame (columns = symbols) or a 2-D array. Results are
+    keyed by the Instrument objects (e.g. from InstrumentFactory): matched to
+    DataFrame columns by symbol, or taken in column order for arrays. Without
+    instruments, results are keyed by column name. Each value has the same
+    keys as a stacked Volatility/Beta/Drawdown decorator chain.
+    """
+    columns = getattr(prices, "columns", None)
+    if columns is not None:
+        if instruments is not None:
+            by_symbol = {inst.symbol: inst for inst in instruments}
+            columns = [c for c in columns if c in by_symbol]
+            keys = [by_symbol[c] for c in columns]
+            prices = prices[columns]
+        else:
+            keys = list(columns)
+        matrix = prices.to_numpy(dtype=np.float64)
+    else:
+        matrix = np.asarray(prices, dtype=np.float64)
+        keys = list(instruments) if instruments is not None else list(range(matrix.shape[1]))
+        if len(keys) != matrix.shape[1]:
+            raise ValueError("instruments must align with the price matrix columns")
+        if len(set(keys)) != len(keys):
+            raise ValueError("instruments must be distinct: equal instruments would share one result")
+
+    r = _simple_returns(matrix)
+    vol = _volatility(r)
+    beta = _beta(r, _simple_returns(np.asarray(market_prices, dtype=np.float64)))
+    mdd = _max_drawdown(matrix)
+
+    out = {}
+    for j, key in enumerate(keys):
+        m = MetricsDecorator(key).get_metrics() if not isinstance(key, (str, int)) else {"symbol": key}
+        m["volatility"] = float(vol[j])
+        m["beta"] = float(beta[j])
+        m["max_drawdown"] = float(mdd[j])
+        out[key] = m
+    return out
+
+
+_KERNELS = OrderedDict()
+_KERNELS_MAX = 256
+_KERNELS_LOCK = threading.Lock()
+
+
+def kernel_for(prices):
+    """
+    Shared MetricsKernel for this price series (memoized by content,
+    LRU-bounded). Thread-safe: the cache is only touched under a lock, and a
+    kernel built concurrently for the same series is dropped for the cached one.
+    """
+    arr = np.ascontiguousarray(prices, dtype=np.float64)
+    key = (arr.shape, hashlib.blake2b(arr.tobytes(), digest_size=16).digest())
+    with _KERNELS_LOCK:
+        k = _KERNELS.get(key)
+        if k is not None:
+            _KERNELS.move_to_end(key)
+            return k
+    k = MetricsKernel(arr)
+    with _KERNELS_LOCK:
+        k = _KERNELS.setdefault(key, k)
+        _KERNELS.move_to_end(key)
+        if len(_KERNELS) > _KERNELS_MAX:
+            _KERNELS.popitem(last=False)
+    return k
+
 
 class MetricsDecorator:
     """Base decorator for adding analytics to instruments (stackable)."""
@@ -20,12 +215,12 @@ class VolatilityDecorator(MetricsDecorator):
     """Adds volatility (std of returns)."""
     def __init__(self, instrument, prices):
         super().__init__(instrument)
-        self.prices = pd.Series(prices)
+        self.kernel = kernel_for(prices)
+        self.prices = self.kernel.prices
 
     def get_metrics(self):
         m = super().get_metrics()
-        returns = self.prices.pct_change().dropna()
-        m["volatility"] = float(returns.std()) if not returns.empty else 0.0
+        m["volatility"] = self.kernel.stats()["volatility"]
         return m
 
 
@@ -33,17 +228,14 @@ class BetaDecorator(MetricsDecorator):
     """Adds beta vs. market (cov/var)."""
     def __init__(self, instrument, prices, market_prices):
         super().__init__(instrument)
-        self.prices = pd.Series(prices)
-        self.market_prices = pd.Series(market_prices)
+        self.kernel = kernel_for(prices)
+        self.market_kernel = kernel_for(market_prices)
+        self.prices = self.kernel.prices
+        self.market_prices = self.market_kernel.prices
 
     def get_metrics(self):
         m = super().get_metrics()
-        r = self.prices.pct_change().dropna()
-        rm = self.market_prices.pct_change().dropna()
-        if r.empty or rm.empty or rm.var() == 0:
-            m["beta"] = 0.0
-        else:
-            m["beta"] = float(r.cov(rm) / rm.var())
+        m["beta"] = self.kernel.beta(self.market_kernel)
         return m
 
 
@@ -51,14 +243,38 @@ class DrawdownDecorator(MetricsDecorator):
     """Adds max drawdown (min of price/cummax - 1)."""
     def __init__(self, instrument, prices):
         super().__init__(instrument)
-        self.prices = pd.Series(prices)
+        self.kernel = kernel_for(prices)
+        self.prices = self.kernel.prices
 
     def get_metrics(self):
         m = super().get_metrics()
-        if self.prices.empty:
-            m["max_drawdown"] = 0.0
-            return m
-        peak = self.prices.cummax()
-        dd = self.prices / peak - 1.0
-        m["max_drawdown"] = float(dd.min())
-        return m
\ No newline at end of file
+        m["max_drawdown"] = self.kernel.stats()["max_drawdown"]
+        return m
+
+
+class SharpeDecorator(MetricsDecorator):
+    """Adds annualized Sharpe ratio (mean / std of returns, zero risk-free rate)."""
+    def __init__(self, instrument, prices, periods_per_year=252):
+        super().__init__(instrument)
+        self.kernel = kernel_for(prices)
+        self.prices = self.kernel.prices
+        self.periods_per_year = periods_per_year
+
+    def get_metrics(self):
+        m = super().get_metrics()
+        m["sharpe"] = self.kernel.sharpe(self.periods_per_year)
+        return m
+
+
+class VaRDecorator(MetricsDecorator):
+    """Adds one-period historical VaR at confidence `var_level` (loss as a positive number)."""
+    def __init__(self, instrument, prices, var_level=0.95):
+        super().__init__(instrument)
+        self.kernel = kernel_for(prices)
+        self.prices = self.kernel.prices
+        self.var_level = var_level
+
+    def get_metrics(self):
+        m = super().get_metrics()
+        m["var"] = self.kernel.var(self.var_level)
+        return m
@@ -0,0 +1,132 @@
+"""
+asyncio tick sources for Engine.run_async.
+
+Every source is an async iterator of MarketDataPoint:
+
+    adapter_source(adapter)      vendor file adapters, parsed on a worker thread in chunks
+    replay_source(ticks)         any iterable (a list, TickStoreReader.iter_ticks(), ...)
+    socket_source(host, port)    NDJSON {"symbol", "time", "price"} lines from a local socket
+
+merge_sources(*sources) runs each source concurrently into its own bounded
+queue and yields one stream ordered by timestamp, so feeds are ingested while
+the engine is busy processing earlier ticks.
+"""
+from __future__ import annotations
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Iterable
+import asyncio
+import heapq
+import json
+
+from src.data_loader import TickDeduper, tick_merge_key
+from src.models import MarketDataPoint, from_ns, to_ns
+
+_DONE = object()
+
+
+async def adapter_source(adapter, symbols: Iterable[str] | None = None,
+                         chunk_size: int = 1024) -> AsyncIterator[MarketDataPoint]:
+    """Stream adapter.iter_ticks() without blocking the loop: parsing runs in a thread."""
+    wanted = set(symbols) if symbols is not None else None
+    it = adapter.iter_ticks()
+    while True:
+        chunk = await asyncio.to_thread(lambda: list(islice(it, chunk_size)))
+        if not chunk:
+            return
+        for tick in chunk:
+            if wanted is None or tick.symbol in wanted:
+                yield tick
+
+
+async def replay_source(ticks: Iterable[MarketDataPoint], speed: float | None = None,
+                        chunk_size: int = 1024) -> AsyncIterator[MarketDataPoint]:
+    """
+    Replay ticks from an iterable. With `speed`, sleeps so tick spacing follows
+    their timestamps (speed=10 replays ten times faster than real time);
+    otherwise yields to the loop every `chunk_size` ticks.
+    """
+    prev = None
+    for i, tick in enumerate(ticks):
+        if speed:
+            ns = to_ns(tick.time)
+            if prev is not None and ns > prev:
+                await asyncio.sleep((ns - prev) / 1e9 / speed)
+            prev = ns
+        elif i % chunk_size == 0:
+            await asyncio.sleep(0)
+        yield tick
+
+
+def parse_tick_json(line: str | bytes) -> MarketDataPoint:
+    """One NDJSON record -> tick; time may be ISO-8601 or int ns since the epoch."""
+    rec = json.loads(line)
+    t = rec["time"]
+    t = from_ns(t) if isinstance(t, int) else datetime.fromisoformat(t)
+    return MarketDataPoint(rec["symbol"], t, float(rec["price"]))
+
+
+async def socket_source(host: str, port: int) -> AsyncIterator[MarketDataPoint]:
+    """Read NDJSON ticks from a TCP socket until the peer closes it."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        async for line in reader:
+            if line.strip():
+                yield parse_tick_json(line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _pump(source: AsyncIterator, queue: asyncio.Queue, queues: list, errors: list) -> None:
+    try:
+        async for tick in source:
+            await queue.put(tick)
+    except Exception as exc:
+        errors.append(exc)
+        for q in queues:  # wake the merge whichever queue it is waiting on
+            if not q.full():
+                q.put_nowait(_DONE)
+        return
+    await queue.put(_DONE)
+
+
+async def merge_sources(*sources: AsyncIterator[MarketDataPoint], maxsize: int = 1024,
+                        dedupe: bool = False) -> AsyncIterator[MarketDataPoint]:
+    """
+    Async counterpart of data_loader.merge_ticks (same ordering and dedupe rules).
+    Each source is pumped by its own task into a bounded queue (backpressure);
+    a heap holds one head tick per live source. Ties break by source order.
+    A failing source raises its error from the merge as soon as it happens,
+    and the other sources' pumps are cancelled.
+    """
+    seen = TickDeduper() if dedupe else None
+    queues = [asyncio.Queue(maxsize) for _ in sources]
+    errors = []
+    tasks = [asyncio.create_task(_pump(src, q, queues, errors)) for src, q in zip(sources, queues)]
+    try:
+        heap = []
+        seq = 0
+        for i, q in enumerate(queues):
+            tick = await q.get()
+            if errors:
+                raise errors[0]
+            if tick is not _DONE:
+                heap.append((tick_merge_key(tick), i, seq, tick))
+                seq += 1
+        heapq.heapify(heap)
+        while heap:
+            ns, i, _, tick = heap[0]
+            if seen is None or not seen.is_duplicate(tick, ns, i):
+                yield tick
+            nxt = await queues[i].get()
+            if errors:
+                raise errors[0]
+            if nxt is _DONE:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (tick_merge_key(nxt), i, seq, nxt))
+                seq += 1
+    finally:
+        for t in tasks:
+            t.cancel()
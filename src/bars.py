@@ -0,0 +1,175 @@
+"""
+Streaming tick-to-bar aggregation.
+
+    agg = BarAggregator(interval=60, on_bar=bar_engine.on_tick)   # 1-minute bars
+    tick_engine.attach_tick_listener(agg)       # or: for bar in agg.stream(ticks): ...
+
+BarAggregator keeps one open bar per symbol and folds each tick into it with
+O(1) work. Time bars are aligned to multiples of `interval` since the epoch
+and close when the symbol's first tick of a later interval arrives (or on
+flush()); tick bars close on their `ticks`-th tick. A Bar exposes symbol,
+time, price (the close) and meta (its volume), so it can be fed to
+Engine.on_tick, the strategy adapters, or a coarser BarAggregator in place
+of a tick.
+
+resample_panel() is the vectorized path for historical (time x symbol) price
+panels and produces the same time bars.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, Optional
+
+from src.models import MarketDataPoint, from_ns, to_ns
+
+
+class Bar:
+    """One OHLCV bar. `time` is the bar's start; `price` is its close."""
+    __slots__ = ("symbol", "time", "open", "high", "low", "close", "volume", "count")
+
+    def __init__(self, symbol: str, time: datetime, open: float, high: float, low: float,
+                 close: float, volume: float = 0.0, count: int = 0):
+        self.symbol = symbol
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.count = count
+
+    @property
+    def price(self) -> float:
+        return self.close
+
+    @property
+    def meta(self) -> dict:
+        return {"volume": self.volume}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Bar):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"Bar({self.symbol!r}, {self.time!r}, o={self.open}, h={self.high}, "
+                f"l={self.low}, c={self.close}, v={self.volume}, n={self.count})")
+
+
+def _interval_ns(interval) -> int:
+    if isinstance(interval, timedelta):
+        return (interval.days * 86_400 + interval.seconds) * 1_000_000_000 + interval.microseconds * 1_000
+    return int(interval * 1_000_000_000)
+
+
+class BarAggregator:
+    """
+    Per-symbol OHLCV bars on time (`interval`, seconds or a timedelta) or
+    tick-count (`ticks`) boundaries. Completed bars go to `on_bar` and are
+    also returned by on_tick(); volume sums tick.meta["volume"] when present.
+    """
+
+    def __init__(self, interval: float | timedelta | None = None, ticks: int | None = None,
+                 on_bar: Optional[Callable[[Bar], None]] = None):
+        if (interval is None) == (ticks is None):
+            raise ValueError("give exactly one of interval or ticks")
+        self.interval_ns = _interval_ns(interval) if interval is not None else None
+        if self.interval_ns is not None and self.interval_ns <= 0:
+            raise ValueError("interval must be positive")
+        if ticks is not None and ticks < 1:
+            raise ValueError("ticks must be positive")
+        self.ticks = ticks
+        self.on_bar = on_bar
+        self._open: dict = {}  # symbol -> open bar state (see on_tick)
+        self.ticks_in = 0
+        self.bars_out = 0
+
+    def on_tick(self, tick: MarketDataPoint) -> Optional[Bar]:
+        """
+        Fold one tick (or a finer Bar, keeping its high / low / volume / count)
+        into its symbol's bar; returns the bar this input completed, if any.
+        """
+        self.ticks_in += 1
+        if type(tick) is Bar:
+            first, high, low, price, vol, n = tick.open, tick.high, tick.low, tick.close, tick.volume, tick.count
+        else:
+            price = first = high = low = tick.price
+            meta = tick.meta
+            vol = meta.get("volume", 0) if meta else 0
+            n = 1
+        sym = tick.symbol
+        state = self._open.get(sym)
+        done = None
+
+        if self.interval_ns is not None:
+            ns = to_ns(tick.time)
+            bucket = ns - ns % self.interval_ns
+            if state is not None and state[0] != bucket:
+                done = self._close(sym, state)
+                state = None
+            if state is None:
+                # [bucket ns, tz, o, h, l, c, volume, count, inputs]
+                self._open[sym] = [bucket, tick.time.tzinfo, first, high, low, price, vol, n, 1]
+                return done
+        elif state is None:
+            # [None, start time, o, h, l, c, volume, count, inputs]
+            state = self._open[sym] = [None, tick.time, first, high, low, price, vol, n, 1]
+            if self.ticks == 1:
+                return self._close(sym, state)
+            return None
+
+        if high > state[3]:
+            state[3] = high
+        if low < state[4]:
+            state[4] = low
+        state[5] = price
+        state[6] += vol
+        state[7] += n
+        state[8] += 1
+        if self.ticks is not None and state[8] >= self.ticks:
+            done = self._close(sym, state)
+        return done
+
+    def _close(self, sym: str, state: list) -> Bar:
+        del self._open[sym]
+        time = state[1] if state[0] is None else from_ns(state[0], state[1])
+        bar = Bar(sym, time, state[2], state[3], state[4], state[5], state[6], state[7])
+        self.bars_out += 1
+        if self.on_bar is not None:
+            self.on_bar(bar)
+        return bar
+
+    def flush(self) -> list[Bar]:
+        """Close every open (partial) bar, e.g. at the end of a session or replay."""
+        return [self._close(sym, state) for sym, state in list(self._open.items())]
+
+    def stream(self, ticks: Iterable[MarketDataPoint]) -> Iterator[Bar]:
+        """Pipeline stage: ticks in, completed bars out (open bars flushed at the end)."""
+        for tick in ticks:
+            bar = self.on_tick(tick)
+            if bar is not None:
+                yield bar
+        yield from self.flush()
+
+
+def resample_panel(panel, interval: float | timedelta | str) -> dict:
+    """
+    Time bars for a whole (time x symbol) price panel (NaN = no tick), as from
+    ticks_to_panel. Returns {"open", "high", "low", "close", "count"} frames
+    indexed by bar start; a symbol with no tick in an interval gets NaN prices
+    and count 0, where the streaming aggregator would emit no bar. The "close"
+    frame can go straight to Engine.run_batch.
+    """
+    import pandas as pd  # type: ignore
+
+    times = panel.index.get_level_values("time") if panel.index.nlevels > 1 else panel.index
+    times = pd.DatetimeIndex(times)
+    freq = interval if isinstance(interval, str) else pd.Timedelta(_interval_ns(interval), unit="ns")
+    key = times.floor(freq).rename("time")
+    grouped = panel.astype("float64").groupby(key, sort=True)
+    return {
+        "open": grouped.first(),
+        "high": grouped.max(),
+        "low": grouped.min(),
+        "close": grouped.last(),
+        "count": grouped.count(),
+    }
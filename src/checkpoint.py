@@ -0,0 +1,237 @@
+"""
+Engine checkpoints for warm restarts.
+
+    engine.checkpoint("data/engine.ckpt")
+    ...
+    engine = Engine(strategy, invoker=JournalCommandInvoker(journal_path=...))
+    engine.restore("data/engine.ckpt")
+
+A checkpoint holds the ledger, the command invoker's undo/redo history and
+journal position, any pending micro-batch, and the strategy's per-symbol
+streaming state (Strategy.get_state), so signals are valid again straight
+away instead of after replaying the day's ticks. It also records `ticks`,
+the caller's tick position when it was taken.
+
+Resuming after more ticks were processed (restore() with a journaled
+invoker) replays the journal's fills, which moves the book to the end of
+the journal while the strategy state stays at the checkpoint. Pass the ticks
+after the checkpoint's position to Engine.catch_up() to advance the strategy
+without trading them again; alternatively restore(replay_journal=False) and
+replay those ticks through on_tick, which re-derives their fills.
+
+File layout: 8-byte magic, u64 header length, a JSON header, then raw arrays,
+each starting on a 64-byte boundary. The header maps every array to its
+dtype, shape and offset, so load() reads the arrays through one np.memmap
+with no parsing. Strategy buffers (array('d') / ndarray values in the state
+dicts) share a single float64 block. Files are written to a temporary name,
+fsynced and renamed over the target, so a crash never leaves a torn file.
+"""
+from __future__ import annotations
+from array import array
+from pathlib import Path
+from time import monotonic, time
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"ENGCKPT1"
+_HEADER = struct.Struct("<8sQ")
+_ALIGN = 64
+_F8 = "$f8"  # header marker for a buffer stored in the float64 block
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+class _Block:
+    """Collects float buffers into one float64 array; header refs are [start, length]."""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def encode(self, value):
+        if isinstance(value, dict):
+            return {k: self.encode(v) for k, v in value.items()}
+        if isinstance(value, (array, np.ndarray)):
+            arr = np.asarray(value, dtype=np.float64).ravel()
+            ref = {_F8: [self.size, len(arr)]}
+            self.parts.append(arr)
+            self.size += len(arr)
+            return ref
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def array(self) -> np.ndarray:
+        return np.concatenate(self.parts) if self.parts else np.zeros(0)
+
+
+def _decode(value, block: np.ndarray):
+    if isinstance(value, dict):
+        if _F8 in value:
+            start, n = value[_F8]
+            return block[start:start + n]
+        return {k: _decode(v, block) for k, v in value.items()}
+    return value
+
+
+def engine_state(engine, ticks: int | None = None) -> tuple[dict, dict]:
+    """(header, arrays) describing `engine`; the inverse of restore_engine."""
+    book = engine.book
+    header = {"created": time(), "ticks": ticks, "cash": book.cash, "symbols": list(book.symbols)}
+    arrays = {"positions": book.position_array, "avg_cost": book.avg_cost_array}
+
+    invoker = engine.invoker
+    if hasattr(invoker, "get_state"):
+        state = invoker.get_state()
+        arrays["journal"] = state.pop("records")
+        arrays["redo"] = state.pop("redo")
+        header["invoker"] = state
+
+    netter = engine._netter
+    if netter is not None and len(netter):
+        header["pending"] = {"legs": netter._legs, "orders": netter.orders, "ticks": netter.ticks}
+
+    block = _Block()
+    strategy = engine.strategy
+    if hasattr(strategy, "get_state"):
+        header["strategy"] = block.encode(strategy.get_state())
+    arrays["state"] = block.array()
+    return header, arrays
+
+
+def save(engine, path: str | Path, ticks: int | None = None) -> Path:
+    """Atomically write a checkpoint of `engine` to `path`, tagged with tick position `ticks`."""
+    import tempfile
+
+    header, arrays = engine_state(engine, ticks)
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = arr
+        layout[name] = {"dtype": np.lib.format.dtype_to_descr(arr.dtype),
+                        "shape": list(arr.shape), "offset": offset}
+        offset = _aligned(offset + arr.nbytes)
+    header["arrays"] = layout
+    raw = json.dumps(header).encode()
+    data_start = _aligned(_HEADER.size + len(raw))
+
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(raw)))
+            f.write(raw)
+            for name, arr in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def load(path: str | Path) -> tuple[dict, dict]:
+    """(header, arrays) from a checkpoint; arrays are read-only views of a memory map."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        magic, n = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an engine checkpoint")
+        header = json.loads(f.read(n))
+    data_start = _aligned(_HEADER.size + n)
+    mm = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, spec in header.pop("arrays").items():
+        dtype = np.lib.format.descr_to_dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        start = data_start + spec["offset"]
+        arrays[name] = mm[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+    return header, arrays
+
+
+def tick_position(path: str | Path) -> int | None:
+    """The `ticks` position a checkpoint was tagged with (reads the header only)."""
+    with open(path, "rb") as f:
+        magic, n = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an engine checkpoint")
+        return json.loads(f.read(n)).get("ticks")
+
+
+def restore_engine(engine, header: dict, arrays: dict, replay_journal: bool = True) -> int:
+    """
+    Load checkpoint state into `engine`. With replay_journal, fills the
+    invoker's journal recorded after the checkpoint are re-applied to the book
+    (the strategy stays at the checkpoint; see Engine.catch_up). The
+    checkpoint's pending micro-batch is restored unless the replayed tail
+    already holds the batch it was flushed into. Returns the number of replayed journal operations.
+    """
+    engine.book.restore({"cash": header["cash"], "symbols": header["symbols"],
+                         "positions": arrays["positions"], "avg_cost": arrays["avg_cost"]})
+
+    netter = engine._netter
+    if netter is not None:
+        netter.drain(engine.book)
+
+    if "strategy" in header and hasattr(engine.strategy, "set_state"):
+        engine.strategy.set_state(_decode(header["strategy"], arrays["state"]))
+
+    replayed = 0
+    invoker = engine.invoker
+    state = header.get("invoker")
+    if state is not None and hasattr(invoker, "set_state"):
+        if invoker.book is None:
+            invoker.book = engine.book
+        invoker.set_state({**state, "records": arrays["journal"], "redo": arrays["redo"]})
+        if replay_journal:
+            replayed = invoker.replay_journal(state["generation"], state["journal_offset"])
+
+    pending = header.get("pending")
+    # a batch journaled after the checkpoint already drained (and replay applied)
+    # these legs, so keep them only if no newer batch group was replayed
+    if pending and netter is not None and not (replayed and invoker._group > state["group"]):
+        netter._legs = {sym: list(leg) for sym, leg in pending["legs"].items()}
+        netter.orders, netter.ticks = pending["orders"], pending["ticks"]
+    return replayed
+
+
+class Checkpointer:
+    """
+    Tick listener that checkpoints its engine every `every_ticks` ticks and/or
+    `every_s` seconds (checked as ticks arrive). Attach with
+    engine.attach_tick_listener(Checkpointer(engine, path, every_ticks=10_000)).
+    Listeners run before the strategy, so a checkpoint covers the ticks before
+    the current one; it is tagged with that count of ticks seen.
+    """
+
+    def __init__(self, engine, path: str | Path, every_ticks: int | None = None,
+                 every_s: float | None = None):
+        if not every_ticks and not every_s:
+            raise ValueError("give every_ticks and/or every_s")
+        self.engine = engine
+        self.path = Path(path)
+        self.every_ticks = every_ticks
+        self.every_s = every_s
+        self.ticks = 0
+        self.saved = 0
+        self._last = monotonic()
+
+    def on_tick(self, tick) -> None:
+        self.ticks += 1
+        if ((self.every_ticks and self.ticks % self.every_ticks == 0)
+                or (self.every_s and monotonic() - self._last >= self.every_s)):
+            self.checkpoint()
+
+    def checkpoint(self) -> Path:
+        self._last = monotonic()
+        self.saved += 1
+        return save(self.engine, self.path, ticks=self.ticks - 1)
@@ -1,42 +1,255 @@
+from collections import OrderedDict
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import heapq
 import json
+import os
+import sys
+import threading
+from itertools import islice
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from src.models import MarketDataPoint
+from src.models import MarketDataPoint, TickBatch, intern_meta, to_ns
 
+_YAHOO_META = intern_meta({"source": "yahoo"})
+_BLOOMBERG_META = intern_meta({"source": "bloomberg"})
 
-class YahooFinanceAdapter:
+
+def _iter_json_records(f, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Incrementally decode top-level JSON objects from a text stream.
+    Accepts line-delimited JSON, concatenated objects, or a single top-level
+    array of objects; only one record plus one chunk is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    while True:
+        # skip whitespace and top-level array punctuation between records
+        while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                return
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+            continue
+        try:
+            obj, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        if not isinstance(obj, dict):
+            raise ValueError(f"Expected a JSON object per record, got {type(obj).__name__}")
+        yield obj
+
+
+class ParsedFileCache:
+    """
+    LRU cache of parsed vendor files, indexed by symbol.
+    An entry is reused while the file's mtime and size are unchanged and is
+    re-parsed otherwise; at most `maxsize` files are kept.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, path: Path,
+            parse: Callable[[], Iterable[MarketDataPoint]]) -> dict[str, tuple[MarketDataPoint, ...]]:
+        """Return the symbol -> ticks index for `path`, parsing it at most once per version."""
+        key = (kind, str(Path(path).resolve()))
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        index: dict[str, list[MarketDataPoint]] = {}
+        for tick in parse():
+            index.setdefault(tick.symbol, []).append(tick)
+        frozen = {sym: tuple(ticks) for sym, ticks in index.items()}
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (stamp, frozen)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return frozen
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every adapter instance, so re-created adapters reuse parsed files.
+parsed_file_cache = ParsedFileCache()
+
+
+class _CachedLookupMixin:
+    """Symbol lookups served from the shared parsed-file cache."""
+
+    def _index(self) -> dict[str, tuple[MarketDataPoint, ...]]:
+        return parsed_file_cache.get(type(self).__name__, self.filepath, self.iter_ticks)
+
+    def get_data(self, symbol: str) -> MarketDataPoint:
+        """Latest tick for `symbol`; the file is parsed once and cached."""
+        ticks = self._index().get(symbol)
+        if not ticks:
+            raise KeyError(f"{symbol} not found in {self.filepath}")
+        return ticks[-1]
+
+    def get_history(self, symbol: str) -> tuple[MarketDataPoint, ...]:
+        """Every tick for `symbol`, in file order."""
+        return self._index().get(symbol, ())
+
+    def iter_batches(self, batch_size: int = 1 << 16, symbol: str | None = None) -> Iterator[TickBatch]:
+        """Stream the file as columnar TickBatch chunks of up to `batch_size` ticks."""
+        ticks = self.iter_ticks(symbol)
+        while True:
+            batch = TickBatch.from_ticks(islice(ticks, batch_size))
+            if not len(batch):
+                return
+            yield batch
+
+
+class YahooFinanceAdapter(_CachedLookupMixin):
     """Adapter for JSON-based market data."""
 
     def __init__(self, filepath: str | Path):
         self.filepath = Path(filepath)
 
-    def get_data(self, symbol: str) -> MarketDataPoint:
-        with open(self.filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    @staticmethod
+    def _to_point(data: dict) -> MarketDataPoint:
         # assume JSON shape: { "symbol": "AAPL", "time": "2020-01-01", "price": 100 }
         return MarketDataPoint(
-            symbol=data["symbol"],
+            symbol=sys.intern(data["symbol"]),
             time=datetime.fromisoformat(data["time"]),
             price=float(data["price"]),
-            meta={"source": "yahoo"}
+            meta=_YAHOO_META
         )
 
+    def iter_ticks(self, symbol: str | None = None, chunk_size: int = 1 << 16) -> Iterator[MarketDataPoint]:
+        """Stream every record in the file (optionally one symbol) with bounded memory."""
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            for rec in _iter_json_records(f, chunk_size):
+                if symbol is None or rec.get("symbol") == symbol:
+                    yield self._to_point(rec)
+
 
-class BloombergXMLAdapter:
+class BloombergXMLAdapter(_CachedLookupMixin):
     """Adapter for XML-based market data."""
 
     def __init__(self, filepath: str | Path):
         self.filepath = Path(filepath)
 
-    def get_data(self, symbol: str) -> MarketDataPoint:
-        tree = ET.parse(self.filepath)
-        root = tree.getroot()
+    @staticmethod
+    def _to_point(node: ET.Element) -> MarketDataPoint:
         # assume XML shape: <data symbol="AAPL" time="2020-01-01" price="100.0"/>
-        node = root.find(".")
         return MarketDataPoint(
-            symbol=node.get("symbol"),
+            symbol=sys.intern(node.get("symbol")),
             time=datetime.fromisoformat(node.get("time")),
             price=float(node.get("price")),
-            meta={"source": "bloomberg"}
-        )
\ No newline at end of file
+            meta=_BLOOMBERG_META
+        )
+
+    def iter_ticks(self, symbol: str | None = None) -> Iterator[MarketDataPoint]:
+        """
+        Stream every <... symbol= time= price=/> record in the file.
+        Finished elements are cleared and detached from the root, so memory
+        stays bounded however many records the file holds.
+        """
+        root = None
+        for event, elem in ET.iterparse(self.filepath, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.get("symbol") is None:
+                continue
+            if symbol is None or elem.get("symbol") == symbol:
+                yield self._to_point(elem)
+            if elem is not root:
+                elem.clear()
+                root.clear()
+
+
+def tick_merge_key(tick) -> int:
+    """Sort key for merging vendor streams: timestamp in ns."""
+    return to_ns(tick.time)
+
+
+class TickDeduper:
+    """
+    Drops a (symbol, time) point already emitted by a different source in a
+    time-ordered stream; repeats within one source are kept. Only the symbols
+    at the current timestamp are held.
+    """
+    __slots__ = ("_ns", "_owner")
+
+    def __init__(self):
+        self._ns = None
+        self._owner: dict[str, int] = {}
+
+    def is_duplicate(self, tick, ns: int, source: int) -> bool:
+        if ns != self._ns:
+            self._ns = ns
+            self._owner.clear()
+        return self._owner.setdefault(tick.symbol, source) != source
+
+
+def _keyed(ticks: Iterable[MarketDataPoint], source: int):
+    for tick in ticks:
+        yield tick_merge_key(tick), source, tick
+
+
+def merge_ticks(*sources: Iterable[MarketDataPoint], dedupe: bool = False) -> Iterator[MarketDataPoint]:
+    """
+    Merge individually time-sorted tick iterables into one time-ordered stream.
+    Heap-based k-way merge: O(log k) per tick, one pending tick per source.
+    Equal timestamps come out in source order (then each source's own order);
+    with dedupe, a (symbol, time) point already emitted by an earlier source
+    is dropped.
+    """
+    merged = heapq.merge(*(_keyed(src, i) for i, src in enumerate(sources)),
+                         key=lambda entry: entry[0])
+    seen = TickDeduper() if dedupe else None
+    for ns, source, tick in merged:
+        if seen is None or not seen.is_duplicate(tick, ns, source):
+            yield tick
+
+
+def ticks_to_panel(ticks):
+    """
+    Pivot ticks into a (time x symbol) price panel for batch backtests.
+    Ticks sharing a timestamp share a row; repeated (time, symbol) pairs get
+    their own rows so no tick is dropped. Ticks without a time are ordered by
+    arrival instead.
+    """
+    import pandas as pd  # type: ignore
+
+    rows = []
+    for i, t in enumerate(ticks):
+        if isinstance(t, dict):
+            rows.append((t.get("time", i), t["symbol"], float(t["price"])))
+        else:
+            rows.append((getattr(t, "time", None) or i, t.symbol, float(t.price)))
+    return frame_to_panel(pd.DataFrame(rows, columns=["time", "symbol", "price"]))
+
+
+def frame_to_panel(df):
+    """Pivot a long (time, symbol, price) frame into a (time x symbol) panel."""
+    df = df.assign(seq=df.groupby(["time", "symbol"]).cumcount())
+    panel = df.pivot(index=["time", "seq"], columns="symbol", values="price")
+    return panel.sort_index()
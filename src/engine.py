@@ -1,33 +1,191 @@
 from src.patterns.observer import SignalPublisher
-from src.patterns.command import ExecuteOrderCommand, CommandInvoker
+from src.patterns.command import ExecuteOrderCommand, JournalCommandInvoker, OrderNetter
 from src.data_loader import MarketDataPoint
+from src.models import Signal, TickBatch
+from src.ledger import Ledger
+from time import perf_counter_ns
+import numpy as np
 
 
 class Engine:
-    def __init__(self, strategy):
+    def __init__(self, strategy, publisher=None, invoker=None, instrumentation=None,
+                 batch_ticks=None, batch_us=None):
         self.strategy = strategy
-        self.publisher = SignalPublisher()
-        self.invoker = CommandInvoker()
+        # pass an AsyncSignalPublisher to take observers off the tick path
+        self.publisher = publisher if publisher is not None else SignalPublisher()
 
-        self.book = {
-            "history": [],   
-            "positions": {},  
-            "cash": 1000000 
-        }
+        self.book = Ledger(cash=1000000)
+        # bounded undo history; pass a JournalCommandInvoker with journal_path for crash recovery
+        self.invoker = invoker if invoker is not None else JournalCommandInvoker(self.book)
+        self.tick_listeners = []
+        # an Instrumentation records per-stage latencies; None keeps on_tick on the fast path
+        self.instrumentation = instrumentation
+        # micro-batching: orders are netted per symbol and executed as one undoable
+        # batch every `batch_ticks` ticks or `batch_us` microseconds (checked per tick)
+        self.batch_ticks = batch_ticks
+        self.batch_ns = int(batch_us * 1000) if batch_us else None
+        self._netter = OrderNetter() if batch_ticks or batch_us else None
+
+    def attach_tick_listener(self, listener):
+        """Register an object whose on_tick(tick) sees every tick before the strategy."""
+        self.tick_listeners.append(listener)
 
     def on_tick(self, tick: MarketDataPoint):
+        # with an Instrumentation attached, each stage is timed into its histograms
+        instr = self.instrumentation
+        if instr is not None:
+            t0 = perf_counter_ns()
+        for listener in self.tick_listeners:
+            listener.on_tick(tick)
+        if instr is not None:
+            t1 = perf_counter_ns()
+            instr.histograms["listeners"].record(t1 - t0)
         signals = self.strategy.generate_signals(tick)
+        notify = self.publisher.notify
+        if instr is not None:
+            instr.histograms["strategy"].record(perf_counter_ns() - t1)
+            if signals:
+                notify = self._timed_notify(instr)
+        netter = self._netter
         for signal in signals:
-            signal.setdefault("qty", 1)
-            signal.setdefault("price", tick.price)
-            signal.setdefault("symbol", tick.symbol)
+            if type(signal) is Signal:
+                if signal.price is None:
+                    signal.price = tick.price
+                symbol, side, qty, price = signal.symbol, signal.side_code, signal.qty, signal.price
+            else:  # dict signals from plain strategies
+                signal.setdefault("qty", 1)
+                signal.setdefault("price", tick.price)
+                signal.setdefault("symbol", tick.symbol)
+                symbol, side, qty, price = signal["symbol"], signal["side"], signal["qty"], signal["price"]
 
             # Notify external observers
-            self.publisher.notify(signal)
+            if instr is not None:
+                a = perf_counter_ns()
+            notify(signal)
+            if instr is not None:
+                b = perf_counter_ns()
+
+            # Execute and record order command, or queue it for the batch
+            if netter is None:
+                self.invoker.do(ExecuteOrderCommand(self.book, symbol, side, qty, price))
+            else:
+                netter.add(symbol, side, qty, price)
+            if instr is not None:
+                instr.histograms["notify"].record(b - a)
+                instr.histograms["execute"].record(perf_counter_ns() - b)
+        if netter is not None:
+            self._batch_tick(netter)
+        if instr is not None:
+            end = perf_counter_ns()
+            instr.histograms["tick"].record(end - t0)
+            instr.tick_done(end)
+
+    def _timed_notify(self, instr):
+        """publisher.notify, timing each observer when the publisher is synchronous."""
+        publisher = self.publisher
+        if type(publisher) is not SignalPublisher:
+            return publisher.notify
+        timed = list(zip(publisher.observers, instr.observer_histograms(publisher.observers)))
+
+        def notify(signal):
+            for obs, hist in timed:
+                s = perf_counter_ns()
+                obs.update(signal)
+                hist.record(perf_counter_ns() - s)
+        return notify
+
+    def _batch_tick(self, netter):
+        now = perf_counter_ns()
+        if netter.started_ns is None:
+            netter.started_ns = now
+        netter.ticks += 1
+        if ((self.batch_ticks and netter.ticks >= self.batch_ticks)
+                or (self.batch_ns is not None and now - netter.started_ns >= self.batch_ns)):
+            self.flush()
+
+    def flush(self):
+        """
+        Execute the pending micro-batch: one netted command per symbol, recorded
+        as a single undoable unit. Returns the number of symbols that traded.
+        """
+        netter = self._netter
+        if netter is None:
+            return 0
+        cmd = netter.drain(self.book)
+        if cmd is None:
+            return 0
+        self.invoker.do(cmd)
+        return len(cmd.legs)
+
+    async def run_async(self, source, queue_size=1024):
+        """
+        Consume an async iterator of ticks (see src.async_feed) through on_tick.
+        Ingestion runs as a separate task feeding a bounded queue, so sources
+        keep reading while ticks are processed. Returns the tick count.
+        """
+        import asyncio
+
+        queue = asyncio.Queue(queue_size)
+        done = object()
+
+        async def pump():
+            try:
+                async for tick in source:
+                    await queue.put(tick)
+            finally:
+                await queue.put(done)
+
+        producer = asyncio.create_task(pump())
+        n = 0
+        try:
+            while (tick := await queue.get()) is not done:
+                self.on_tick(tick)
+                n += 1
+            await producer  # re-raise source errors
+        finally:
+            producer.cancel()
+        return n
+
+    def run_batch(self, panel, qty=1):
+        """
+        Vectorized backtest over a (time x symbol) price panel (NaN = no tick)
+        or a TickBatch.
+        Signals for every symbol come from one pass of the strategy's
+        generate_signal_frame; fills, cash and positions are cumulative sums.
+        The final book matches replaying the same ticks through on_tick, but
+        observers are not notified and no undoable commands are recorded.
+        Returns the signal panel plus the cash and position paths.
+        """
+        import pandas as pd  # type: ignore
+
+        if isinstance(panel, TickBatch):
+            panel = panel.to_panel()
+        strategy = getattr(self.strategy, "inner", self.strategy)
+        prices = panel.astype("float64")
+        signals = strategy.generate_signal_frame(prices)
+
+        px = np.nan_to_num(prices.to_numpy())
+        fills = signals.to_numpy() * qty
+        flows = -(fills * px)
 
-            # Execute and record order command
-            cmd = ExecuteOrderCommand(self.book, signal)
-            self.invoker.execute(cmd)
+        # row-major running sum == applying each fill in turn, as on_tick does
+        running = np.cumsum(flows.ravel()).reshape(flows.shape)
+        cash = self.book["cash"] + (running[:, -1] if flows.size else np.zeros(len(prices)))
+        held = np.array([self.book.position(sym) for sym in prices.columns])
+        positions = held + np.cumsum(fills, axis=0)
+
+        rows, cols = np.nonzero(fills)
+        if len(rows):
+            ids = np.full(len(prices.columns), -1)
+            for j in np.unique(cols):  # intern only symbols that actually traded
+                ids[j] = self.book.index(prices.columns[j])
+            self.book.apply_fills(ids[cols], fills[rows, cols], px[rows, cols])
+
+        return {
+            "signals": signals,
+            "cash": pd.Series(cash, index=prices.index),
+            "positions": pd.DataFrame(positions, index=prices.index, columns=prices.columns),
+        }
 
     def attach_observer(self, observer):
         """Register an observer dynamically."""
@@ -35,22 +193,48 @@ class Engine:
 
     def get_position(self, symbol):
         """Return the current position for a symbol."""
-        return self.book["positions"].get(symbol, 0)
+        return self.book.position(symbol)
 
     def get_portfolio_value(self, market_prices=None):
         """
         Compute current portfolio value given market prices.
-        (market_prices: dict {symbol: price})
+        (market_prices: dict {symbol: price}, or an array aligned with book.symbols)
+        """
+        return self.book.market_value(market_prices)
+
+    def checkpoint(self, path, ticks=None):
+        """
+        Atomically snapshot the book, command history and strategy state (see
+        src.checkpoint), tagged with the caller's tick position `ticks`.
+        """
+        from src.checkpoint import save
+        return save(self, path, ticks)
+
+    def restore(self, path, replay_journal=True):
+        """
+        Resume from a checkpoint written by checkpoint(). With a journaled
+        invoker, fills recorded after the checkpoint are replayed on top; the
+        strategy is then behind the book until catch_up() is given the ticks
+        after the checkpoint. Returns the number of replayed journal operations.
+        """
+        from src.checkpoint import load, restore_engine
+        header, arrays = load(path)
+        return restore_engine(self, header, arrays, replay_journal)
+
+    def catch_up(self, ticks):
+        """
+        Advance strategy state over ticks whose fills are already in the book
+        (e.g. replayed from the journal by restore()): signals are generated
+        and discarded, nothing is notified or executed. Returns the tick count.
         """
-        if market_prices is None:
-            market_prices = {}
-        value = self.book["cash"]
-        for sym, qty in self.book["positions"].items():
-            value += qty * market_prices.get(sym, 0)
-        return value
+        n = 0
+        for tick in ticks:
+            self.strategy.generate_signals(tick)
+            n += 1
+        return n
 
     def undo_last_trade(self):
-        """Undo the most recent trade command."""
+        """Undo the most recent trade command (a whole batch in batch mode)."""
         return self.invoker.undo()
 
     def redo_last_trade(self):
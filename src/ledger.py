@@ -0,0 +1,232 @@
+"""
+Array-backed position and cash ledger.
+
+Symbols are interned to dense integer ids; positions and average costs live in
+NumPy arrays indexed by those ids, so batch fills are scatter-adds and
+mark-to-market is one dot product. The ledger still answers book["cash"],
+book["positions"][sym] and book["history"] like the dict book it replaces, so
+ExecuteOrderCommand and existing callers keep working.
+"""
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import Iterator, Sequence
+
+import numpy as np
+
+
+class PositionsView(Mapping):
+    """Live dict-like view of ledger positions, for code written against the dict book."""
+
+    def __init__(self, ledger: "Ledger"):
+        self._ledger = ledger
+
+    def __getitem__(self, symbol: str) -> float:
+        i = self._ledger._ids[symbol]
+        return float(self._ledger._pos[i])
+
+    def __setitem__(self, symbol: str, qty: float) -> None:
+        self._ledger._pos[self._ledger.index(symbol)] = qty
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ledger.symbols)
+
+    def __len__(self) -> int:
+        return len(self._ledger.symbols)
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._ledger.symbols, self._ledger.position_array.tolist())))
+
+
+class Ledger:
+    """Cash plus per-symbol position / average cost arrays."""
+
+    def __init__(self, cash: float = 0.0, capacity: int = 64):
+        self.cash = cash
+        self.history: list = []
+        self.symbols: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._pos = np.zeros(capacity, dtype=np.float64)
+        self._avg = np.zeros(capacity, dtype=np.float64)
+        self.positions = PositionsView(self)
+
+    # -- dict-book compatibility -------------------------------------------
+    _KEYS = ("cash", "positions", "history")
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == "cash":
+            self.cash = value
+        elif key == "history":
+            self.history = value
+        else:
+            raise KeyError(key)
+
+    # -- symbol interning ---------------------------------------------------
+    def index(self, symbol: str) -> int:
+        """Id of `symbol`, allocating a slot (and growing the arrays) on first use."""
+        i = self._ids.get(symbol)
+        if i is None:
+            i = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            if i == len(self._pos):
+                self._pos = np.concatenate([self._pos, np.zeros_like(self._pos)])
+                self._avg = np.concatenate([self._avg, np.zeros_like(self._avg)])
+        return i
+
+    @property
+    def position_array(self) -> np.ndarray:
+        """Positions aligned with `symbols` (a view, not a copy)."""
+        return self._pos[:len(self.symbols)]
+
+    @property
+    def avg_cost_array(self) -> np.ndarray:
+        return self._avg[:len(self.symbols)]
+
+    def position(self, symbol: str) -> float:
+        i = self._ids.get(symbol)
+        return 0.0 if i is None else float(self._pos[i])
+
+    def avg_cost(self, symbol: str) -> float:
+        i = self._ids.get(symbol)
+        return 0.0 if i is None else float(self._avg[i])
+
+    # -- fills --------------------------------------------------------------
+    @staticmethod
+    def _next_avg(pos0: float, avg0: float, qty: float, price: float) -> float:
+        """Average cost after a fill: blend when adding, keep when reducing, reset on flip."""
+        pos1 = pos0 + qty
+        if pos1 == 0:
+            return 0.0
+        if pos0 == 0 or (pos0 > 0) == (qty > 0):
+            return (pos0 * avg0 + qty * price) / pos1
+        if (pos1 > 0) == (pos0 > 0):
+            return avg0
+        return price
+
+    @classmethod
+    def fold_avg(cls, pos0: float, avg0: float, qtys, prices) -> float:
+        """Average cost after applying fills one at a time, in order."""
+        for q, p in zip(qtys, prices):
+            avg0 = cls._next_avg(pos0, avg0, q, p)
+            pos0 += q
+        return avg0
+
+    @staticmethod
+    def _next_avg_array(pos0, avg0, qty, price):
+        """Elementwise _next_avg."""
+        pos1 = pos0 + qty
+        adding = (pos0 == 0) | (np.sign(pos0) == np.sign(qty))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blended = (pos0 * avg0 + qty * price) / pos1
+        return np.where(pos1 == 0, 0.0,
+               np.where(adding, blended,
+               np.where(np.sign(pos1) == np.sign(pos0), avg0, price)))
+
+    def apply_fill(self, symbol: str, qty: float, price: float, cash: float | None = None,
+                   avg: float | None = None):
+        """
+        Apply one signed fill (qty > 0 buys). Cash moves by -qty * price unless an
+        explicit `cash` delta is given, and the average cost follows from the fill
+        unless an explicit resulting `avg` is given. Returns the undo token for
+        revert_fill.
+        """
+        i = self.index(symbol)
+        prev = (float(self._pos[i]), float(self._avg[i]))
+        self._avg[i] = self._next_avg(prev[0], prev[1], qty, price) if avg is None else avg
+        self._pos[i] = prev[0] + qty
+        self.cash += -qty * price if cash is None else cash
+        return prev
+
+    def revert_fill(self, symbol: str, qty: float, price: float, prev, cash: float | None = None) -> None:
+        """Undo apply_fill(symbol, qty, price, cash) given the token it returned."""
+        i = self._ids[symbol]
+        self._pos[i] -= qty  # delta, so positions net correctly even undone out of order
+        self._avg[i] = prev[1]  # exact only when undone in LIFO order (the invoker's contract)
+        self.cash -= -qty * price if cash is None else cash
+
+    def apply_fills(self, symbols: Sequence[str] | np.ndarray, qtys, prices):
+        """
+        Apply many signed fills at once. `symbols` may be names or ledger ids.
+        Fills are netted per symbol: positions, cash and average cost match
+        applying them one by one in order. Returns an undo token for
+        revert_fills.
+        """
+        ids = np.asarray(symbols)
+        if ids.dtype.kind not in "iu":
+            ids = np.fromiter((self.index(s) for s in symbols), dtype=np.int64, count=len(ids))
+        qtys = np.asarray(qtys, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        uids, inverse = np.unique(ids, return_inverse=True)
+        net = np.bincount(inverse, weights=qtys, minlength=len(uids))
+        notional = np.bincount(inverse, weights=qtys * prices, minlength=len(uids))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vwap = np.where(net != 0, notional / net, 0.0)
+
+        prev_pos, prev_avg = self._pos[uids].copy(), self._avg[uids].copy()
+        avg = self._next_avg_array(prev_pos, prev_avg, net, vwap)
+        # the VWAP blend is exact only while every fill adds to the position;
+        # symbols with opposing fills, or fills against the held side, fold in order
+        buys = np.bincount(inverse, weights=qtys > 0, minlength=len(uids))
+        sells = np.bincount(inverse, weights=qtys < 0, minlength=len(uids))
+        seq = ((buys > 0) & (sells > 0)) | ((prev_pos > 0) & (sells > 0)) | ((prev_pos < 0) & (buys > 0))
+        if seq.any():
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[order], np.arange(len(uids) + 1))
+            for u in np.nonzero(seq)[0]:
+                rows = order[bounds[u]:bounds[u + 1]]
+                avg[u] = self.fold_avg(prev_pos[u], prev_avg[u], qtys[rows].tolist(), prices[rows].tolist())
+        self._avg[uids] = avg
+        self._pos[uids] = prev_pos + net
+        cash_delta = -float(notional.sum())
+        self.cash += cash_delta
+        return uids, prev_pos, prev_avg, cash_delta
+
+    def revert_fills(self, token) -> None:
+        uids, prev_pos, prev_avg, cash_delta = token
+        self._pos[uids] = prev_pos
+        self._avg[uids] = prev_avg
+        self.cash -= cash_delta
+
+    # -- valuation ----------------------------------------------------------
+    def price_vector(self, market_prices: Mapping[str, float] | None) -> np.ndarray:
+        """Prices aligned with `symbols` (missing symbols price at 0)."""
+        market_prices = market_prices or {}
+        return np.fromiter((market_prices.get(s, 0.0) for s in self.symbols),
+                           dtype=np.float64, count=len(self.symbols))
+
+    def market_value(self, market_prices: Mapping[str, float] | np.ndarray | None = None) -> float:
+        """Cash plus positions marked at `market_prices` (a dict, or an array aligned with `symbols`)."""
+        if not isinstance(market_prices, np.ndarray):
+            market_prices = self.price_vector(market_prices)
+        return float(self.cash + self.position_array @ market_prices)
+
+    # -- state ----------------------------------------------------------------
+    def snapshot(self) -> dict:
+        return {
+            "cash": self.cash,
+            "symbols": list(self.symbols),
+            "positions": self.position_array.tolist(),
+            "avg_cost": self.avg_cost_array.tolist(),
+        }
+
+    def restore(self, state: Mapping) -> None:
+        self.__init__(cash=state["cash"], capacity=max(64, len(state["symbols"])))
+        for sym in state["symbols"]:
+            self.index(sym)
+        n = len(self.symbols)
+        self._pos[:n] = state["positions"]
+        self._avg[:n] = state["avg_cost"]
+
+    @classmethod
+    def from_dict(cls, book: Mapping) -> "Ledger":
+        """Build a ledger from a dict book ({"cash", "positions", "history"})."""
+        ledger = cls(cash=book.get("cash", 0.0))
+        ledger.history = list(book.get("history", []))
+        for sym, qty in book.get("positions", {}).items():
+            ledger.positions[sym] = qty
+        return ledger
@@ -1,5 +1,6 @@
 from pathlib import Path
-import sys, json, logging
+import sys, json, logging, argparse
+from array import array
 from collections import defaultdict
 
 logging.basicConfig(level=logging.ERROR)
@@ -10,9 +11,22 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.engine import Engine
-from src.data_loader import YahooFinanceAdapter, BloombergXMLAdapter
+from src.patterns.command import JournalCommandInvoker
+from src.data_loader import YahooFinanceAdapter, BloombergXMLAdapter, merge_ticks, ticks_to_panel
 from src.patterns.strategy import MeanReversionStrategy
 from src.patterns.observer import LoggerObserver, AlertObserver
+from src.models import BUY, SELL, SIDE_NAMES, Signal
+
+FALLBACK_TICKS = ({"symbol": "AAPL", "price": 90}, {"symbol": "AAPL", "price": 110})
+
+
+class TickCounter:
+    """Tick listener counting the ticks an engine has processed."""
+    def __init__(self):
+        self.ticks = 0
+
+    def on_tick(self, tick):
+        self.ticks += 1
 
 
 class StrategyTickAdapter:
@@ -20,28 +34,50 @@ class StrategyTickAdapter:
         self.inner = inner
         self.history = defaultdict(list)
         self.history_max = history_max
+        self.streams = {}  # symbol -> per-symbol clone of inner with O(1) rolling state
 
     def generate_signals(self, tick):
         sym = getattr(tick, "symbol", None) or (tick.get("symbol") if isinstance(tick, dict) else None)
         price = getattr(tick, "price", None) or (tick.get("price") if isinstance(tick, dict) else None)
         if sym is None or price is None:
             return []
-        h = self.history[sym]
-        h.append(float(price))
-        if len(h) > self.history_max:
-            h[:] = h[-self.history_max:]
         try:
-            out = self.inner.generate_signals(h)
+            last = self._next_signal(sym, price)
         except Exception:
             return []
-        if not out:
-            return []
-        last = int(out[-1])
         if last == 0:
             return []
-        side = "BUY" if last > 0 else "SELL"
-        print(f"Signal detected → {side} {sym} @ {price}")
-        return [{"symbol": sym, "side": side, "qty": 1, "price": price}]
+        side = BUY if last > 0 else SELL
+        print(f"Signal detected → {SIDE_NAMES[side]} {sym} @ {price}")
+        return [Signal(sym, side, 1, price, getattr(tick, "time", None))]
+
+    def get_state(self):
+        """Per-symbol streaming state (see Strategy.get_state) for checkpoints."""
+        return {"streams": {sym: s.get_state() for sym, s in self.streams.items()},
+                "history": {sym: array("d", h) for sym, h in self.history.items()}}
+
+    def set_state(self, state):
+        self.streams = {}
+        for sym, st in state["streams"].items():
+            stream = self.streams[sym] = self.inner.clone()
+            stream.set_state(st)
+        self.history = defaultdict(list, {sym: [float(v) for v in h]
+                                          for sym, h in state["history"].items()})
+
+    def _next_signal(self, sym, price):
+        if hasattr(self.inner, "update") and hasattr(self.inner, "clone"):
+            stream = self.streams.get(sym)
+            if stream is None:
+                stream = self.streams[sym] = self.inner.clone()
+            return int(stream.update(price))
+
+        # plain batch strategy: re-run on the capped history
+        h = self.history[sym]
+        h.append(float(price))
+        if len(h) > self.history_max:
+            h[:] = h[-self.history_max:]
+        out = self.inner.generate_signals(h)
+        return int(out[-1]) if out else 0
 
 
 def load_config():
@@ -54,7 +90,26 @@ def load_config():
     return {}
 
 
-def main():
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Run the trading simulation.")
+    ap.add_argument("--mode", choices=["batch", "tick", "async"], default="batch",
+                    help="batch: vectorized backtest over a price panel (default); "
+                         "tick: replay ticks one by one through Engine.on_tick; "
+                         "async: ingest both feeds concurrently, merged by timestamp")
+    ap.add_argument("--shards", type=int, default=1,
+                    help="tick mode only: partition symbols across this many worker "
+                         "processes (each worker runs its own copy of the observers)")
+    ap.add_argument("--batch-ticks", type=int, default=None,
+                    help="tick/async mode: net orders per symbol and execute them "
+                         "as one undoable batch every N ticks")
+    args = ap.parse_args(argv)
+    if args.shards > 1 and args.mode != "tick":
+        ap.error("--shards requires --mode tick")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
     print("\n=== Starting Trading Simulation ===\n")
     cfg = load_config()
     symbols = cfg.get("symbols", ["AAPL", "MSFT", "TSLA"])
@@ -69,7 +124,7 @@ def main():
             inner = MeanReversionStrategy()
 
     strategy = StrategyTickAdapter(inner)
-    engine = Engine(strategy)
+    engine = Engine(strategy, batch_ticks=args.batch_ticks)
 
     engine.attach_observer(LoggerObserver())
     engine.attach_observer(AlertObserver())
@@ -78,28 +133,70 @@ def main():
     y = YahooFinanceAdapter(data_dir / "external_data_yahoo.json")
     b = BloombergXMLAdapter(data_dir / "external_data_bloomberg.xml")
 
-    ticks = []
-    for s in symbols:
-        try:
-            t = y.get_data(s)
-            if t: ticks.append(t)
-        except Exception:
-            pass
+    if args.mode == "async":
+        import asyncio
+        from src.async_feed import adapter_source, merge_sources, replay_source
+
+        # both vendor files stream concurrently, merged by timestamp as they are read
+        feeds = merge_sources(adapter_source(y, symbols), adapter_source(b, symbols), dedupe=True)
+        counter = TickCounter()
+        engine.attach_tick_listener(counter)
         try:
-            t = b.get_data(s)
-            if t: ticks.append(t)
-        except Exception:
-            pass
+            n = asyncio.run(engine.run_async(feeds))
+        except Exception as exc:
+            n = counter.ticks
+            if n:  # the engine already traded part of the feed: keep that book as is
+                logger.error("async feeds failed after %d ticks (%s)", n, exc)
+            else:
+                logger.error("async feeds failed (%s); replaying fallback ticks", exc)
+                n = asyncio.run(engine.run_async(replay_source(FALLBACK_TICKS)))
+        engine.flush()
+        print(f"Processed {n} ticks")
+        report(engine)
+        return
+
+    # each vendor file is parsed once into the shared cache, then served per symbol;
+    # the per-(vendor, symbol) histories are merged into one time-ordered replay
+    histories = []
+    for adapter in (y, b):
+        for s in symbols:
+            try:
+                histories.append(adapter.get_history(s))
+            except Exception:
+                break
+    ticks = list(merge_ticks(*histories, dedupe=True))
 
     if not ticks:
-        ticks = [{"symbol": "AAPL", "price": 90}, {"symbol": "AAPL", "price": 110}]
-
-    for t in ticks:
-        sym = getattr(t, "symbol", None) or t.get("symbol")
-        price = getattr(t, "price", None) or t.get("price")
-        print(f"Processing tick → {sym} @ {price}")
-        engine.on_tick(t)
-
+        ticks = list(FALLBACK_TICKS)
+
+    if args.mode == "batch":
+        panel = ticks_to_panel(ticks)
+        print(f"Backtesting {panel.shape[0]} rows x {panel.shape[1]} symbols")
+        result = engine.run_batch(panel)
+        print(f"Signals generated: {int((result['signals'] != 0).sum().sum())}")
+    elif args.shards > 1:
+        from src.sharded_engine import ShardedEngine
+
+        with ShardedEngine(strategy, shards=args.shards,
+                           observers=engine.publisher.observers) as sharded:
+            sharded.on_ticks(ticks)
+        # undo history stayed in the workers: start a fresh one on the merged book
+        engine.book = sharded.book
+        engine.invoker = JournalCommandInvoker(engine.book)
+        alerts = sum(len(getattr(o, "alerts", ())) for obs in sharded.shard_observers.values() for o in obs)
+        print(f"Processed {sharded.ticks_processed} ticks on {args.shards} shards ({alerts} alerts)")
+    else:
+        for t in ticks:
+            sym = getattr(t, "symbol", None) or t.get("symbol")
+            price = getattr(t, "price", None) or t.get("price")
+            print(f"Processing tick → {sym} @ {price}")
+            engine.on_tick(t)
+        engine.flush()
+
+    report(engine)
+
+
+def report(engine):
     print("\n=== Trading Simulation Complete ===")
     print(f"Final cash balance: {engine.book['cash']}")
     print(f"Positions: {engine.book['positions']}")
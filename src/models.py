@@ -1,18 +1,207 @@
 # src/models.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from array import array
+from types import MappingProxyType
 import json
-from typing import Any, Dict, Optional, List
+import sys
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, List
 from abc import ABC, abstractmethod
-@dataclass(frozen=True)
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
 class MarketDataPoint:
     """Represents a single tick of normalized market data."""
     symbol: str
     time: datetime
     price: float
-    meta: Optional[Dict[str, Any]] = None
+    meta: Optional[Mapping[str, Any]] = None
+
+
+_META_CACHE: Dict[tuple, Mapping[str, Any]] = {}
+
+
+def intern_meta(meta: Optional[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]:
+    """
+    Return one shared read-only mapping per distinct meta content, so millions
+    of ticks tagged {"source": "yahoo"} hold a pointer instead of a dict each.
+    Unhashable values are returned unchanged.
+    """
+    if meta is None:
+        return None
+    try:
+        key = tuple(sorted(meta.items()))
+        shared = _META_CACHE.get(key)
+    except TypeError:
+        return meta
+    if shared is None:
+        shared = _META_CACHE[key] = MappingProxyType(dict(meta))
+    return shared
+
+
+BUY, SELL = 1, -1
+SIDE_NAMES = {BUY: "BUY", SELL: "SELL"}
+SIDE_CODES = {"BUY": BUY, "SELL": SELL}
+
+
+class Signal:
+    """
+    A trade signal / order: slotted, with an integer side code (BUY=1,
+    SELL=-1) and an interned symbol. It also answers the dict protocol the
+    engine and observers were written against (signal["side"],
+    signal.get("price"), setdefault), so dict-based observers keep working.
+    """
+    __slots__ = ("symbol", "side_code", "qty", "price", "time")
+    _KEYS = ("symbol", "side", "qty", "price", "time")
+
+    def __init__(self, symbol: str, side, qty: float = 1, price: Optional[float] = None,
+                 time: Optional[datetime] = None):
+        self.symbol = sys.intern(symbol)
+        self.side_code = side if type(side) is int else SIDE_CODES[side.upper()]
+        self.qty = qty
+        self.price = price
+        self.time = time
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "Signal":
+        return cls(d["symbol"], d["side"], d.get("qty", 1), d.get("price"), d.get("time"))
+
+    @property
+    def side(self) -> str:
+        return SIDE_NAMES[self.side_code]
+
+    # -- dict protocol --------------------------------------------------------
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key == "side":
+            self.side_code = value if type(value) is int else SIDE_CODES[value.upper()]
+        elif key in self._KEYS:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS and getattr(self, key) is not None
+
+    def get(self, key: str, default=None):
+        v = getattr(self, key, None) if key in self._KEYS else None
+        return default if v is None else v
+
+    def setdefault(self, key: str, default=None):
+        v = self.get(key)
+        if v is None:
+            self[key] = v = default
+        return v
+
+    def keys(self):
+        return [k for k in self._KEYS if getattr(self, k) is not None]
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.keys()}
+
+    def copy(self) -> "Signal":
+        return Signal(self.symbol, self.side_code, self.qty, self.price, self.time)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Signal):
+            other = other.to_dict()
+        return self.to_dict() == other if isinstance(other, Mapping) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Signal({self.side} {self.qty} {self.symbol} @ {self.price})"
+
+
+Order = Signal
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+
+
+def to_ns(t: datetime) -> int:
+    """datetime -> int64 ns since the epoch (aware values are converted to UTC)."""
+    td = t - (_EPOCH if t.tzinfo is None else _EPOCH_UTC)
+    return (td.days * 86_400 + td.seconds) * 1_000_000_000 + td.microseconds * 1_000
+
+
+def from_ns(ns: int, tz: timezone | None = None) -> datetime:
+    """int ns since the epoch -> datetime (naive unless `tz` is given)."""
+    t = _EPOCH + timedelta(microseconds=int(ns) // 1_000)
+    return t.replace(tzinfo=timezone.utc).astimezone(tz) if tz is not None else t
+
+
+class TickBatch:
+    """
+    Struct-of-arrays container for many ticks: int64 ns times, float64 prices,
+    int32 symbol ids and int16 source ids, with the id -> name tables kept once.
+    About 22 bytes per tick versus a MarketDataPoint plus datetime and float
+    objects per tick.
+    """
+    __slots__ = ("time", "price", "symbol_id", "source_id", "symbols", "sources", "tz")
+
+    def __init__(self, time, price, symbol_id, source_id, symbols, sources, tz=None):
+        self.time = np.asarray(time, dtype=np.int64)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.symbol_id = np.asarray(symbol_id, dtype=np.int32)
+        self.source_id = np.asarray(source_id, dtype=np.int16)
+        self.symbols: List[str] = list(symbols)
+        self.sources: List[Optional[str]] = list(sources)
+        self.tz = tz
+
+    @classmethod
+    def from_ticks(cls, ticks: Iterable[MarketDataPoint]) -> "TickBatch":
+        """Pack ticks; their times must be all naive or all aware (stored as UTC)."""
+        sym_ids: Dict[str, int] = {}
+        src_ids: Dict[Optional[str], int] = {}
+        times, prices = array("q"), array("d")
+        syms, srcs = array("i"), array("h")
+        aware = None
+        for t in ticks:
+            if (t.time.tzinfo is not None) != aware:
+                if aware is not None:
+                    raise ValueError(f"TickBatch cannot mix naive and aware tick times: {t!r}")
+                aware = t.time.tzinfo is not None
+            times.append(to_ns(t.time))
+            prices.append(float(t.price))
+            syms.append(sym_ids.setdefault(t.symbol, len(sym_ids)))
+            src = t.meta.get("source") if t.meta else None
+            srcs.append(src_ids.setdefault(src, len(src_ids)))
+        return cls(
+            np.frombuffer(times, dtype=np.int64), np.frombuffer(prices, dtype=np.float64),
+            np.frombuffer(syms, dtype=np.int32), np.frombuffer(srcs, dtype=np.int16),
+            sym_ids, src_ids, timezone.utc if aware else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __iter__(self) -> Iterator[MarketDataPoint]:
+        symbols, tz = self.symbols, self.tz
+        metas = [intern_meta({"source": s}) if s is not None else None for s in self.sources]
+        for ns, px, sid, src in zip(self.time.tolist(), self.price.tolist(),
+                                    self.symbol_id.tolist(), self.source_id.tolist()):
+            yield MarketDataPoint(symbols[sid], from_ns(ns, tz), px, metas[src])
+
+    def to_panel(self):
+        """(time x symbol) price panel for Engine.run_batch."""
+        import pandas as pd  # type: ignore
+        from src.data_loader import frame_to_panel
+
+        return frame_to_panel(pd.DataFrame({
+            "time": pd.to_datetime(self.time, unit="ns"),
+            "symbol": np.asarray(self.symbols, dtype=object)[self.symbol_id],
+            "price": self.price,
+        }))
 
 class Config:
     """Singleton configuration loader."""
@@ -49,9 +238,13 @@ class Config:
         return cur
     
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Instrument:
-    """Base class for all instruments."""
+    """
+    Base class for all instruments. Frozen, so hashing by value is safe and
+    instruments can key results; subclasses must be frozen dataclasses too.
+    Slotted: no per-instance __dict__, which matters for large security masters.
+    """
     symbol: str
     name: str
     instrument_type: str
@@ -60,19 +253,19 @@ class Instrument:
         return f"{self.instrument_type}: {self.symbol} - {self.name}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Stock(Instrument):
     exchange: str
     currency: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Bond(Instrument):
     coupon: float
     maturity: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ETF(Instrument):
     underlying_index: str
     expense_ratio: float
@@ -97,17 +290,81 @@ class Position(PortfolioComponent):
 
 @dataclass
 class PortfolioGroup(PortfolioComponent):
+    """
+    Composite node. Subtotals and flattened position lists are cached; add()
+    and update_price() invalidate or patch only the path to the root, so
+    re-valuing after a single price change costs O(depth). Mutate the tree
+    through add()/update_price() (or call invalidate()) to keep caches valid.
+    """
     name: str
     children: List[PortfolioComponent] = field(default_factory=list)
+    _parent: Optional["PortfolioGroup"] = field(default=None, init=False, repr=False, compare=False)
+    _value: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _positions: Optional[List[Position]] = field(default=None, init=False, repr=False, compare=False)
+    _leaves: Optional[Dict[str, List[tuple]]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for c in self.children:
+            if isinstance(c, PortfolioGroup):
+                c._parent = self
 
     def add(self, child: PortfolioComponent) -> None:
         self.children.append(child)
+        if isinstance(child, PortfolioGroup):
+            child._parent = self
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop cached aggregates here and in every ancestor."""
+        node = self
+        while node is not None:
+            if node._value is None and node._positions is None and node._leaves is None:
+                break  # ancestors were already invalidated
+            node._value = node._positions = node._leaves = None
+            node = node._parent
 
     def get_value(self) -> float:
-        return sum(c.get_value() for c in self.children)
+        if self._value is None:
+            self._value = sum(c.get_value() for c in self.children)
+        return self._value
 
     def get_positions(self) -> List[Position]:
-        out: List[Position] = []
-        for c in self.children:
-            out.extend(c.get_positions())
-        return out
\ No newline at end of file
+        if self._positions is None:
+            out: List[Position] = []
+            for c in self.children:
+                out.extend(c.get_positions())
+            self._positions = out
+        return list(self._positions)
+
+    def _leaf_index(self) -> Dict[str, List[tuple]]:
+        """symbol -> [(owning group, child slot)] for every position in the subtree."""
+        if self._leaves is None:
+            index: Dict[str, List[tuple]] = {}
+            for i, c in enumerate(self.children):
+                if isinstance(c, PortfolioGroup):
+                    for sym, slots in c._leaf_index().items():
+                        index.setdefault(sym, []).extend(slots)
+                elif isinstance(c, Position):
+                    index.setdefault(c.symbol, []).append((self, i))
+            self._leaves = index
+        return self._leaves
+
+    def update_price(self, symbol: str, price: float) -> int:
+        """
+        Re-price every `symbol` position in this subtree, patching cached
+        subtotals along each leaf's path to the root. Returns the number of
+        positions updated.
+        """
+        slots = self._leaf_index().get(symbol, [])
+        for group, i in slots:
+            old = group.children[i]
+            new = Position(old.symbol, old.quantity, price)
+            group.children[i] = new
+            delta = new.get_value() - old.get_value()
+            node = group
+            while node is not None:
+                if node._value is not None:
+                    node._value += delta
+                node._positions = None
+                node = node._parent
+        return len(slots)
@@ -0,0 +1,260 @@
+"""
+Online (O(1) per price) versions of the analytics decorator metrics.
+
+Each accumulator has three flavours:
+  - cumulative (default): same numbers as the batch decorators on the full history
+  - window=n:  the last n returns (same as the decorators on the last n + 1 prices)
+  - alpha=a:   exponentially weighted, recursive (pandas ewm(adjust=False)) form
+"""
+from __future__ import annotations
+from collections import deque
+from math import isnan, nan, sqrt
+
+from src.patterns.strategy import _INV_COND_TOL
+
+
+class _Moments:
+    """
+    Running mean / (co)variance of paired samples (x, y); y defaults to x.
+    A windowed removal that cancels most of a sum of squares (the same
+    _INV_COND_TOL test as the strategies' rolling std) triggers a recompute
+    over the window.
+    """
+
+    def __init__(self, window: int | None = None, alpha: float | None = None):
+        if window is not None and alpha is not None:
+            raise ValueError("choose window or alpha, not both")
+        if alpha is not None and not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.window = window
+        self.alpha = alpha
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0  # sums of squared deviations / co-deviations
+        self._buf = deque() if window is not None else None
+        self._unstable = False
+
+    def add(self, x: float, y: float) -> None:
+        if self.alpha is not None:
+            a = self.alpha
+            if self.n == 0:
+                self.mean_x, self.mean_y = x, y
+            else:
+                dx, dy = x - self.mean_x, y - self.mean_y
+                self.mean_x += a * dx
+                self.mean_y += a * dy
+                self.m2_x = (1 - a) * (self.m2_x + a * dx * dx)
+                self.m2_y = (1 - a) * (self.m2_y + a * dy * dy)
+                self.c_xy = (1 - a) * (self.c_xy + a * dx * dy)
+            self.n += 1
+            return
+
+        if self._buf is not None:
+            self._buf.append((x, y))
+            if len(self._buf) > self.window:
+                self._remove(*self._buf.popleft())
+        self._push(x, y)
+        if self._unstable:
+            self._recompute()
+
+    def _push(self, x: float, y: float) -> None:
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def _remove(self, x: float, y: float) -> None:
+        self.n -= 1
+        if self.n == 0:
+            self.mean_x = self.mean_y = self.m2_x = self.m2_y = self.c_xy = 0.0
+            return
+        prev_m2_x, prev_m2_y = self.m2_x, self.m2_y
+        dx = x - self.mean_x
+        self.mean_x -= dx / self.n
+        dy = y - self.mean_y
+        self.mean_y -= dy / self.n
+        self.m2_x -= dx * (x - self.mean_x)
+        self.m2_y -= dy * (y - self.mean_y)
+        self.c_xy -= dx * (y - self.mean_y)
+        if prev_m2_x * _INV_COND_TOL > self.m2_x or prev_m2_y * _INV_COND_TOL > self.m2_y:
+            self._unstable = True
+
+    def _recompute(self) -> None:
+        self.n = 0
+        self.mean_x = self.mean_y = self.m2_x = self.m2_y = self.c_xy = 0.0
+        for x, y in self._buf:
+            self._push(x, y)
+        self._unstable = False
+
+    def _denom(self) -> float:
+        # EW moments are already weighted averages; the others are sample (ddof=1)
+        return 1.0 if self.alpha is not None else self.n - 1
+
+    def var_x(self) -> float:
+        return max(self.m2_x, 0.0) / self._denom() if self.n > 1 else nan
+
+    def var_y(self) -> float:
+        return max(self.m2_y, 0.0) / self._denom() if self.n > 1 else nan
+
+    def cov(self) -> float:
+        return self.c_xy / self._denom() if self.n > 1 else nan
+
+
+class _Returns:
+    """Turns a price stream into simple returns, skipping NaN like pct_change().dropna()."""
+    __slots__ = ("last",)
+
+    def __init__(self):
+        self.last = nan
+
+    def push(self, price: float) -> float:
+        prev, self.last = self.last, price
+        return price / prev - 1.0
+
+
+class OnlineVolatility:
+    """Running std of simple returns (VolatilityDecorator)."""
+
+    def __init__(self, window: int | None = None, alpha: float | None = None):
+        self._returns = _Returns()
+        self._m = _Moments(window, alpha)
+
+    def update(self, price: float) -> float:
+        r = self._returns.push(float(price))
+        if not isnan(r):
+            self._m.add(r, r)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self._m.n == 0:
+            return 0.0
+        v = self._m.var_x()
+        return sqrt(v) if not isnan(v) else nan
+
+
+class OnlineBeta:
+    """Running cov(r, rm) / var(rm) over paired price updates (BetaDecorator)."""
+
+    def __init__(self, window: int | None = None, alpha: float | None = None):
+        self._r = _Returns()
+        self._rm = _Returns()
+        self._m = _Moments(window, alpha)
+
+    def update(self, price: float, market_price: float) -> float:
+        r = self._r.push(float(price))
+        rm = self._rm.push(float(market_price))
+        if not (isnan(r) or isnan(rm)):
+            self._m.add(rm, r)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self._m.n == 0:
+            return 0.0
+        var = self._m.var_x()
+        if var == 0:
+            return 0.0
+        return self._m.cov() / var
+
+
+class OnlineDrawdown:
+    """
+    Running peak and max drawdown (DrawdownDecorator). With `window`, the peak
+    is the rolling max of the last `window` prices and max_drawdown the worst
+    drawdown from that rolling peak seen over the same window.
+    """
+
+    def __init__(self, window: int | None = None):
+        self.window = window
+        self.peak = nan
+        self.drawdown = 0.0
+        self._mdd = 0.0
+        self._i = 0
+        self._peaks = deque()   # (i, price), decreasing
+        self._troughs = deque()  # (i, drawdown), increasing
+
+    def update(self, price: float) -> float:
+        p = float(price)
+        if isnan(p):
+            return self.max_drawdown
+        i = self._i
+        self._i += 1
+        if self.window is None:
+            self.peak = p if isnan(self.peak) else max(self.peak, p)
+            self.drawdown = p / self.peak - 1.0
+            self._mdd = min(self._mdd, self.drawdown)
+            return self._mdd
+
+        peaks, troughs = self._peaks, self._troughs
+        while peaks and peaks[-1][1] <= p:
+            peaks.pop()
+        peaks.append((i, p))
+        if peaks[0][0] <= i - self.window:
+            peaks.popleft()
+        self.peak = peaks[0][1]
+        self.drawdown = p / self.peak - 1.0
+        while troughs and troughs[-1][1] >= self.drawdown:
+            troughs.pop()
+        troughs.append((i, self.drawdown))
+        if troughs[0][0] <= i - self.window:
+            troughs.popleft()
+        return self.max_drawdown
+
+    @property
+    def max_drawdown(self) -> float:
+        if self.window is None:
+            return self._mdd
+        return self._troughs[0][1] if self._troughs else 0.0
+
+
+class OnlineMetricsTracker:
+    """
+    Per-symbol online metrics fed from the engine's tick flow:
+
+        tracker = OnlineMetricsTracker(market_symbol="SPY")
+        engine.attach_tick_listener(tracker)
+
+    Beta pairs each symbol return with the market return over the same
+    interval (market price at the symbol's previous tick to now).
+    """
+
+    def __init__(self, market_symbol: str | None = None, window: int | None = None,
+                 alpha: float | None = None):
+        self.market_symbol = market_symbol
+        self.window = window
+        self.alpha = alpha
+        self.market_price = nan
+        self._vol: dict[str, OnlineVolatility] = {}
+        self._beta: dict[str, OnlineBeta] = {}
+        self._dd: dict[str, OnlineDrawdown] = {}
+
+    def on_tick(self, tick) -> None:
+        sym, price = tick.symbol, float(tick.price)
+        if sym == self.market_symbol:
+            self.market_price = price
+        vol = self._vol.get(sym)
+        if vol is None:
+            vol = self._vol[sym] = OnlineVolatility(self.window, self.alpha)
+            self._beta[sym] = OnlineBeta(self.window, self.alpha)
+            self._dd[sym] = OnlineDrawdown(self.window)
+        vol.update(price)
+        self._dd[sym].update(price)
+        if self.market_symbol is not None:
+            self._beta[sym].update(price, self.market_price)
+
+    def get_metrics(self, symbol: str) -> dict:
+        m = {"symbol": symbol,
+             "volatility": self._vol[symbol].value,
+             "max_drawdown": self._dd[symbol].max_drawdown}
+        if self.market_symbol is not None:
+            m["beta"] = self._beta[symbol].value
+        return m
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._vol)
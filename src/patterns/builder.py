@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
+# update_price patches cached totals by deltas, which accumulates rounding
+# error; a node re-sums from its positions after this many patches
+_RESUM_EVERY = 1024
+
 
 @dataclass
 class Portfolio:
@@ -10,13 +14,69 @@ class Portfolio:
     owner: Optional[str] = None
     positions: List[Dict] = field(default_factory=list)
     subportfolios: List["Portfolio"] = field(default_factory=list)
+    _parent: Optional["Portfolio"] = field(default=None, init=False, repr=False, compare=False)
+    _value: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _leaves: Optional[Dict[str, List[tuple]]] = field(default=None, init=False, repr=False, compare=False)
+    _patches: int = field(default=0, init=False, repr=False, compare=False)
 
-    def total_value(self) -> float:
-        """Recursively compute total market value."""
-        value = sum(p["quantity"] * p["price"] for p in self.positions)
+    def __post_init__(self) -> None:
         for sp in self.subportfolios:
-            value += sp.total_value()
-        return value
+            sp._parent = self
+
+    def total_value(self) -> float:
+        """Recursively compute total market value (cached until invalidated)."""
+        if self._value is None:
+            value = sum(p["quantity"] * p["price"] for p in self.positions)
+            for sp in self.subportfolios:
+                value += sp.total_value()
+            self._value = value
+            self._patches = 0
+        return self._value
+
+    def invalidate(self) -> None:
+        """Call after editing positions/subportfolios directly."""
+        node = self
+        while node is not None:
+            node._value = node._leaves = None
+            node = node._parent
+
+    def _leaf_index(self) -> Dict[str, List[tuple]]:
+        """symbol -> [(owning portfolio, position dict)] for the whole subtree."""
+        if self._leaves is None:
+            index: Dict[str, List[tuple]] = {}
+            for p in self.positions:
+                index.setdefault(p["symbol"], []).append((self, p))
+            for sp in self.subportfolios:
+                for sym, slots in sp._leaf_index().items():
+                    index.setdefault(sym, []).extend(slots)
+            self._leaves = index
+        return self._leaves
+
+    def update_price(self, symbol: str, price: float) -> int:
+        """Re-price `symbol` in this subtree, patching cached totals up to the root."""
+        slots = self._leaf_index().get(symbol, [])
+        for owner, p in slots:
+            delta = p["quantity"] * (price - p["price"])
+            p["price"] = price
+            node = owner
+            while node is not None:
+                if node._value is not None:
+                    node._patches += 1
+                    if node._patches >= _RESUM_EVERY:
+                        node._value = None
+                    else:
+                        node._value += delta
+                node = node._parent
+        return len(slots)
+
+    def copy(self) -> "Portfolio":
+        """Independent copy of this subtree: its own position dicts and caches."""
+        return Portfolio(
+            name=self.name,
+            owner=self.owner,
+            positions=[dict(p) for p in self.positions],
+            subportfolios=[sp.copy() for sp in self.subportfolios],
+        )
 
 
 class PortfolioBuilder:
@@ -42,6 +102,8 @@ class PortfolioBuilder:
         return Portfolio(
             name=self.name,
             owner=self.owner,
-            positions=self.positions,
-            subportfolios=self.subportfolios,
+            # copies: neither later builder calls nor another build() may
+            # share (and re-price) these positions behind the value cache
+            positions=[dict(p) for p in self.positions],
+            subportfolios=[sp.copy() for sp in self.subportfolios],
         )
\ No newline at end of file
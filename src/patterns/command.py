@@ -1,17 +1,58 @@
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from src.models import SIDE_CODES, SIDE_NAMES
+
+# Fixed-width journal record shared by the in-memory ring and the spill file.
+# `group` is 0 for standalone commands; legs of one BatchCommand share a group id
+# so they are undone / redone together.
+RECORD_DTYPE = np.dtype([
+    ("kind", "u1"), ("symbol", "S16"), ("qty", "f8"), ("price", "f8"),
+    ("cash", "f8"), ("prev_pos", "f8"), ("prev_avg", "f8"), ("group", "u4"),
+])
+_RECORD_KINDS = {}
+
+
+def _record_kind(code):
+    """Register a command class as journal record kind `code`."""
+    def register(cls):
+        cls.record_kind = code
+        _RECORD_KINDS[code] = cls
+        return cls
+    return register
+
+
+@_record_kind(0)
 class ExecuteOrderCommand:
-    """Simple command: executes and undoes a trade on a broker dict."""
+    """
+    Simple command: executes and undoes a trade on a broker dict,
+    or on a Ledger (anything with apply_fill / revert_fill).
+    """
+    group = 0
+
     def __init__(self, broker, symbol, side, qty, price):
         self.broker = broker
         self.symbol = symbol
-        self.side = side.upper()
+        self.side = SIDE_NAMES[side] if type(side) is int else side.upper()
         self.qty = qty
         self.price = price
         self._done = False
+        self._undo_token = None
+
+    @property
+    def signed_qty(self):
+        return self.qty if self.side == "BUY" else -self.qty if self.side == "SELL" else 0
 
     def execute(self):
         if self._done:
             return
-        if self.side == "BUY":
+        if hasattr(self.broker, "apply_fill"):
+            self._undo_token = self.broker.apply_fill(self.symbol, self.signed_qty, self.price)
+        elif self.side == "BUY":
             self.broker["cash"] -= self.qty * self.price
             self.broker["positions"][self.symbol] = self.broker["positions"].get(self.symbol, 0) + self.qty
         elif self.side == "SELL":
@@ -22,7 +63,9 @@ class ExecuteOrderCommand:
     def undo(self):
         if not self._done:
             return
-        if self.side == "BUY":
+        if hasattr(self.broker, "revert_fill"):
+            self.broker.revert_fill(self.symbol, self.signed_qty, self.price, self._undo_token)
+        elif self.side == "BUY":
             self.broker["cash"] += self.qty * self.price
             self.broker["positions"][self.symbol] -= self.qty
         elif self.side == "SELL":
@@ -30,6 +73,154 @@ class ExecuteOrderCommand:
             self.broker["positions"][self.symbol] += self.qty
         self._done = False
 
+    def to_record(self):
+        """(kind, symbol, signed qty, price, cash delta, prev_pos, prev_avg, group) for the journal."""
+        q = self.signed_qty
+        return _record(self, q, self.price, -q * self.price)
+
+    @classmethod
+    def from_record(cls, broker, rec, done):
+        q = float(rec["qty"])
+        cmd = cls(broker, rec["symbol"].decode(), "BUY" if q >= 0 else "SELL", abs(q), float(rec["price"]))
+        return _restore(cmd, rec, done)
+
+
+def _record_symbol(symbol):
+    raw = symbol.encode()
+    if len(raw) > RECORD_DTYPE["symbol"].itemsize:
+        raise ValueError(f"Symbol too long for a journal record: {symbol}")
+    return raw
+
+
+def _record(cmd, qty, price, cash):
+    symbol = _record_symbol(cmd.symbol)
+    prev_pos, prev_avg = cmd._undo_token if cmd._undo_token is not None else (np.nan, np.nan)
+    return (cmd.record_kind, symbol, qty, price, cash, prev_pos, prev_avg, cmd.group)
+
+
+def _restore(cmd, rec, done):
+    if not np.isnan(rec["prev_pos"]):
+        cmd._undo_token = (float(rec["prev_pos"]), float(rec["prev_avg"]))
+    cmd.group = int(rec["group"])
+    cmd._done = done
+    return cmd
+
+
+@_record_kind(1)
+class NettedOrderCommand:
+    """
+    One symbol's net fill over a micro-batch: signed net quantity, the exact
+    cash delta of the individual fills, and the average cost they leave
+    behind (folded fill by fill; None for dict brokers, which keep no average
+    cost). Opposing orders that cancel out still move cash (the round trip's
+    P&L). The journal stores `avg` in the record's price field.
+    """
+    group = 0
+
+    def __init__(self, broker, symbol, qty, avg, cash):
+        self.broker = broker
+        self.symbol = symbol
+        self.qty = qty
+        self.avg = avg
+        self.cash = cash
+        self._done = False
+        self._undo_token = None
+
+    def execute(self):
+        if self._done:
+            return
+        if hasattr(self.broker, "apply_fill"):
+            self._undo_token = self.broker.apply_fill(self.symbol, self.qty, 0.0, cash=self.cash, avg=self.avg)
+        else:
+            self.broker["cash"] += self.cash
+            self.broker["positions"][self.symbol] = self.broker["positions"].get(self.symbol, 0) + self.qty
+        self._done = True
+
+    def undo(self):
+        if not self._done:
+            return
+        if hasattr(self.broker, "revert_fill"):
+            self.broker.revert_fill(self.symbol, self.qty, 0.0, self._undo_token, cash=self.cash)
+        else:
+            self.broker["cash"] -= self.cash
+            self.broker["positions"][self.symbol] -= self.qty
+        self._done = False
+
+    def to_record(self):
+        return _record(self, self.qty, np.nan if self.avg is None else self.avg, self.cash)
+
+    @classmethod
+    def from_record(cls, broker, rec, done):
+        avg = None if np.isnan(rec["price"]) else float(rec["price"])
+        cmd = cls(broker, rec["symbol"].decode(), float(rec["qty"]), avg, float(rec["cash"]))
+        return _restore(cmd, rec, done)
+
+
+class BatchCommand:
+    """Composite of commands executed, undone and redone as one unit."""
+
+    def __init__(self, legs):
+        self.legs = list(legs)
+        self.broker = self.legs[0].broker if self.legs else None
+        self.group = 0
+
+    def execute(self):
+        for leg in self.legs:
+            leg.group = self.group
+            leg.execute()
+
+    def undo(self):
+        for leg in reversed(self.legs):
+            leg.undo()
+
+
+class OrderNetter:
+    """
+    Collects orders for one micro-batch and nets them per symbol, so a burst
+    of signals becomes one NettedOrderCommand per symbol.
+    """
+    __slots__ = ("_legs", "orders", "ticks", "started_ns")
+
+    def __init__(self):
+        self._legs = {}       # symbol -> [net qty, notional, [[qty, price], ...]]
+        self.orders = 0
+        self.ticks = 0
+        self.started_ns = None
+
+    def add(self, symbol, side, qty, price):
+        q = qty * (side if type(side) is int else SIDE_CODES[side.upper()])
+        leg = self._legs.get(symbol)
+        if leg is None:
+            self._legs[symbol] = [q, q * price, [[q, price]]]
+        else:
+            leg[0] += q
+            leg[1] += q * price
+            leg[2].append([q, price])
+        self.orders += 1
+
+    def __len__(self):
+        return self.orders
+
+    def drain(self, broker):
+        """
+        BatchCommand of the netted legs (None if nothing moves), and reset.
+        Each leg's average cost is folded from `broker`'s current position, so
+        execute the batch before the book changes again.
+        """
+        legs = []
+        for symbol, (net, notional, fills) in self._legs.items():
+            if net == 0 and notional == 0:
+                continue
+            avg = None
+            if hasattr(broker, "fold_avg"):
+                qtys, prices = zip(*fills)
+                avg = broker.fold_avg(broker.position(symbol), broker.avg_cost(symbol), qtys, prices)
+            legs.append(NettedOrderCommand(broker, symbol, net, avg, -notional))
+        self._legs = {}
+        self.orders = self.ticks = 0
+        self.started_ns = None
+        return BatchCommand(legs) if legs else None
+
 
 class CommandInvoker:
     """Handles undo/redo for executed commands."""
@@ -54,4 +245,311 @@ class CommandInvoker:
             return
         cmd = self.undone.pop()
         cmd.execute()
-        self.done.append(cmd)
\ No newline at end of file
+        self.done.append(cmd)
+
+
+def _book_state(book):
+    if hasattr(book, "snapshot"):
+        return {"ledger": book.snapshot()}
+    return {"cash": book["cash"], "positions": dict(book["positions"])}
+
+
+def _records_to_json(records):
+    return [[int(r["kind"]), r["symbol"].decode(), *map(float, (r["qty"], r["price"], r["cash"],
+             r["prev_pos"], r["prev_avg"])), int(r["group"])] for r in records]
+
+
+def _records_from_json(rows):
+    return np.array([(k, sym.encode(), *rest) for k, sym, *rest in rows], dtype=RECORD_DTYPE)
+
+
+def _load_book_state(book, state):
+    if "ledger" in state:
+        book.restore(state["ledger"])
+    else:
+        book["cash"] = state["cash"]
+        book["positions"].clear()
+        book["positions"].update(state["positions"])
+
+
+class JournalCommandInvoker:
+    """
+    Undo/redo invoker with bounded memory.
+
+    Executed commands are kept as fixed-width RECORD_DTYPE records in a ring
+    buffer of `depth` entries; older entries are compacted away and can no
+    longer be undone. Every `snapshot_every` operations the book is
+    snapshotted together with the undo/redo history. With `journal_path`,
+    each do/undo/redo is also appended to a binary journal (truncated at every
+    snapshot), and recover() rebuilds the book and its history after a crash
+    from the last snapshot plus the journal tail.
+    """
+    _DO, _UNDO, _REDO = 0, 1, 2
+    _FILE_RECORD = struct.Struct("<BB16sdddddI")
+    _FILE_HEADER = struct.Struct("<8sQ")
+    _MAGIC = b"CMDJRNL2"
+
+    def __init__(self, book=None, depth=1024, snapshot_every=None, journal_path=None, fsync=False):
+        if depth < 1:
+            raise ValueError("depth must be positive")
+        self.book = book
+        self.depth = depth
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._ring = np.zeros(depth, dtype=RECORD_DTYPE)
+        self._head = 0          # next write slot
+        self._size = 0          # undoable records in the ring
+        self._redo = []         # records undone, newest last
+        self._group = 0         # last BatchCommand group id handed out
+        self.ops = 0            # do/undo/redo since the last snapshot
+        self.compacted = 0      # records that fell out of the undo window
+        self.last_snapshot = None
+
+        self.journal_path = Path(journal_path) if journal_path else None
+        self._generation = 0
+        self._fh = None
+        self._replaying = False
+        if self.journal_path is not None:
+            self._open_journal()
+
+    # -- journal file ---------------------------------------------------------
+    @property
+    def snapshot_path(self):
+        return self.journal_path.with_name(self.journal_path.name + ".snap")
+
+    def _open_journal(self):
+        if self.journal_path.exists() and self.journal_path.stat().st_size >= self._FILE_HEADER.size:
+            with open(self.journal_path, "rb") as f:
+                _, self._generation = self._FILE_HEADER.unpack(f.read(self._FILE_HEADER.size))
+            self._fh = open(self.journal_path, "ab")
+        else:
+            self._fh = open(self.journal_path, "wb")
+            self._fh.write(self._FILE_HEADER.pack(self._MAGIC, self._generation))
+            self._fh.flush()
+
+    def _spill(self, op, rec):
+        if self._fh is None or self._replaying:
+            return
+        self._fh.write(self._FILE_RECORD.pack(op, *rec.tolist()))
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+
+    # -- ring buffer ----------------------------------------------------------
+    def _push(self, rec):
+        evicted = 0
+        if self._size == self.depth:
+            self.compacted += 1
+            evicted = self._ring[self._head]["group"]
+        else:
+            self._size += 1
+        self._ring[self._head] = rec
+        self._head = (self._head + 1) % self.depth
+        # a batch is undone whole or not at all: evict the rest of a compacted group
+        while evicted and self._size and self._ring[(self._head - self._size) % self.depth]["group"] == evicted:
+            self._size -= 1
+            self.compacted += 1
+
+    def _pop(self):
+        self._head = (self._head - 1) % self.depth
+        self._size -= 1
+        return self._ring[self._head].copy()
+
+    def __len__(self):
+        return self._size
+
+    # -- invoker API ----------------------------------------------------------
+    def _command(self, rec, done):
+        return _RECORD_KINDS[int(rec["kind"])].from_record(self.book, rec, done)
+
+    def do(self, cmd):
+        if self.book is None:
+            self.book = cmd.broker
+        legs = getattr(cmd, "legs", None)
+        if legs is not None:
+            if len(legs) > self.depth:
+                raise ValueError(f"batch of {len(legs)} legs exceeds the undo depth {self.depth}")
+            self._group += 1
+            cmd.group = self._group
+        else:
+            self._group = max(self._group, cmd.group)  # replayed batch legs keep their id
+        for leg in (legs if legs is not None else (cmd,)):
+            _record_symbol(leg.symbol)  # fail before the book changes, not after
+        cmd.execute()
+        for leg in (legs if legs is not None else (cmd,)):
+            rec = np.array(leg.to_record(), dtype=RECORD_DTYPE)[()]
+            self._push(rec)
+            self._spill(self._DO, rec)
+        self._redo.clear()
+        self._tick()
+
+    def undo(self):
+        """Undo the last command, or every leg of the last batch."""
+        if not self._size:
+            return
+        rec = self._pop()
+        recs = [rec]
+        group = rec["group"]
+        while group and self._size and self._ring[(self._head - 1) % self.depth]["group"] == group:
+            recs.append(self._pop())
+        for r in recs:
+            self._command(r, done=True).undo()
+            self._redo.append(r)
+        self._spill(self._UNDO, rec)
+        self._tick()
+
+    def redo(self):
+        if not self._redo:
+            return
+        recs = [self._redo.pop()]
+        group = recs[0]["group"]
+        while group and self._redo and self._redo[-1]["group"] == group:
+            recs.append(self._redo.pop())
+        for r in recs:
+            cmd = self._command(r, done=False)
+            cmd.execute()
+            rec = np.array(cmd.to_record(), dtype=RECORD_DTYPE)[()]
+            self._push(rec)
+        self._spill(self._REDO, rec)
+        self._tick()
+
+    # -- snapshots ------------------------------------------------------------
+    def _tick(self):
+        self.ops += 1
+        if self.snapshot_every and self.ops >= self.snapshot_every and not self._replaying:
+            self.snapshot()
+
+    def snapshot(self):
+        """Snapshot the book; with a journal file, persist it and start a new journal generation."""
+        self.ops = 0
+        self.last_snapshot = _book_state(self.book)
+        if self._fh is None:
+            return self.last_snapshot
+        self._generation += 1
+        # the undo/redo history goes with the book: journaled undos after this
+        # point may reach commands executed before it
+        history = self.get_state()
+        state = {"generation": self._generation, "book": self.last_snapshot,
+                 "history": {"records": _records_to_json(history["records"]),
+                             "redo": _records_to_json(history["redo"]),
+                             "group": history["group"], "compacted": history["compacted"]}}
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.snapshot_path)
+        # records of older generations are covered by the snapshot
+        self._fh.seek(0)
+        self._fh.truncate()
+        self._fh.write(self._FILE_HEADER.pack(self._MAGIC, self._generation))
+        self._fh.flush()
+        return self.last_snapshot
+
+    def _replay(self, data, start):
+        """Re-apply spilled operations from journal bytes; returns how many."""
+        self._replaying = True
+        size = self._FILE_RECORD.size
+        n = 0
+        try:
+            for off in range(start, len(data) - size + 1, size):
+                op, *fields = self._FILE_RECORD.unpack_from(data, off)
+                if op == self._DO:
+                    self.do(self._command(np.array(tuple(fields), dtype=RECORD_DTYPE)[()], done=False))
+                elif op == self._UNDO:
+                    self.undo()
+                else:
+                    self.redo()
+                n += 1
+        finally:
+            self._replaying = False
+        return n
+
+    # -- checkpoints ----------------------------------------------------------
+    def get_state(self):
+        """Undo/redo history plus the journal position, for src.checkpoint."""
+        idx = (self._head - self._size + np.arange(self._size)) % self.depth
+        return {
+            "records": self._ring[idx],
+            "redo": np.array(self._redo, dtype=RECORD_DTYPE),
+            "group": self._group,
+            "compacted": self.compacted,
+            "generation": self._generation,
+            "journal_offset": self._fh.tell() if self._fh is not None else None,
+        }
+
+    def _load_snapshot_history(self, state):
+        history = state.get("history")
+        if history is None:
+            self.set_state({"records": np.zeros(0, RECORD_DTYPE), "redo": np.zeros(0, RECORD_DTYPE),
+                            "group": self._group, "compacted": self.compacted})
+        else:
+            self.set_state({**history, "records": _records_from_json(history["records"]),
+                            "redo": _records_from_json(history["redo"])})
+
+    def set_state(self, state):
+        self._ring[:] = 0
+        self._head = self._size = 0
+        for rec in np.array(state["records"], dtype=RECORD_DTYPE)[-self.depth:]:
+            self._push(rec)
+        self._redo = list(np.array(state["redo"], dtype=RECORD_DTYPE))
+        self._group = state["group"]
+        self.compacted = state["compacted"]
+
+    def replay_journal(self, generation, offset):
+        """
+        Bring the book from a checkpoint taken at journal position (generation,
+        offset) up to the end of this invoker's journal; returns how many
+        operations were re-applied. If the journal has since rolled to a newer
+        generation, the book is rebuilt from its snapshot plus the full tail
+        (with the undo history stored in that snapshot, as in recover()).
+        """
+        if self.journal_path is None or offset is None:
+            return 0
+        if generation != self._generation:
+            if generation > self._generation or not self.snapshot_path.exists():
+                raise ValueError(f"journal {self.journal_path} (generation {self._generation}) "
+                                 f"cannot continue a checkpoint at generation {generation}")
+            state = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            _load_book_state(self.book, state["book"])
+            self._load_snapshot_history(state)
+            if state["generation"] != self._generation:  # crashed before the journal was truncated
+                return 0
+            offset = self._FILE_HEADER.size
+        if not self.journal_path.exists():
+            return 0
+        return self._replay(self.journal_path.read_bytes(), offset)
+
+    @classmethod
+    def recover(cls, book, journal_path, **kwargs):
+        """
+        Rebuild `book` from the snapshot and journal at `journal_path` and return
+        an invoker that keeps appending to the same journal.
+        """
+        journal_path = Path(journal_path)
+        snap_path = journal_path.with_name(journal_path.name + ".snap")
+        snap_gen = 0
+        state = None
+        if snap_path.exists():
+            state = json.loads(snap_path.read_text(encoding="utf-8"))
+            _load_book_state(book, state["book"])
+            snap_gen = state["generation"]
+
+        data = journal_path.read_bytes() if journal_path.exists() else b""
+        if len(data) >= cls._FILE_HEADER.size:
+            _, file_gen = cls._FILE_HEADER.unpack_from(data)
+            if file_gen < snap_gen:  # crashed between snapshot and truncation
+                data = b""
+        inv = cls(book=book, **kwargs)
+        if state is not None:
+            inv._load_snapshot_history(state)
+        inv._replay(data, cls._FILE_HEADER.size)
+        inv.journal_path = journal_path
+        inv._generation = snap_gen
+        if not data:
+            journal_path.unlink(missing_ok=True)  # stale or empty: start this generation afresh
+        inv._open_journal()
+        inv.ops = 0
+        return inv
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
@@ -1,51 +1,209 @@
 import csv
+from itertools import islice
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Sequence
+
+import numpy as np
+
 from src.models import Stock, Bond, ETF, Instrument
 
 
+class TypeSpec(NamedTuple):
+    """How to build one instrument type: class, canonical type name, extra fields."""
+    cls: type
+    type_name: str
+    fields: tuple  # ((field, converter, default), ...) after symbol / name / instrument_type
+
+
+# CSV header -> canonical field (security-master exports use these names)
+HEADER_ALIASES = {"type": "instrument_type", "issuer": "name", "ticker": "symbol"}
+
+
+def _missing(v) -> bool:
+    return v is None or v == ""
+
+
 class InstrumentFactory:
     """Creates specific Instrument objects based on input dict or CSV row."""
 
-    @staticmethod
-    def create_instrument(data: dict) -> Instrument:
-        itype = data.get("instrument_type", "").lower()
-
-        if itype == "stock":
-            return Stock(
-                symbol=data["symbol"],
-                name=data["name"],
-                instrument_type="Stock",
-                exchange=data.get("exchange", "N/A"),
-                currency=data.get("currency", "USD"),
-            )
-
-        elif itype == "bond":
-            return Bond(
-                symbol=data["symbol"],
-                name=data["name"],
-                instrument_type="Bond",
-                coupon=float(data.get("coupon", 0)),
-                maturity=data.get("maturity", "N/A"),
-            )
-
-        elif itype == "etf":
-            return ETF(
-                symbol=data["symbol"],
-                name=data["name"],
-                instrument_type="ETF",
-                underlying_index=data.get("underlying_index", "N/A"),
-                expense_ratio=float(data.get("expense_ratio", 0)),
-            )
-
-        else:
-            raise ValueError(f"Unknown instrument type: {itype}")
+    _registry: dict = {}
+
+    @classmethod
+    def register(cls, type_name: str, instrument_cls: type,
+                 fields: Sequence[tuple] = ()) -> None:
+        """
+        Register (or replace) an instrument type. `fields` lists the extra
+        constructor fields as (name, converter, default); missing or empty
+        values take the default.
+        """
+        cls._registry[type_name.lower()] = TypeSpec(instrument_cls, type_name, tuple(fields))
+
+    @classmethod
+    def spec(cls, itype: str) -> TypeSpec:
+        spec = cls._registry.get(itype.lower())
+        if spec is None:
+            raise ValueError(f"Unknown instrument type: {itype.lower()}")
+        return spec
+
+    @classmethod
+    def create_instrument(cls, data: dict) -> Instrument:
+        spec = cls.spec(data.get("instrument_type", ""))
+        extra = [default if _missing(v := data.get(f)) else conv(v) for f, conv, default in spec.fields]
+        return spec.cls(data["symbol"], data["name"], spec.type_name, *extra)
+
+    @classmethod
+    def row_builder(cls, header: Sequence[str]) -> Callable[[Sequence[str]], Instrument]:
+        """
+        Compile a builder for raw csv rows with this header: column positions
+        and per-type converters are resolved once, so each row costs one
+        type lookup and one constructor call.
+        """
+        cols = {HEADER_ALIASES.get(h.strip().lower(), h.strip().lower()): i
+                for i, h in enumerate(header)}
+        for required in ("symbol", "name", "instrument_type"):
+            if required not in cols:
+                raise ValueError(f"instrument file has no {required!r} column")
+        i_sym, i_name, i_type = cols["symbol"], cols["name"], cols["instrument_type"]
+
+        plans = {}
+        for key, spec in cls._registry.items():
+            plans[key] = (spec.cls, spec.type_name,
+                          tuple((cols.get(f), conv, default) for f, conv, default in spec.fields))
+
+        def build(row: Sequence[str]) -> Instrument:
+            plan = plans.get(row[i_type].lower())
+            if plan is None:
+                raise ValueError(f"Unknown instrument type: {row[i_type].lower()}")
+            inst_cls, type_name, extra = plan
+            return inst_cls(row[i_sym], row[i_name], type_name,
+                            *[default if j is None or row[j] == "" else conv(row[j])
+                              for j, conv, default in extra])
+
+        return build
+
+    @classmethod
+    def iter_csv(cls, csv_path: str | Path, chunk_size: int = 65536) -> Iterator[list]:
+        """Stream a security master as lists of up to `chunk_size` instruments."""
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            build = cls.row_builder(header)
+            while chunk := list(islice(reader, chunk_size)):
+                yield [build(row) for row in chunk if row]
 
     @staticmethod
     def from_csv(csv_path: str | Path):
         """Demonstrate creation from instruments.csv"""
         instruments = []
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                instruments.append(InstrumentFactory.create_instrument(row))
-        return instruments
\ No newline at end of file
+        for chunk in InstrumentFactory.iter_csv(csv_path):
+            instruments.extend(chunk)
+        return instruments
+
+
+InstrumentFactory.register("Stock", Stock, (("exchange", str, "N/A"), ("currency", str, "USD")))
+InstrumentFactory.register("Bond", Bond, (("coupon", float, 0.0), ("maturity", str, "N/A")))
+InstrumentFactory.register("ETF", ETF, (("underlying_index", str, "N/A"), ("expense_ratio", float, 0.0)))
+
+
+class InstrumentTable:
+    """
+    Columnar view of a security master: one array per attribute instead of one
+    object per instrument.
+
+      symbols       object array; `index` maps symbol -> row
+      type_codes    int8 codes into `type_names` (registry order)
+      numeric[col]  float64 arrays (NaN where missing): every float field of the
+                    registered types plus any `numeric_columns`
+      text[col]     object arrays for the remaining columns
+
+    Filter with boolean masks (table.of_type("Bond") & (table["coupon"] > 3))
+    and take(mask); instrument(symbol) builds a single object on demand.
+    """
+
+    def __init__(self, symbols, type_codes, type_names, numeric, text):
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.type_names = list(type_names)
+        self.numeric = numeric
+        self.text = text
+        self.index = {s: i for i, s in enumerate(self.symbols.tolist())}
+
+    @classmethod
+    def from_csv(cls, csv_path: str | Path, chunk_size: int = 65536,
+                 numeric_columns: Iterable[str] = ("price",)) -> "InstrumentTable":
+        registry = InstrumentFactory._registry
+        codes = {key: i for i, key in enumerate(registry)}
+        type_floats = {f for spec in registry.values() for f, conv, _ in spec.fields if conv is float}
+        float_fields = type_floats | set(numeric_columns)
+
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = [HEADER_ALIASES.get(h.strip().lower(), h.strip().lower()) for h in next(reader, [])]
+            if "instrument_type" not in header:
+                raise ValueError("instrument file has no 'instrument_type' column")
+            i_type = header.index("instrument_type")
+            columns = {h: [] for h in header}
+            type_codes = []
+            while chunk := [row for row in islice(reader, chunk_size) if row]:
+                for h, col in zip(header, zip(*chunk)):
+                    columns[h].extend(col)
+                for t in (row[i_type].lower() for row in chunk):
+                    if t not in codes:
+                        raise ValueError(f"Unknown instrument type: {t}")
+                    type_codes.append(codes[t])
+
+        numeric, text = {}, {}
+        for h, values in columns.items():
+            if h in ("symbol", "instrument_type"):
+                continue
+            if h in float_fields:
+                arr = np.array(values, dtype=object)
+                arr[arr == ""] = "nan"
+                numeric[h] = arr.astype(np.float64)
+            else:
+                text[h] = np.array(values, dtype=object)
+        for f in type_floats - numeric.keys():
+            numeric[f] = np.full(len(type_codes), np.nan)
+        return cls(columns.get("symbol", []), type_codes,
+                   [spec.type_name for spec in registry.values()], numeric, text)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column in self.numeric:
+            return self.numeric[column]
+        if column in self.text:
+            return self.text[column]
+        if column == "symbol":
+            return self.symbols
+        if column == "instrument_type":
+            return np.asarray(self.type_names, dtype=object)[self.type_codes]
+        raise KeyError(column)
+
+    def of_type(self, type_name: str) -> np.ndarray:
+        """Boolean mask of rows with this instrument type."""
+        names = [t.lower() for t in self.type_names]
+        return self.type_codes == names.index(type_name.lower())
+
+    def take(self, rows) -> "InstrumentTable":
+        """Sub-table for a boolean mask or integer row indices."""
+        return InstrumentTable(self.symbols[rows], self.type_codes[rows], self.type_names,
+                               {k: v[rows] for k, v in self.numeric.items()},
+                               {k: v[rows] for k, v in self.text.items()})
+
+    def row(self, symbol: str) -> dict:
+        i = self.index[symbol]
+        out = {"symbol": symbol, "instrument_type": self.type_names[self.type_codes[i]]}
+        for k, v in self.numeric.items():
+            out[k] = float(v[i])
+        for k, v in self.text.items():
+            out[k] = v[i]
+        return out
+
+    def instrument(self, symbol: str) -> Instrument:
+        """Materialize one instrument through the factory registry."""
+        data = {k: (None if isinstance(v, float) and v != v else v) for k, v in self.row(symbol).items()}
+        return InstrumentFactory.create_instrument(data)
@@ -1,3 +1,13 @@
+import logging
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+from src.models import Signal
+
+logger = logging.getLogger(__name__)
+
+
 class SignalPublisher:
     """Publishes signals to registered observers."""
     def __init__(self):
@@ -11,6 +21,172 @@ class SignalPublisher:
             obs.update(signal)
 
 
+def observer_labels(observers):
+    """Class name per observer, with #n appended to repeats (Logger, Logger#1, ...)."""
+    labels, seen = [], {}
+    for obs in observers:
+        name = type(obs).__name__
+        n = seen.get(name, 0)
+        seen[name] = n + 1
+        labels.append(f"{name}#{n}" if n else name)
+    return labels
+
+
+class ObserverLag:
+    """Delivery metrics for one observer of an AsyncSignalPublisher."""
+    __slots__ = ("delivered", "batches", "errors", "last_lag_ns", "max_lag_ns", "total_lag_ns", "busy_ns")
+
+    def __init__(self):
+        self.delivered = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_lag_ns = 0    # enqueue -> delivery of the oldest signal in the last batch
+        self.max_lag_ns = 0
+        self.total_lag_ns = 0   # summed per signal, for the mean
+        self.busy_ns = 0        # time spent inside the observer
+
+    def as_dict(self):
+        d = {k: getattr(self, k) for k in self.__slots__}
+        d["mean_lag_ns"] = self.total_lag_ns / self.delivered if self.delivered else 0.0
+        return d
+
+
+class AsyncSignalPublisher(SignalPublisher):
+    """
+    Publisher that takes observers off the tick path: notify() only enqueues into
+    a bounded buffer and a background thread delivers signals in batches, via
+    observer.update_batch(signals) when available, else update() per signal.
+
+    Backpressure when the buffer is full:
+      - "block":       notify() waits for space
+      - "drop_oldest": the oldest pending signal is discarded
+      - "coalesce":    a pending signal with the same `coalesce_key` is replaced
+                       by the newer one (at any fill level); otherwise block
+    """
+    POLICIES = ("block", "drop_oldest", "coalesce")
+
+    def __init__(self, capacity=1024, batch_size=64, policy="block", coalesce_key="symbol"):
+        super().__init__()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("capacity and batch_size must be positive")
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.policy = policy
+        self.coalesce_key = coalesce_key
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._buf = deque()        # entries: [signal, enqueue_ns]
+        self._pending = {}         # coalesce key -> entry still in the buffer
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._lag = {}
+        self._thread = threading.Thread(target=self._run, name="signal-dispatch", daemon=True)
+        self._thread.start()
+
+    def attach(self, observer):
+        with self._cond:
+            self._lag[id(observer)] = ObserverLag()
+            self.observers = self.observers + [observer]  # the worker iterates a snapshot
+
+    def notify(self, signal):
+        now = perf_counter_ns()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("publisher is closed")
+            if self.policy == "coalesce":
+                key = signal.get(self.coalesce_key)
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[0] = signal  # keep the original enqueue time: lag stays honest
+                    self.coalesced += 1
+                    return
+            while len(self._buf) >= self.capacity:
+                if self.policy == "drop_oldest":
+                    self._buf.popleft()
+                    self.dropped += 1
+                else:
+                    self._cond.wait()
+            entry = [signal, now]
+            self._buf.append(entry)
+            if self.policy == "coalesce":
+                self._pending[key] = entry
+            self._cond.notify_all()
+
+    def _take(self):
+        with self._cond:
+            while not self._buf and not self._closed:
+                self._cond.wait()
+            if not self._buf:
+                return None
+            n = min(self.batch_size, len(self._buf))
+            batch = [self._buf.popleft() for _ in range(n)]
+            if self._pending:
+                for entry in batch:
+                    self._pending.pop(entry[0].get(self.coalesce_key), None)
+            self._in_flight = n
+            self._cond.notify_all()
+            return batch, self.observers
+
+    def _run(self):
+        while True:
+            taken = self._take()
+            if taken is None:
+                return
+            batch, observers = taken
+            signals = [e[0] for e in batch]
+            for obs in observers:
+                stats = self._lag[id(obs)]
+                start = perf_counter_ns()
+                try:
+                    if hasattr(obs, "update_batch"):
+                        obs.update_batch(signals)
+                    else:
+                        for s in signals:
+                            obs.update(s)
+                except Exception:
+                    stats.errors += 1
+                    logger.exception("observer %r failed on a batch of %d signals", obs, len(signals))
+                end = perf_counter_ns()
+                stats.busy_ns += end - start
+                stats.delivered += len(signals)
+                stats.batches += 1
+                stats.last_lag_ns = end - batch[0][1]
+                stats.max_lag_ns = max(stats.max_lag_ns, stats.last_lag_ns)
+                stats.total_lag_ns += sum(end - e[1] for e in batch)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every enqueued signal has been delivered. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._buf and not self._in_flight, timeout)
+
+    def close(self, timeout=None):
+        """Deliver what is pending, then stop the dispatch thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def lag_metrics(self):
+        """{observer class name (+ #n if repeated): metrics dict} for every observer."""
+        observers = self.observers
+        return {label: self._lag[id(obs)].as_dict()
+                for label, obs in zip(observer_labels(observers), observers)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class LoggerObserver:
     """Simply logs all signals."""
     def __init__(self):
@@ -19,6 +195,9 @@ class LoggerObserver:
     def update(self, signal):
         self.log.append(signal)
 
+    def update_batch(self, signals):
+        self.log.extend(signals)
+
 
 class AlertObserver:
     """Raises an alert if price > 1000 or qty > 1000."""
@@ -26,5 +205,12 @@ class AlertObserver:
         self.alerts = []
 
     def update(self, signal):
-        if signal.get("price", 0) > 1000 or signal.get("qty", 0) > 1000:
-            self.alerts.append(signal)
\ No newline at end of file
+        if type(signal) is Signal:
+            if signal.price > 1000 or signal.qty > 1000:
+                self.alerts.append(signal)
+        elif signal.get("price", 0) > 1000 or signal.get("qty", 0) > 1000:
+            self.alerts.append(signal)
+
+    def update_batch(self, signals):
+        for s in signals:
+            self.update(s)
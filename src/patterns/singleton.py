@@ -1,6 +1,6 @@
 from __future__ import annotations
-import json
 from pathlib import Path
+from src.precompile import load_config
 
 class Singleton:
     _instances: dict[type, object] = {}
@@ -26,8 +26,8 @@ class Config(Singleton):
         return cls()
 
     def _load(self, path: Path) -> None:
-        with open(path, "r", encoding="utf-8") as f:
-            self._data = json.load(f)
+        # served from the precompiled cache (python -m src.precompile) when it is fresh
+        self._data = load_config(path)
         self._config_path = Path(path)
 
     def get(self, key, default=None):
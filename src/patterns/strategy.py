@@ -1,17 +1,215 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Sequence, List
-import pandas as pd # type: ignore
+from array import array
+from collections import deque
+from math import copysign, sqrt
+from typing import TYPE_CHECKING, Sequence, List
 from src.patterns.singleton import Config
 
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore
+
+# pandas is imported inside the batch methods only: tick-by-tick runs stream
+# through update() and never need it, so it stays off the cold-start path.
+
+
+# Relative drop in the variance accumulator that triggers a full window recompute.
+_INV_COND_TOL = 2.220446049250313e-16 * 1e3
+
+
+class _RollingMeanStd:
+    """
+    O(1) rolling mean / sample std over the last `window` values.
+
+    Kahan-compensated running sum for the mean and Welford mean / sum of squared
+    deviations for the variance, updated in the same order as pandas' rolling
+    kernels (remove, then add; constant-run shortcut; recompute on catastrophic
+    cancellation) so the streamed values match
+    Series.rolling(window, min_periods=1).mean() / .std().fillna(0) exactly.
+    """
+    _SCALARS = ("sum_x", "sum_comp_add", "sum_comp_remove", "neg_ct", "same_ct", "prev_value",
+                "mean_x", "ssqdm_x", "var_comp_add", "var_comp_remove", "unstable")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        # mean
+        self.sum_x = 0.0
+        self.sum_comp_add = 0.0
+        self.sum_comp_remove = 0.0
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev_value = None
+        # variance
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.var_comp_add = 0.0
+        self.var_comp_remove = 0.0
+        self.unstable = False
+
+    def push(self, x: float) -> tuple[float, float]:
+        vals = self.values
+        if len(vals) == self.window:
+            y = vals.popleft()
+            self._remove_mean(y)
+            self._remove_var(y, len(vals))
+        vals.append(x)
+        self._add_mean(x)
+        self._add_var(x, len(vals))
+        if self.unstable:
+            self._recompute_var()
+        return self._mean(), self._std()
+
+    def get_state(self) -> dict:
+        state = {k: getattr(self, k) for k in self._SCALARS}
+        state["values"] = array("d", self.values)
+        return state
+
+    def set_state(self, state: dict) -> None:
+        for k in self._SCALARS:
+            setattr(self, k, state[k])
+        self.values = deque(float(v) for v in state["values"])
+
+    def _add_mean(self, x: float) -> None:
+        y = x - self.sum_comp_add
+        t = self.sum_x + y
+        self.sum_comp_add = t - self.sum_x - y
+        self.sum_x = t
+        if copysign(1.0, x) < 0:
+            self.neg_ct += 1
+        if self.prev_value is None:
+            self.prev_value = x
+        self.same_ct = self.same_ct + 1 if x == self.prev_value else 1
+        self.prev_value = x
+
+    def _remove_mean(self, x: float) -> None:
+        y = -x - self.sum_comp_remove
+        t = self.sum_x + y
+        self.sum_comp_remove = t - self.sum_x - y
+        self.sum_x = t
+        if copysign(1.0, x) < 0:
+            self.neg_ct -= 1
+
+    def _add_var(self, x: float, n: int) -> None:
+        prev_m2 = self.ssqdm_x
+        prev_mean = self.mean_x - self.var_comp_add
+        y = x - self.var_comp_add
+        t = y - self.mean_x
+        self.var_comp_add = t + self.mean_x - y
+        self.mean_x = self.mean_x + t / n
+        self.ssqdm_x = self.ssqdm_x + (x - prev_mean) * (x - self.mean_x)
+        if prev_m2 * _INV_COND_TOL > self.ssqdm_x:
+            self.unstable = True
+
+    def _remove_var(self, x: float, n: int) -> None:
+        if not n:
+            self.mean_x = self.ssqdm_x = 0.0
+            self.unstable = False
+            return
+        prev_m2 = self.ssqdm_x
+        prev_mean = self.mean_x - self.var_comp_remove
+        y = x - self.var_comp_remove
+        t = y - self.mean_x
+        self.var_comp_remove = t + self.mean_x - y
+        self.mean_x = self.mean_x - t / n
+        self.ssqdm_x = self.ssqdm_x - (x - prev_mean) * (x - self.mean_x)
+        if prev_m2 * _INV_COND_TOL > self.ssqdm_x:
+            self.unstable = True
+
+    def _recompute_var(self) -> None:
+        self.mean_x = self.ssqdm_x = self.var_comp_add = self.var_comp_remove = 0.0
+        for n, v in enumerate(self.values, 1):
+            self._add_var(v, n)
+        self.unstable = False
+
+    def _mean(self) -> float:
+        n = len(self.values)
+        result = self.sum_x / n
+        if self.same_ct >= n:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == n and result > 0:
+            result = 0.0
+        return result
+
+    def _std(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        var = self.ssqdm_x / (n - 1)
+        return sqrt(var) if var > 0 else 0.0
+
 
 class Strategy(ABC):
     """Interchangeable strategy interface."""
+    stream_history_max = 500
+
     @abstractmethod
     def generate_signals(self, prices: Sequence[float]) -> List[int]:
         """Return list of {-1,0,+1} signals for given price history."""
         ...
 
+    def generate_signal_frame(self, panel: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Signals for a (time x symbol) price panel in one pass.
+        NaN cells are gaps: each column is evaluated on its own observed prices,
+        exactly as the tick path only sees a symbol's own ticks.
+        """
+        import pandas as pd  # type: ignore
+
+        out = pd.DataFrame(0, index=panel.index, columns=panel.columns, dtype="int64")
+        dense = panel.notna().all().to_numpy()
+        if dense.any():
+            out.iloc[:, dense] = self._signal_frame(panel.iloc[:, dense]).to_numpy()
+        for j in (~dense).nonzero()[0]:
+            col = panel.iloc[:, j]
+            mask = col.notna().to_numpy()
+            if mask.any():
+                sig = self._signal_frame(col[mask].to_frame()).iloc[:, 0]
+                out.iloc[mask.nonzero()[0], j] = sig.to_numpy()
+        return out
+
+    def _signal_frame(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        """Signals for a gap-free panel; subclasses vectorize across columns."""
+        import pandas as pd  # type: ignore
+
+        return frame.apply(lambda col: pd.Series(self.generate_signals(col), index=col.index))
+
+    def update(self, price: float) -> int:
+        """
+        Streaming API: feed one price, get the signal for it.
+        Default falls back to re-running generate_signals on the full history;
+        subclasses override with O(1) rolling state.
+        """
+        history = self.__dict__.setdefault("_history", [])
+        history.append(float(price))
+        if len(history) > self.stream_history_max:
+            del history[:-self.stream_history_max]
+        out = self.generate_signals(history)
+        return int(out[-1]) if out else 0
+
+    def reset(self) -> None:
+        """Drop any streaming state accumulated by update()."""
+        self.__dict__.pop("_history", None)
+
+    def get_state(self) -> dict:
+        """
+        Streaming state as scalars and array('d') buffers, for checkpoints;
+        set_state() on a fresh clone resumes exactly where update() left off.
+        """
+        return {"history": array("d", self.__dict__.get("_history", ()))}
+
+    def set_state(self, state: dict) -> None:
+        self._history = [float(v) for v in state["history"]]
+
+    def clone(self) -> "Strategy":
+        """Return a new strategy with the same parameters and empty streaming state."""
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        other.reset()
+        return other
+
 
 class MeanReversionStrategy(Strategy):
     """
@@ -26,8 +224,34 @@ class MeanReversionStrategy(Strategy):
         self.k = k if k is not None else float(
             cfg.get_path("strategy_params", "mean_reversion", "k", default=1.0)
         )
+        self.reset()
+
+    def reset(self) -> None:
+        self._stats = _RollingMeanStd(self.window)
+        self._pending = 0  # signal computed on the previous price (shift(1))
+
+    def get_state(self) -> dict:
+        state = self._stats.get_state()
+        state["pending"] = self._pending
+        return state
+
+    def set_state(self, state: dict) -> None:
+        self._stats.set_state(state)
+        self._pending = int(state["pending"])
+
+    def update(self, price: float) -> int:
+        out = self._pending
+        x = float(price)
+        mean, std = self._stats.push(x)
+
+        upper = mean + self.k * std
+        lower = mean - self.k * std
+        self._pending = int(x < lower) - int(x > upper)
+        return out
 
     def generate_signals(self, prices: Sequence[float]) -> List[int]:
+        import pandas as pd  # type: ignore
+
         s = pd.Series(list(prices), dtype="float64")
         if s.empty:
             return []
@@ -42,6 +266,18 @@ class MeanReversionStrategy(Strategy):
         sig = sig.shift(1).fillna(0).astype(int)
         return sig.tolist()
 
+    def _signal_frame(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        frame = frame.astype("float64")
+        roll = frame.rolling(self.window, min_periods=1)
+        mean = roll.mean()
+        std = roll.std().fillna(0.0)
+
+        upper = mean + self.k * std
+        lower = mean - self.k * std
+
+        sig = (frame < lower).astype(int) - (frame > upper).astype(int)
+        return sig.shift(1).fillna(0).astype(int)
+
 
 class BreakoutStrategy(Strategy):
     """
@@ -53,8 +289,56 @@ class BreakoutStrategy(Strategy):
         self.lookback = lookback if lookback is not None else int(
             cfg.get_path("strategy_params", "breakout", "lookback", default=20)
         )
+        self.reset()
+
+    def reset(self) -> None:
+        # Monotonic deques of (index, price): front is the max / min of the prior window.
+        self._maxq = deque()
+        self._minq = deque()
+        self._i = 0
+
+    def get_state(self) -> dict:
+        # deques flattened to (index, price, index, price, ...)
+        return {"i": self._i,
+                "maxq": array("d", (v for pair in self._maxq for v in pair)),
+                "minq": array("d", (v for pair in self._minq for v in pair))}
+
+    def set_state(self, state: dict) -> None:
+        self._i = int(state["i"])
+        for name in ("maxq", "minq"):
+            flat = [float(v) for v in state[name]]
+            setattr(self, "_" + name, deque((int(i), x) for i, x in zip(flat[::2], flat[1::2])))
+
+    def update(self, price: float) -> int:
+        x = float(price)
+        i = self._i
+        maxq, minq = self._maxq, self._minq
+
+        sig = 0
+        if maxq:
+            if x > maxq[0][1]:
+                sig = 1
+            elif x < minq[0][1]:
+                sig = -1
+
+        while maxq and maxq[-1][1] <= x:
+            maxq.pop()
+        maxq.append((i, x))
+        while minq and minq[-1][1] >= x:
+            minq.pop()
+        minq.append((i, x))
+        # keep only the last `lookback` prices for the next tick
+        if maxq[0][0] <= i - self.lookback:
+            maxq.popleft()
+        if minq[0][0] <= i - self.lookback:
+            minq.popleft()
+
+        self._i = i + 1
+        return sig
 
     def generate_signals(self, prices: Sequence[float]) -> List[int]:
+        import pandas as pd  # type: ignore
+
         s = pd.Series(list(prices), dtype="float64")
         if s.empty:
             return []
@@ -66,4 +350,11 @@ class BreakoutStrategy(Strategy):
         sell = (s < prior_low).astype(int)
 
         sig = buy - sell 
-        return sig.astype(int).tolist()
\ No newline at end of file
+        return sig.astype(int).tolist()
+
+    def _signal_frame(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        frame = frame.astype("float64")
+        prior = frame.shift(1).rolling(self.lookback, min_periods=1)
+        buy = (frame > prior.max()).astype(int)
+        sell = (frame < prior.min()).astype(int)
+        return (buy - sell).astype(int)
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Precompiled startup cache for short-lived workers.
+
+    python -m src.precompile [--config PATH] [--instruments PATH] [--out PATH]
+
+Parses data/config.json and data/instruments.csv once and pickles the results
+(config dict, Instrument objects) into data/.precompiled.pickle together with
+each source file's (path, mtime_ns, size) stamp. Config and load_instruments()
+use an entry only while its stamp still matches the file on disk, so editing a
+source silently falls back to parsing it until the cache is rebuilt.
+"""
+from __future__ import annotations
+from pathlib import Path
+import argparse
+import json
+import os
+import pickle
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+CACHE_PATH = DATA_DIR / ".precompiled.pickle"
+
+_loaded: dict[Path, dict] = {}  # cache file -> unpickled entries, read once per process
+
+
+def _stamp(path: str | Path) -> tuple:
+    p = Path(path).resolve()
+    st = p.stat()
+    return str(p), st.st_mtime_ns, st.st_size
+
+
+def _entries(cache_path: Path) -> dict:
+    entries = _loaded.get(cache_path)
+    if entries is None:
+        try:
+            with open(cache_path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            entries = {}
+        _loaded[cache_path] = entries
+    return entries
+
+
+def lookup(kind: str, source: str | Path, cache_path: str | Path = CACHE_PATH):
+    """Cached payload for `source`, or None when absent or stale."""
+    entry = _entries(Path(cache_path)).get(kind)
+    if entry is None:
+        return None
+    stamp, payload = entry
+    try:
+        return payload if stamp == _stamp(source) else None
+    except OSError:
+        return None
+
+
+def load_config(path: str | Path, cache_path: str | Path = CACHE_PATH) -> dict:
+    data = lookup("config", path, cache_path)
+    if data is None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    return data
+
+
+def load_instruments(path: str | Path = DATA_DIR / "instruments.csv",
+                     cache_path: str | Path = CACHE_PATH) -> list:
+    instruments = lookup("instruments", path, cache_path)
+    if instruments is None:
+        from src.patterns.factory import InstrumentFactory
+        instruments = InstrumentFactory.from_csv(path)
+    return list(instruments)
+
+
+def build(config_path: str | Path = DATA_DIR / "config.json",
+          instruments_path: str | Path = DATA_DIR / "instruments.csv",
+          cache_path: str | Path = CACHE_PATH) -> Path:
+    """Parse the sources and atomically (re)write the cache file."""
+    import tempfile
+    from src.patterns.factory import InstrumentFactory
+
+    entries = {}
+    if Path(config_path).exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            entries["config"] = (_stamp(config_path), json.load(f))
+    if Path(instruments_path).exists():
+        entries["instruments"] = (_stamp(instruments_path), InstrumentFactory.from_csv(instruments_path))
+
+    cache_path = Path(cache_path)
+    fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _loaded.pop(cache_path, None)
+    return cache_path
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Build the precompiled startup cache.")
+    ap.add_argument("--config", type=Path, default=DATA_DIR / "config.json")
+    ap.add_argument("--instruments", type=Path, default=DATA_DIR / "instruments.csv")
+    ap.add_argument("--out", type=Path, default=CACHE_PATH)
+    args = ap.parse_args(argv)
+    print(f"wrote {build(args.config, args.instruments, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
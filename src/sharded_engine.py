@@ -0,0 +1,207 @@
+"""
+Symbol-sharded engine: one worker process per shard, each running its own
+Engine over the symbols it owns.
+
+Symbols are assigned to shards by a stable CRC32 hash, so a symbol always
+lands on the same worker and per-symbol strategy state never has to move.
+The router buffers (symbol, time, price) tuples per shard and ships them in
+batches over one single-producer / single-consumer queue per shard, which
+keeps queue locking and pickling off the per-tick path. sync() / close()
+collect every shard's ledger and merge them into a consolidated `book`.
+
+Observers passed to ShardedEngine are copied into every worker; their final
+state comes back in `shard_observers` on close(). Undo history lives inside
+the shard engines; the parent only sees the merged book. A worker that raises
+sends its traceback back and the parent re-raises it as ShardError; a worker
+that dies without answering is detected by polling its liveness.
+"""
+from __future__ import annotations
+from typing import Iterable
+import multiprocessing as mp
+import os
+import queue
+import traceback
+import zlib
+
+from src.engine import Engine
+from src.ledger import Ledger
+from src.models import MarketDataPoint
+
+_SYNC = "sync"
+_STOP = "stop"
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """Owning shard of `symbol` (stable across processes, unlike hash())."""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+class ShardError(RuntimeError):
+    """A shard worker failed; the message carries its traceback or exit code."""
+
+
+def _shard_main(shard: int, strategy, cash: float, observers, inbox, outbox) -> None:
+    try:
+        engine = Engine(strategy)
+        engine.book["cash"] = cash
+        for obs in observers:
+            engine.attach_observer(obs)
+        ticks = 0
+        while True:
+            msg = inbox.get()
+            if msg == _SYNC:
+                outbox.put((shard, ticks, engine.book.snapshot(), None))
+                continue
+            if msg == _STOP:
+                outbox.put((shard, ticks, engine.book.snapshot(), engine.publisher.observers))
+                return
+            for sym, time, price in msg:
+                engine.on_tick(MarketDataPoint(sym, time, price))
+            ticks += len(msg)
+    except BaseException:
+        outbox.put((shard, None, traceback.format_exc(), None))
+
+
+class ShardedEngine:
+    """
+    Drop-in for Engine.on_tick replay across `shards` worker processes.
+
+        with ShardedEngine(StrategyTickAdapter(MeanReversionStrategy()), shards=4) as eng:
+            eng.on_ticks(ticks)
+        eng.book  # consolidated
+    """
+
+    def __init__(self, strategy, shards: int | None = None, batch_size: int = 1024,
+                 cash: float = 1000000, observers: Iterable = (), poll_s: float = 1.0):
+        self.shards = shards or os.cpu_count() or 1
+        self.poll_s = poll_s
+        self.batch_size = batch_size
+        self.cash = cash
+        self.book = Ledger(cash=cash)
+        self.ticks_processed = 0
+        self.shard_books: dict[int, dict] = {}  # last ledger snapshot per shard
+        self.shard_observers: dict[int, list] = {}  # workers' observers, filled by close()
+        self._buffers: list[list] = [[] for _ in range(self.shards)]
+        self._shard_cache: dict[str, int] = {}
+
+        ctx = mp.get_context()
+        self._inboxes = [ctx.Queue() for _ in range(self.shards)]
+        self._outbox = ctx.Queue()
+        self._workers = [
+            ctx.Process(target=_shard_main, args=(i, strategy, cash, list(observers), self._inboxes[i], self._outbox),
+                        name=f"engine-shard-{i}", daemon=True)
+            for i in range(self.shards)
+        ]
+        for w in self._workers:
+            w.start()
+        self._closed = False
+
+    def _route(self, symbol: str) -> int:
+        shard = self._shard_cache.get(symbol)
+        if shard is None:
+            shard = self._shard_cache[symbol] = shard_of(symbol, self.shards)
+        return shard
+
+    def on_tick(self, tick) -> None:
+        if isinstance(tick, dict):
+            sym, time, price = tick["symbol"], tick.get("time"), tick["price"]
+        else:
+            sym, time, price = tick.symbol, tick.time, tick.price
+        shard = self._route(sym)
+        buf = self._buffers[shard]
+        buf.append((sym, time, price))
+        if len(buf) >= self.batch_size:
+            self._inboxes[shard].put(buf)
+            self._buffers[shard] = []
+
+    def on_ticks(self, ticks: Iterable) -> None:
+        for tick in ticks:
+            self.on_tick(tick)
+
+    def flush(self) -> None:
+        """Ship any partially filled batches to their shards."""
+        for shard, buf in enumerate(self._buffers):
+            if buf:
+                self._inboxes[shard].put(buf)
+                self._buffers[shard] = []
+
+    def _collect(self, msg: str) -> Ledger:
+        self.flush()
+        for q in self._inboxes:
+            q.put(msg)
+        snaps = {}
+        suspect = set()  # dead without answering at the previous poll
+        while len(snaps) < self.shards:
+            try:
+                shard, ticks, payload, observers = self._outbox.get(timeout=self.poll_s)
+            except queue.Empty:
+                dead = {i for i, w in enumerate(self._workers)
+                        if i not in snaps and not w.is_alive()}
+                # one more poll first: a reply may still be in flight from an exiting worker
+                if dead & suspect:
+                    i = min(dead & suspect)
+                    self._abort()
+                    raise ShardError(f"shard {i} exited with code {self._workers[i].exitcode}")
+                suspect = dead
+                continue
+            if ticks is None:
+                self._abort()
+                raise ShardError(f"shard {shard} failed:\n{payload}")
+            snaps[shard] = (shard, ticks, payload)
+            if observers is not None:
+                self.shard_observers[shard] = observers
+        self.book = self._merge(snaps.values())
+        self.ticks_processed = sum(n for _, n, _ in snaps.values())
+        return self.book
+
+    def _abort(self) -> None:
+        """Stop every worker after a failure; the merged book keeps its last state."""
+        for w in self._workers:
+            if w.is_alive():
+                w.terminate()
+            w.join()
+        for q in (*self._inboxes, self._outbox):
+            q.close()
+        self._closed = True
+
+    def _merge(self, snaps) -> Ledger:
+        # shards own disjoint symbols, so positions concatenate; cash deltas add
+        book = Ledger(cash=self.cash)
+        for shard, _, snap in sorted(snaps, key=lambda s: s[0]):
+            book.cash += snap["cash"] - self.cash
+            for sym, pos, avg in zip(snap["symbols"], snap["positions"], snap["avg_cost"]):
+                i = book.index(sym)
+                book._pos[i] = pos
+                book._avg[i] = avg
+            self.shard_books[shard] = snap
+        return book
+
+    def sync(self) -> Ledger:
+        """Wait for every routed tick to be processed and return the merged book."""
+        if self._closed:
+            return self.book
+        return self._collect(_SYNC)
+
+    def close(self) -> Ledger:
+        """Drain, merge the final books and stop the workers."""
+        if self._closed:
+            return self.book
+        self._collect(_STOP)
+        for w in self._workers:
+            w.join()
+        for q in (*self._inboxes, self._outbox):
+            q.close()
+        self._closed = True
+        return self.book
+
+    def get_position(self, symbol: str) -> float:
+        return self.book.position(symbol)
+
+    def get_portfolio_value(self, market_prices=None) -> float:
+        return self.book.market_value(market_prices)
+
+    def __enter__(self) -> "ShardedEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,120 @@
+"""
+Parallel parameter sweeps over a price panel.
+
+The (time x symbol) panel is copied once into a POSIX shared-memory block;
+each worker process attaches to it in its pool initializer and wraps the
+buffer in a DataFrame without copying, so configurations are shipped to
+workers as small (strategy class, params) tuples and the prices are never
+pickled per task. Each configuration is run through Engine.run_batch.
+
+    results = sweep(MeanReversionStrategy, {"window": [5, 10, 20], "k": [0.5, 1, 2]}, panel)
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Mapping, Sequence
+import os
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from src.engine import Engine
+from src.models import TickBatch
+
+_PANEL: pd.DataFrame | None = None  # worker-side view of the shared prices
+_SHM: shared_memory.SharedMemory | None = None
+
+
+def expand_grid(grid: Mapping[str, Iterable[Any]]) -> list[dict]:
+    """Cartesian product of a {param: values} grid, in key order."""
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in product(*(list(grid[k]) for k in keys))]
+
+
+def _attach(name: str, shape: tuple[int, int], columns: Sequence[str]) -> None:
+    """Pool initializer: map the shared panel once per worker."""
+    global _PANEL, _SHM
+    # pool children share the parent's resource tracker, so attaching here
+    # doesn't take ownership; the parent unlinks the block when the sweep ends
+    _SHM = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype="float64", buffer=_SHM.buf)
+    values.flags.writeable = False
+    _PANEL = pd.DataFrame(values, columns=list(columns), copy=False)
+
+
+def _evaluate(strategy_cls, params: dict, qty: float) -> dict:
+    """Backtest one configuration against the attached panel and summarise it."""
+    panel = _PANEL
+    engine = Engine(strategy_cls(**params))
+    start = engine.book["cash"]
+    result = engine.run_batch(panel, qty=qty)
+
+    marks = panel.ffill().fillna(0.0).to_numpy()
+    equity = result["cash"].to_numpy() + (result["positions"].to_numpy() * marks).sum(axis=1)
+    returns = np.diff(equity) / start if len(equity) > 1 else np.zeros(0)
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+
+    return {
+        **params,
+        "pnl": float(equity[-1] - start) if len(equity) else 0.0,
+        "trades": int(np.count_nonzero(result["signals"].to_numpy())),
+        "sharpe": float(returns.mean() / std) if std > 0 else 0.0,
+        "max_drawdown": float(((equity - peak) / peak).min()) if len(equity) else 0.0,
+    }
+
+
+def _evaluate_many(strategy_cls, configs: list[dict], qty: float) -> list[dict]:
+    return [_evaluate(strategy_cls, params, qty) for params in configs]
+
+
+def sweep(strategy_cls, grid: Mapping[str, Iterable[Any]] | Sequence[dict], prices,
+          qty: float = 1, rank_by: str = "pnl", max_workers: int | None = None) -> pd.DataFrame:
+    """
+    Evaluate every configuration of `strategy_cls` over `prices` (a panel or
+    TickBatch) and return one row per configuration, best `rank_by` first.
+
+    `grid` is a {param: values} mapping or an explicit list of param dicts.
+    max_workers=0 evaluates in-process on the caller's panel (no pool, no
+    shared memory), which is handy for debugging a single configuration.
+    """
+    global _PANEL
+    if isinstance(prices, TickBatch):
+        prices = prices.to_panel()
+    configs = expand_grid(grid) if isinstance(grid, Mapping) else [dict(c) for c in grid]
+    values = np.ascontiguousarray(prices.to_numpy(dtype="float64"))
+    columns = [str(c) for c in prices.columns]
+
+    if max_workers == 0:
+        saved, _PANEL = _PANEL, pd.DataFrame(values, columns=columns)
+        try:
+            rows = _evaluate_many(strategy_cls, configs, qty)
+        finally:
+            _PANEL = saved
+    else:
+        rows = _run_pool(strategy_cls, configs, qty, values, columns,
+                         max_workers or os.cpu_count() or 1)
+
+    out = pd.DataFrame(rows)
+    if out.empty:
+        return out
+    out = out.sort_values(rank_by, ascending=False, kind="stable").reset_index(drop=True)
+    out.insert(0, "rank", np.arange(1, len(out) + 1))
+    return out
+
+
+def _run_pool(strategy_cls, configs, qty, values, columns, workers) -> list[dict]:
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(values.shape, dtype="float64", buffer=shm.buf)[:] = values
+        # a few chunks per worker: low task overhead, still balanced
+        n = max(1, len(configs) // (workers * 4))
+        chunks = [configs[i:i + n] for i in range(0, len(configs), n)]
+        with ProcessPoolExecutor(workers, initializer=_attach,
+                                 initargs=(shm.name, values.shape, columns)) as pool:
+            parts = pool.map(_evaluate_many, [strategy_cls] * len(chunks), chunks, [qty] * len(chunks))
+            return [row for part in parts for row in part]
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,124 @@
+"""
+Binary columnar tick store.
+
+A store is a directory of plain .npy columns plus a small JSON header:
+
+    header.json    symbols (id -> name), sources (id -> name), tick count, timezone
+    time.npy       int64 ns since the epoch
+    price.npy      float64
+    symbol_id.npy  int32 index into header["symbols"]
+    source_id.npy  int16 index into header["sources"] (the tick's meta["source"])
+    offsets.npy    int64, rows of symbol i are offsets[i]:offsets[i + 1]
+    order.npy      int64 row numbers in global time order (replay order)
+
+Rows are stored grouped by symbol and sorted by time, so a symbol / time range
+is a contiguous, zero-copy slice of the memory-mapped columns.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+import json
+
+import numpy as np
+
+from src.models import MarketDataPoint, TickBatch, from_ns, intern_meta, to_ns
+
+_COLUMNS = ("time", "price", "symbol_id", "source_id", "offsets", "order")
+
+
+def write_tick_store(path: str | Path, ticks: Iterable[MarketDataPoint] | TickBatch) -> "TickStoreReader":
+    """Convert adapter output (ticks or a TickBatch) into a tick store at `path` and open it."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    batch = ticks if isinstance(ticks, TickBatch) else TickBatch.from_ticks(ticks)
+    time, sym = batch.time, batch.symbol_id
+
+    # symbol-major, time-sorted layout; lexsort is stable so arrival order breaks ties
+    rows = np.lexsort((time, sym))
+    position = np.empty_like(rows)
+    position[rows] = np.arange(len(rows))
+    order = position[np.argsort(time, kind="stable")]
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(sym, minlength=len(batch.symbols)))))
+
+    columns = {
+        "time": time[rows], "price": batch.price[rows], "symbol_id": sym[rows],
+        "source_id": batch.source_id[rows], "offsets": offsets.astype(np.int64), "order": order.astype(np.int64),
+    }
+    for name, values in columns.items():
+        np.save(path / f"{name}.npy", values)
+    header = {"version": 2, "count": len(rows), "symbols": batch.symbols, "sources": batch.sources,
+              "tz": "UTC" if batch.tz is not None else None}
+    (path / "header.json").write_text(json.dumps(header), encoding="utf-8")
+    return TickStoreReader(path)
+
+
+class TickStoreReader:
+    """Memory-mapped view over a tick store; nothing is loaded until sliced."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        header = json.loads((self.path / "header.json").read_text(encoding="utf-8"))
+        self.symbols: list[str] = header["symbols"]
+        self.sources: list[str | None] = header.get("sources", [None])  # version 1 stores kept none
+        self.tz = timezone.utc if header.get("tz") == "UTC" else None
+        self._ids = {s: i for i, s in enumerate(self.symbols)}
+        for name in _COLUMNS:
+            file = self.path / f"{name}.npy"
+            if name == "source_id" and not file.exists():
+                self.source_id = np.zeros(len(self.time), dtype=np.int16)
+                continue
+            setattr(self, name, np.load(file, mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def _bounds(self, symbol: str, start=None, end=None) -> tuple[int, int]:
+        i = self._ids[symbol]
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        t = self.time[lo:hi]
+        a = lo + (int(np.searchsorted(t, self._ns(start), "left")) if start is not None else 0)
+        b = lo + (int(np.searchsorted(t, self._ns(end), "left")) if end is not None else hi - lo)
+        return a, b
+
+    @staticmethod
+    def _ns(t) -> int:
+        return to_ns(t) if isinstance(t, datetime) else int(t)
+
+    def slice(self, symbol: str, start=None, end=None) -> tuple[np.ndarray, np.ndarray]:
+        """(times_ns, prices) views for `symbol` in [start, end); no data is copied."""
+        a, b = self._bounds(symbol, start, end)
+        return self.time[a:b], self.price[a:b]
+
+    def iter_ticks(self, start=None, end=None, chunk_size: int = 1 << 16) -> Iterator[MarketDataPoint]:
+        """Replay every tick in time order, reading `chunk_size` rows at a time."""
+        lo = self._ns(start) if start is not None else None
+        hi = self._ns(end) if end is not None else None
+        symbols, tz = self.symbols, self.tz
+        metas = [intern_meta({"source": s}) if s is not None else None for s in self.sources]
+        for a in range(0, len(self.order), chunk_size):
+            rows = np.asarray(self.order[a:a + chunk_size])
+            times = self.time[rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if lo is not None:
+                keep &= times >= lo
+            if hi is not None:
+                keep &= times < hi
+            rows, times = rows[keep], times[keep]
+            for ns, px, sid, src in zip(times.tolist(), self.price[rows].tolist(),
+                                        self.symbol_id[rows].tolist(), self.source_id[rows].tolist()):
+                yield MarketDataPoint(symbol=symbols[sid], time=from_ns(ns, tz), price=px, meta=metas[src])
+
+    def to_panel(self, symbols: Iterable[str] | None = None, start=None, end=None):
+        """(time x symbol) price panel for Engine.run_batch."""
+        import pandas as pd  # type: ignore
+        from src.data_loader import frame_to_panel
+
+        parts = []
+        for sym in (symbols if symbols is not None else self.symbols):
+            times, prices = self.slice(sym, start, end)
+            parts.append(pd.DataFrame({"time": pd.to_datetime(np.asarray(times), unit="ns"),
+                                       "symbol": sym, "price": np.asarray(prices)}))
+        if not parts:
+            return pd.DataFrame()
+        return frame_to_panel(pd.concat(parts, ignore_index=True))
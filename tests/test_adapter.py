@@ -25,4 +25,91 @@ def test_bloomberg_adapter(tmp_path: Path):
     assert isinstance(mdp, MarketDataPoint)
     assert mdp.symbol == "AAPL"
     assert mdp.price == 150.0
-    assert isinstance(mdp.time, datetime)
\ No newline at end of file
+    assert isinstance(mdp.time, datetime)
+
+def test_yahoo_iter_ticks_streams_records(tmp_path: Path):
+    path = tmp_path / "yahoo.jsonl"
+    lines = [f'{{"symbol": "{s}", "time": "2020-01-0{i + 1}", "price": {100 + i}}}'
+             for i, s in enumerate(["AAPL", "MSFT", "AAPL"])]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    adapter = YahooFinanceAdapter(path)
+    ticks = list(adapter.iter_ticks(chunk_size=8))  # records straddle chunk boundaries
+    assert [t.symbol for t in ticks] == ["AAPL", "MSFT", "AAPL"]
+    assert [t.price for t in adapter.iter_ticks("AAPL")] == [100.0, 102.0]
+
+
+def test_yahoo_iter_ticks_accepts_json_array(tmp_path: Path):
+    path = tmp_path / "yahoo.json"
+    path.write_text('[{"symbol": "AAPL", "time": "2020-01-01", "price": 1},'
+                    ' {"symbol": "AAPL", "time": "2020-01-02", "price": 2}]', encoding="utf-8")
+    assert [t.price for t in YahooFinanceAdapter(path).iter_ticks()] == [1.0, 2.0]
+
+
+def test_bloomberg_iter_ticks_streams_records(tmp_path: Path):
+    path = tmp_path / "bloomberg.xml"
+    path.write_text('<feed><data symbol="AAPL" time="2020-01-01" price="1"/>'
+                    '<data symbol="MSFT" time="2020-01-01" price="2"/>'
+                    '<data symbol="AAPL" time="2020-01-02" price="3"/></feed>', encoding="utf-8")
+
+    adapter = BloombergXMLAdapter(path)
+    assert [t.symbol for t in adapter.iter_ticks()] == ["AAPL", "MSFT", "AAPL"]
+    assert [t.price for t in adapter.iter_ticks("AAPL")] == [1.0, 3.0]
+    # a single-record file (the get_data shape) streams too
+    single = tmp_path / "single.xml"
+    single.write_text('<data symbol="AAPL" time="2020-01-01" price="150.0"/>', encoding="utf-8")
+    assert [t.price for t in BloombergXMLAdapter(single).iter_ticks()] == [150.0]
+
+
+def test_get_data_parses_file_once_and_invalidates_on_change(tmp_path: Path):
+    from src.data_loader import parsed_file_cache
+    parsed_file_cache.clear()
+    path = tmp_path / "yahoo.jsonl"
+    path.write_text('{"symbol": "AAPL", "time": "2020-01-01", "price": 1}\n'
+                    '{"symbol": "MSFT", "time": "2020-01-01", "price": 2}', encoding="utf-8")
+
+    adapter = YahooFinanceAdapter(path)
+    assert adapter.get_data("AAPL").price == 1.0
+    assert YahooFinanceAdapter(path).get_data("MSFT").price == 2.0
+    assert (parsed_file_cache.misses, parsed_file_cache.hits) == (1, 1)
+
+    path.write_text('{"symbol": "AAPL", "time": "2020-01-02", "price": 10}', encoding="utf-8")
+    assert adapter.get_data("AAPL").price == 10.0
+    assert parsed_file_cache.misses == 2
+
+
+def test_parsed_file_cache_is_lru_bounded(tmp_path: Path):
+    from src.data_loader import ParsedFileCache
+    cache = ParsedFileCache(maxsize=2)
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.jsonl"
+        p.write_text(f'{{"symbol": "S{i}", "time": "2020-01-01", "price": {i}}}', encoding="utf-8")
+        paths.append(p)
+        cache.get("yahoo", p, YahooFinanceAdapter(p).iter_ticks)
+    cache.get("yahoo", paths[2], YahooFinanceAdapter(paths[2]).iter_ticks)
+    assert cache.hits == 1
+    cache.get("yahoo", paths[0], YahooFinanceAdapter(paths[0]).iter_ticks)  # evicted
+    assert cache.misses == 4
+
+
+def test_merge_ticks_is_time_ordered_with_deterministic_ties():
+    from datetime import datetime, timedelta
+    from src.data_loader import merge_ticks
+    from src.models import MarketDataPoint
+
+    t0 = datetime(2024, 1, 2)
+    def ticks(sym, secs, src):
+        return [MarketDataPoint(sym, t0 + timedelta(seconds=s), float(s), {"source": src}) for s in secs]
+
+    yahoo = ticks("AAPL", [0, 2, 2, 5], "yahoo")
+    bbg = ticks("AAPL", [1, 2, 4], "bloomberg")
+    extra = ticks("MSFT", [2, 3], "other")
+
+    out = list(merge_ticks(yahoo, bbg, extra))
+    assert [(t.time - t0).seconds for t in out] == [0, 1, 2, 2, 2, 2, 3, 4, 5]
+    assert [t.meta["source"] for t in out[2:6]] == ["yahoo", "yahoo", "bloomberg", "other"]
+
+    deduped = list(merge_ticks(yahoo, bbg, extra, dedupe=True))
+    at_two = [(t.symbol, t.meta["source"]) for t in deduped if (t.time - t0).seconds == 2]
+    assert at_two == [("AAPL", "yahoo"), ("AAPL", "yahoo"), ("MSFT", "other")]
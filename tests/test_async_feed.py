@@ -0,0 +1,116 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.async_feed import adapter_source, merge_sources, replay_source, socket_source
+from src.data_loader import YahooFinanceAdapter, BloombergXMLAdapter
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint
+from src.patterns.strategy import BreakoutStrategy
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+def _ticks(symbol, seconds, prices):
+    return [MarketDataPoint(symbol, T0 + timedelta(seconds=s), p) for s, p in zip(seconds, prices)]
+
+
+async def _collect(source):
+    return [t async for t in source]
+
+
+def test_merge_sources_orders_by_time_with_source_tiebreak():
+    a = _ticks("AAPL", [0, 2, 4, 4], [1, 2, 3, 4])
+    b = _ticks("MSFT", [1, 2, 3], [5, 6, 7])
+    out = asyncio.run(_collect(merge_sources(replay_source(a), replay_source(b), maxsize=2)))
+    assert [(t.symbol, t.price) for t in out] == [
+        ("AAPL", 1), ("MSFT", 5), ("AAPL", 2), ("MSFT", 6), ("MSFT", 7), ("AAPL", 3), ("AAPL", 4)]
+
+
+def test_adapter_sources_merge(tmp_path: Path):
+    y = tmp_path / "yahoo.jsonl"
+    y.write_text("\n".join(json.dumps({"symbol": "AAPL", "time": f"2020-01-0{d}", "price": d})
+                           for d in (1, 3, 5)), encoding="utf-8")
+    b = tmp_path / "bloomberg.xml"
+    b.write_text("<feed>" + "".join(f'<data symbol="MSFT" time="2020-01-0{d}" price="{d}"/>'
+                                    for d in (2, 4)) + "</feed>", encoding="utf-8")
+    feeds = merge_sources(adapter_source(YahooFinanceAdapter(y), chunk_size=2),
+                          adapter_source(BloombergXMLAdapter(b)))
+    assert [t.price for t in asyncio.run(_collect(feeds))] == [1, 2, 3, 4, 5]
+
+
+def test_run_async_matches_on_tick_loop():
+    prices = [10, 11, 12, 9, 8, 13, 14, 7, 15, 6]
+    ticks = _ticks("AAPL", range(len(prices)), prices)
+
+    sync_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    for t in ticks:
+        sync_engine.on_tick(t)
+
+    async_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    n = asyncio.run(async_engine.run_async(replay_source(ticks), queue_size=2))
+    assert n == len(ticks)
+    assert async_engine.book["cash"] == sync_engine.book["cash"]
+    assert async_engine.get_position("AAPL") == sync_engine.get_position("AAPL")
+
+
+def test_socket_source_reads_ndjson():
+    async def scenario():
+        async def handle(reader, writer):
+            for s, p in enumerate((100.0, 101.5)):
+                rec = {"symbol": "AAPL", "time": (T0 + timedelta(seconds=s)).isoformat(), "price": p}
+                writer.write((json.dumps(rec) + "\n").encode())
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await _collect(socket_source("127.0.0.1", port))
+
+    out = asyncio.run(scenario())
+    assert [(t.symbol, t.time, t.price) for t in out] == [
+        ("AAPL", T0, 100.0), ("AAPL", T0 + timedelta(seconds=1), 101.5)]
+
+
+def test_merge_sources_dedupes_like_merge_ticks():
+    from src.data_loader import merge_ticks
+    a = _ticks("AAPL", [0, 1, 2], [1, 2, 3])
+    b = _ticks("AAPL", [1, 3], [9, 4])
+    out = asyncio.run(_collect(merge_sources(replay_source(a), replay_source(b), dedupe=True)))
+    assert out == list(merge_ticks(a, b, dedupe=True))
+    assert [t.price for t in out] == [1, 2, 3, 4]
+
+
+def test_merge_sources_raises_a_source_error_without_draining_the_others():
+    cancelled = []
+
+    async def broken():
+        yield _ticks("AAPL", [0], [1])[0]
+        raise ConnectionError("feed dropped")
+
+    async def endless():
+        try:
+            s = 0
+            while True:
+                yield _ticks("MSFT", [s], [2])[0]
+                s += 1
+                await asyncio.sleep(0.01)
+        finally:
+            cancelled.append(True)
+
+    async def scenario():
+        out = []
+        try:
+            async for tick in merge_sources(broken(), endless(), maxsize=4):
+                out.append(tick)
+        except ConnectionError:
+            await asyncio.sleep(0)
+            return out
+        raise AssertionError("merge finished without the source error")
+
+    out = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert len(out) < 5
+    assert cancelled
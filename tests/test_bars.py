@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest # type: ignore
+from src.bars import Bar, BarAggregator, resample_panel
+from src.data_loader import ticks_to_panel
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint
+from src.patterns.strategy import BreakoutStrategy
+from tests.test_engine import _ticks
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+def _tick(sym, sec, px, volume=None):
+    meta = {"volume": volume} if volume is not None else None
+    return MarketDataPoint(sym, T0 + timedelta(seconds=sec), px, meta)
+
+def test_time_bars_close_on_next_interval_and_flush():
+    agg = BarAggregator(interval=60)
+    assert agg.on_tick(_tick("AAPL", 0, 10, 5)) is None
+    agg.on_tick(_tick("AAPL", 20, 12, 1))
+    agg.on_tick(_tick("AAPL", 40, 9))
+    agg.on_tick(_tick("MSFT", 50, 100))
+    bar = agg.on_tick(_tick("AAPL", 65, 11))
+    assert bar == Bar("AAPL", T0, 10, 12, 9, 9, 6, 3)
+    assert bar.price == 9
+    assert [b.symbol for b in agg.flush()] == ["MSFT", "AAPL"]
+    assert agg.flush() == []
+
+def test_tick_bars_and_on_bar_callback():
+    seen = []
+    agg = BarAggregator(ticks=2, on_bar=seen.append)
+    bars = list(agg.stream(_tick("AAPL", i, px) for i, px in enumerate([5, 7, 6, 4, 8])))
+    assert bars == seen
+    assert [(b.open, b.high, b.low, b.close, b.count) for b in bars] == \
+        [(5, 7, 5, 7, 2), (6, 6, 4, 4, 2), (8, 8, 8, 8, 1)]
+    assert bars[1].time == T0 + timedelta(seconds=2)
+    with pytest.raises(ValueError):
+        BarAggregator(interval=60, ticks=10)
+
+def test_streamed_bars_match_vectorized_resample():
+    ticks = _ticks(n=120)
+    streamed = list(BarAggregator(interval=timedelta(minutes=5)).stream(ticks))
+    frames = resample_panel(ticks_to_panel(ticks), 300)
+
+    assert len(streamed) == int(frames["count"].to_numpy().astype(bool).sum())
+    for b in streamed:
+        for field in ("open", "high", "low", "close", "count"):
+            assert frames[field].loc[b.time, b.symbol] == getattr(b, field)
+    assert np.isnan(frames["close"].to_numpy()).sum() == (frames["count"].to_numpy() == 0).sum()
+
+def test_bars_drive_a_bar_engine_as_tick_listener(capsys):
+    bar_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    agg = BarAggregator(interval=600, on_bar=bar_engine.on_tick)
+    tick_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    tick_engine.attach_tick_listener(agg)
+    ticks = _ticks(n=200)
+    for t in ticks:
+        tick_engine.on_tick(t)
+    agg.flush()
+
+    assert agg.ticks_in == len(ticks)
+    assert agg.bars_out < len(ticks) / 5
+    # the bar engine saw exactly the close series of the bars
+    replay = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    for b in BarAggregator(interval=600).stream(ticks):
+        replay.on_tick(MarketDataPoint(b.symbol, b.time, b.close))
+    assert bar_engine.book["positions"] == replay.book["positions"]
+
+def test_bars_roll_up_into_coarser_bars_with_per_symbol_timezones():
+    ticks = _ticks(n=120)
+    direct = list(BarAggregator(interval=300).stream(ticks))
+    rolled = list(BarAggregator(interval=300).stream(BarAggregator(interval=60).stream(ticks)))
+    key = lambda b: (b.time, b.symbol)
+    assert sorted(rolled, key=key) == sorted(direct, key=key)
+
+    est = timezone(timedelta(hours=-5))
+    agg = BarAggregator(interval=60)
+    agg.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2, 9, 30, tzinfo=est), 1.0))
+    agg.on_tick(MarketDataPoint("MSFT", datetime(2024, 1, 2, 9, 30), 2.0))
+    bars = {b.symbol: b for b in agg.flush()}
+    assert bars["AAPL"].time == datetime(2024, 1, 2, 9, 30, tzinfo=est)
+    assert bars["MSFT"].time == datetime(2024, 1, 2, 9, 30)
@@ -1,4 +1,4 @@
-from patterns.builder import PortfolioBuilder, Portfolio
+from patterns.builder import PortfolioBuilder, Portfolio, _RESUM_EVERY
 
 
 def test_simple_portfolio_build():
@@ -26,4 +26,35 @@ def test_nested_subportfolio():
 def test_fluent_interface_returns_self():
     pb = PortfolioBuilder("Test")
     result = pb.set_owner("Bob").add_position("TSLA", 1, 700)
-    assert result is pb
\ No newline at end of file
+    assert result is pb
+
+def test_update_price_reprices_nested_portfolio():
+    main = PortfolioBuilder("Main").add_position("AAPL", 10, 150.0)
+    sub = PortfolioBuilder("Tech").add_position("AAPL", 2, 150.0).add_position("MSFT", 1, 300.0)
+    portfolio = main.add_subportfolio("Tech", sub).build()
+    assert portfolio.total_value() == 10 * 150 + 2 * 150 + 300
+
+    assert portfolio.update_price("AAPL", 200.0) == 2
+    assert portfolio.total_value() == 10 * 200 + 2 * 200 + 300
+    assert portfolio.subportfolios[0].total_value() == 2 * 200 + 300
+
+def test_portfolios_built_from_one_builder_reprice_independently():
+    main = PortfolioBuilder("Main").add_position("AAPL", 10, 150.0)
+    main.add_subportfolio("Tech", PortfolioBuilder("Tech").add_position("MSFT", 1, 300.0))
+    first, second = main.build(), main.build()
+    first.update_price("AAPL", 200.0)
+    first.update_price("MSFT", 310.0)
+    assert first.total_value() == 10 * 200 + 310
+    assert second.total_value() == 10 * 150 + 300
+    assert main.positions[0]["price"] == 150.0
+
+def test_update_price_resums_cached_total_periodically():
+    pb = PortfolioBuilder("Main")
+    for i in range(5):
+        pb.add_position(f"S{i}", 3, 0.1 * (i + 1))
+    portfolio = pb.build()
+    portfolio.total_value()
+    for n in range(_RESUM_EVERY):
+        portfolio.update_price(f"S{n % 5}", 0.1 + 0.37 * (n % 11))
+    fresh = Portfolio("Fresh", positions=[dict(p) for p in portfolio.positions])
+    assert portfolio.total_value() == fresh.total_value()
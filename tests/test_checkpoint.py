@@ -0,0 +1,149 @@
+from datetime import datetime
+import numpy as np
+import pytest # type: ignore
+from src.checkpoint import Checkpointer, load, tick_position
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint
+from src.patterns.command import JournalCommandInvoker
+from src.patterns.strategy import MeanReversionStrategy, BreakoutStrategy
+from tests.test_engine import _ticks
+
+
+@pytest.mark.parametrize("make", [lambda: MeanReversionStrategy(window=5, k=0.5),
+                                  lambda: BreakoutStrategy(lookback=10)])
+def test_restored_engine_continues_like_uninterrupted(make, tmp_path, capsys):
+    ticks = _ticks()
+    half = len(ticks) // 2
+    full = Engine(StrategyTickAdapter(make()))
+    for t in ticks:
+        full.on_tick(t)
+
+    first = Engine(StrategyTickAdapter(make()))
+    for t in ticks[:half]:
+        first.on_tick(t)
+    first.checkpoint(tmp_path / "engine.ckpt")
+
+    resumed = Engine(StrategyTickAdapter(make()))
+    resumed.restore(tmp_path / "engine.ckpt")
+    assert resumed.book["positions"] == first.book["positions"]
+    for t in ticks[half:]:
+        resumed.on_tick(t)
+
+    assert resumed.book["positions"] == full.book["positions"]
+    assert resumed.book["cash"] == full.book["cash"]
+    resumed.undo_last_trade()
+    full.undo_last_trade()
+    assert resumed.book["cash"] == full.book["cash"]
+
+def test_checkpoint_arrays_are_aligned_memory_maps(tmp_path, capsys):
+    engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)))
+    for p in [100, 101, 105]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    engine.checkpoint(tmp_path / "engine.ckpt")
+
+    header, arrays = load(tmp_path / "engine.ckpt")
+    assert header["symbols"] == ["AAPL"]
+    assert isinstance(arrays["positions"], np.memmap) and not arrays["positions"].flags.writeable
+    assert len(arrays["journal"]) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_restore_replays_journal_tail_after_checkpoint(tmp_path, capsys):
+    journal = tmp_path / "orders.journal"
+    engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)),
+                    invoker=JournalCommandInvoker(journal_path=journal))
+    checkpointer = Checkpointer(engine, tmp_path / "engine.ckpt", every_ticks=2)
+    engine.attach_tick_listener(checkpointer)
+    for p in [100, 101, 105, 106, 107]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    assert checkpointer.saved == 2  # before the 2nd and 4th tick's signals
+    engine.invoker.close()
+
+    restarted = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)),
+                       invoker=JournalCommandInvoker(journal_path=journal))
+    assert restarted.restore(tmp_path / "engine.ckpt") == 2
+    assert restarted.get_position("AAPL") == engine.get_position("AAPL") == 4
+    assert restarted.book["cash"] == engine.book["cash"]
+
+def test_restore_then_catch_up_keeps_trading_like_uninterrupted(tmp_path, capsys):
+    ticks = _ticks()
+    crash = 2 * len(ticks) // 3
+    make = lambda: StrategyTickAdapter(MeanReversionStrategy(window=5, k=0.5))
+    full = Engine(make())
+    for t in ticks:
+        full.on_tick(t)
+
+    journal = tmp_path / "orders.journal"
+    live = Engine(make(), invoker=JournalCommandInvoker(journal_path=journal))
+    live.attach_tick_listener(Checkpointer(live, tmp_path / "engine.ckpt", every_ticks=100))
+    for t in ticks[:crash]:
+        live.on_tick(t)
+    live.invoker.close()
+
+    restarted = Engine(make(), invoker=JournalCommandInvoker(journal_path=journal))
+    assert restarted.restore(tmp_path / "engine.ckpt") > 0
+    assert restarted.book["positions"] == live.book["positions"]
+    pos = tick_position(tmp_path / "engine.ckpt")
+    assert 0 < pos < crash
+    assert restarted.catch_up(ticks[pos:crash]) == crash - pos
+    for t in ticks[crash:]:
+        restarted.on_tick(t)
+
+    assert restarted.book["positions"] == full.book["positions"]
+    assert restarted.book["cash"] == pytest.approx(full.book["cash"])
+
+def test_restore_follows_journal_snapshot_taken_after_checkpoint(tmp_path, capsys):
+    journal = tmp_path / "orders.journal"
+    make = lambda: Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)),
+                          invoker=JournalCommandInvoker(journal_path=journal, snapshot_every=3))
+    engine = make()
+    prices = [100, 101, 105, 106, 107, 108, 109, 110]
+    for p in prices[:3]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    engine.checkpoint(tmp_path / "engine.ckpt")
+    for p in prices[3:]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    engine.invoker.close()
+    assert engine.get_position("AAPL") == 7
+
+    restarted = make()
+    restarted.restore(tmp_path / "engine.ckpt")
+    assert restarted.get_position("AAPL") == 7
+    assert restarted.book["cash"] == engine.book["cash"]
+
+def test_restore_does_not_reapply_a_pending_batch_flushed_after_checkpoint(tmp_path, capsys):
+    journal = tmp_path / "orders.journal"
+    make = lambda: Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)),
+                          invoker=JournalCommandInvoker(journal_path=journal), batch_ticks=6)
+    live = make()
+    prices = [100, 101, 105, 106, 107, 108, 109, 110]
+    for p in prices[:4]:
+        live.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    assert len(live._netter) == 3
+    live.checkpoint(tmp_path / "engine.ckpt")
+    for p in prices[4:]:
+        live.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    live.flush()
+    live.invoker.close()
+    assert live.get_position("AAPL") == 7
+
+    restarted = make()
+    assert restarted.restore(tmp_path / "engine.ckpt") > 0
+    restarted.flush()
+    assert restarted.get_position("AAPL") == 7
+    assert restarted.book["cash"] == live.book["cash"]
+
+def test_restore_keeps_pending_batch_without_a_newer_flush(tmp_path, capsys):
+    make = lambda: Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)), batch_ticks=6)
+    live = make()
+    for p in [100, 101, 105, 106]:
+        live.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    live.checkpoint(tmp_path / "engine.ckpt")
+
+    restarted = make()
+    restarted.restore(tmp_path / "engine.ckpt")
+    assert len(restarted._netter) == 3
+    live.flush()
+    restarted.flush()
+    assert restarted.get_position("AAPL") == live.get_position("AAPL") == 3
+    assert restarted.book["cash"] == live.book["cash"]
@@ -1,4 +1,6 @@
-from src.patterns.command import ExecuteOrderCommand, CommandInvoker
+import pytest # type: ignore
+from src.ledger import Ledger
+from src.patterns.command import ExecuteOrderCommand, CommandInvoker, JournalCommandInvoker, OrderNetter
 
 def test_execute_and_undo_buy():
     broker = {"cash": 1000, "positions": {}}
@@ -23,4 +25,131 @@ def test_redo_restores_buy():
     invoker.redo()
 
     assert broker["cash"] == 800
-    assert broker["positions"]["AAPL"] == 1
\ No newline at end of file
+    assert broker["positions"]["AAPL"] == 1
+
+def test_journal_invoker_undo_redo_with_bounded_depth():
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book, depth=2)
+    for px in (100, 110, 120):
+        invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, px))
+    assert len(invoker) == 2 and invoker.compacted == 1
+
+    invoker.undo()
+    invoker.undo()
+    invoker.undo()  # beyond the undo depth: no-op
+    assert book.position("AAPL") == 1 and book.cash == 900
+
+    invoker.redo()
+    assert book.position("AAPL") == 2 and book.avg_cost("AAPL") == 105
+    assert book.cash == 790
+
+def test_journal_recovers_book_from_snapshot_and_tail(tmp_path):
+    path = tmp_path / "orders.journal"
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book, depth=8, snapshot_every=4, journal_path=path)
+    for i, side in enumerate(["BUY", "BUY", "SELL", "BUY", "BUY"]):
+        invoker.do(ExecuteOrderCommand(book, "MSFT" if i % 2 else "AAPL", side, 1, 10 + i))
+    invoker.undo()
+    invoker.close()
+
+    restored = Ledger(cash=0)
+    recovered = JournalCommandInvoker.recover(restored, path, depth=8)
+    assert restored.cash == book.cash
+    assert restored["positions"] == book["positions"]
+    recovered.redo()  # the undone fill is still redoable after recovery
+    assert restored.position("AAPL") == 1
+    recovered.close()
+
+def test_journal_invoker_on_dict_broker():
+    broker = {"cash": 1000, "positions": {}}
+    invoker = JournalCommandInvoker(depth=4)
+    invoker.do(ExecuteOrderCommand(broker, "AAPL", "SELL", 2, 100))
+    invoker.undo()
+    assert broker == {"cash": 1000, "positions": {"AAPL": 0}}
+
+def _netted_batch(book, orders):
+    netter = OrderNetter()
+    for order in orders:
+        netter.add(*order)
+    return netter.drain(book)
+
+def test_netted_batch_matches_sequential_fills():
+    orders = [("AAPL", "BUY", 3, 100), ("AAPL", "SELL", 1, 104), ("MSFT", 1, 2, 50),
+              ("MSFT", -1, 2, 55), ("AAPL", "BUY", 1, 98)]
+    seq, netted = Ledger(cash=1000), Ledger(cash=1000)
+    for sym, side, qty, px in orders:
+        ExecuteOrderCommand(seq, sym, side, qty, px).execute()
+
+    batch = _netted_batch(netted, orders)
+    assert len(batch.legs) == 2  # one leg per symbol; MSFT nets flat but moves cash
+    JournalCommandInvoker(netted).do(batch)
+    assert netted.cash == seq.cash
+    assert netted["positions"] == seq["positions"]
+    assert netted.avg_cost("AAPL") == pytest.approx(seq.avg_cost("AAPL")) == pytest.approx(298 / 3)
+
+def test_netted_batch_avg_cost_after_a_flip():
+    book = Ledger(cash=1000)
+    JournalCommandInvoker(book).do(_netted_batch(book, [("X", "BUY", 1, 10), ("X", "SELL", 3, 12)]))
+    assert (book.position("X"), book.avg_cost("X")) == (-2, 12)
+
+def test_journal_undoes_and_redoes_a_batch_as_one_unit(tmp_path):
+    path = tmp_path / "orders.journal"
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book, journal_path=path)
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, 100))
+    invoker.do(_netted_batch(book, [("AAPL", "BUY", 2, 101), ("MSFT", "BUY", 1, 50)]))
+    assert len(invoker) == 3
+
+    invoker.undo()
+    assert book.position("AAPL") == 1 and book.position("MSFT") == 0 and book.cash == 900
+    invoker.redo()
+    assert book.position("AAPL") == 3 and book.cash == 648
+    invoker.undo()
+    invoker.close()
+
+    restored = Ledger(cash=1000)  # no snapshot yet: replay from the opening book
+    recovered = JournalCommandInvoker.recover(restored, path)
+    assert restored.cash == book.cash and restored["positions"] == book["positions"]
+    recovered.redo()
+    assert restored.position("MSFT") == 1 and restored.cash == 648
+
+def test_ring_evicts_whole_batches_at_the_boundary():
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book, depth=3)
+    invoker.do(_netted_batch(book, [("AAPL", "BUY", 1, 100), ("MSFT", "BUY", 1, 50)]))
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, 110))
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, 120))  # evicts one leg, so both go
+    assert len(invoker) == 2 and invoker.compacted == 2
+
+    for _ in range(3):
+        invoker.undo()
+    assert book.position("AAPL") == 1 and book.position("MSFT") == 1 and book.cash == 850
+
+    with pytest.raises(ValueError):
+        invoker.do(_netted_batch(book, [(s, "BUY", 1, 10) for s in ("A", "B", "C", "D")]))
+    assert book.cash == 850
+
+def test_undo_across_a_snapshot_survives_recovery(tmp_path):
+    path = tmp_path / "orders.journal"
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book, snapshot_every=2, journal_path=path)
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, 100))
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 1, 100))  # snapshot here
+    invoker.undo()
+    invoker.close()
+    assert book.cash == 900 and book.position("AAPL") == 1
+
+    restored = Ledger(cash=0)
+    recovered = JournalCommandInvoker.recover(restored, path)
+    assert restored.cash == 900 and restored.position("AAPL") == 1
+    recovered.undo()
+    recovered.redo()
+    recovered.redo()
+    assert restored.cash == 800 and restored.position("AAPL") == 2
+
+def test_overlong_symbol_is_rejected_before_the_book_changes():
+    book = Ledger(cash=1000)
+    invoker = JournalCommandInvoker(book)
+    with pytest.raises(ValueError):
+        invoker.do(ExecuteOrderCommand(book, "X" * 17, "BUY", 1, 10))
+    assert book.cash == 1000 and len(invoker) == 0
@@ -29,4 +29,30 @@ def test_nested_groups_recursive():
     assert main.get_value() == 1000 + 300 + 950
     all_pos = main.get_positions()
     assert len(all_pos) == 3
-    assert {p.symbol for p in all_pos} == {"NVDA", "MSFT", "US10Y"}
\ No newline at end of file
+    assert {p.symbol for p in all_pos} == {"NVDA", "MSFT", "US10Y"}
+def test_update_price_patches_cached_totals_along_path():
+    main = PortfolioGroup("Main")
+    tech = PortfolioGroup("Tech")
+    semis = PortfolioGroup("Semis")
+    semis.add(Position("NVDA", 2, 500.0))
+    tech.add(semis)
+    tech.add(Position("MSFT", 1, 300.0))
+    main.add(tech)
+    main.add(Position("NVDA", 1, 500.0))
+    assert main.get_value() == 1800.0
+
+    assert main.update_price("NVDA", 600.0) == 2
+    assert semis.get_value() == 1200.0
+    assert tech.get_value() == 1500.0
+    assert main.get_value() == 2100.0
+    assert {p.price for p in main.get_positions() if p.symbol == "NVDA"} == {600.0}
+
+def test_add_invalidates_ancestors():
+    main = PortfolioGroup("Main")
+    tech = PortfolioGroup("Tech")
+    main.add(tech)
+    assert main.get_value() == 0
+    tech.add(Position("AAPL", 10, 150.0))
+    assert main.get_value() == 1500.0
+    assert main.update_price("AAPL", 100.0) == 1
+    assert main.get_value() == 1000.0
@@ -1,4 +1,11 @@
-from src.analytics import VolatilityDecorator, BetaDecorator, DrawdownDecorator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest # type: ignore
+
+from src.analytics import (
+    VolatilityDecorator, BetaDecorator, DrawdownDecorator, SharpeDecorator, VaRDecorator, kernel_for,
+)
 
 class DummyInstrument:
     symbol = "AAPL"
@@ -28,4 +35,80 @@ def test_stacking_decorators():
     d = DrawdownDecorator(b, [100, 120, 90, 110])
     m = d.get_metrics()
     for k in ("symbol", "volatility", "beta", "max_drawdown"):
-        assert k in m
\ No newline at end of file
+        assert k in m
+def test_stacked_decorators_share_one_kernel():
+    from src.analytics import SharpeDecorator, VaRDecorator
+    prices = [100, 102, 101, 103, 99, 104]
+    base = DummyInstrument()
+    v = VolatilityDecorator(base, prices)
+    d = DrawdownDecorator(v, list(prices))
+    s = SharpeDecorator(d, prices)
+    var = VaRDecorator(s, prices)
+    assert v.kernel is d.kernel is s.kernel is var.kernel
+    m = var.get_metrics()
+    for k in ("volatility", "max_drawdown", "sharpe", "var"):
+        assert k in m
+
+def test_metrics_match_pandas_definitions():
+    import pandas as pd # type: ignore
+    prices = [100, 102, 101, 103, 99, 104]
+    market = [200, 201, 203, 202, 204, 203]
+    m = BetaDecorator(DrawdownDecorator(VolatilityDecorator(DummyInstrument(), prices), prices),
+                      prices, market).get_metrics()
+    r = pd.Series(prices).pct_change().dropna()
+    rm = pd.Series(market).pct_change().dropna()
+    s = pd.Series(prices, dtype=float)
+    assert abs(m["volatility"] - r.std()) < 1e-12
+    assert abs(m["beta"] - r.cov(rm) / rm.var()) < 1e-12
+    assert abs(m["max_drawdown"] - (s / s.cummax() - 1).min()) < 1e-12
+
+def test_universe_metrics_match_per_instrument_decorators():
+    import numpy as np
+    import pandas as pd # type: ignore
+    from src.analytics import universe_metrics
+    from src.patterns.factory import InstrumentFactory
+    instruments = [
+        InstrumentFactory.create_instrument({"symbol": s, "name": s, "instrument_type": "Stock"})
+        for s in ("AAPL", "MSFT", "TSLA")
+    ]
+    rng = np.random.default_rng(5)
+    panel = pd.DataFrame(100 + rng.normal(0, 2, (30, 3)).cumsum(axis=0), columns=["AAPL", "MSFT", "TSLA"])
+    panel.iloc[3, 1] = np.nan
+    market = 200 + rng.normal(0, 1, 30).cumsum()
+
+    out = universe_metrics(panel, market, instruments)
+    assert set(out) == set(instruments)
+    for inst in instruments:
+        col = panel[inst.symbol].tolist()
+        single = DrawdownDecorator(BetaDecorator(VolatilityDecorator(inst, col), col, market), col).get_metrics()
+        for k in ("volatility", "beta", "max_drawdown"):
+            assert abs(out[inst][k] - single[k]) < 1e-12
+        assert out[inst]["symbol"] == inst.symbol
+
+def test_universe_metrics_rejects_duplicate_instruments():
+    import numpy as np
+    import pytest # type: ignore
+    from src.analytics import universe_metrics
+    from src.models import Stock
+    twice = [Stock("AAPL", "Apple", "Stock", "N/A", "USD")] * 2
+    with pytest.raises(ValueError):
+        universe_metrics(np.ones((5, 2)), np.ones(5), twice)
+
+def test_sharpe_and_var_use_the_decorator_parameters():
+    prices = [100, 102, 101, 103, 99, 104, 103, 105]
+    r = np.diff(prices) / prices[:-1]
+    daily = SharpeDecorator(DummyInstrument(), prices).get_metrics()["sharpe"]
+    monthly = SharpeDecorator(DummyInstrument(), prices, periods_per_year=12).get_metrics()["sharpe"]
+    assert monthly == pytest.approx(r.mean() / r.std(ddof=1) * np.sqrt(12))
+    assert daily == pytest.approx(monthly * np.sqrt(252 / 12))
+    var99 = VaRDecorator(DummyInstrument(), prices, var_level=0.99).get_metrics()["var"]
+    assert var99 == pytest.approx(-np.quantile(r, 0.01))
+    assert VaRDecorator(DummyInstrument(), prices).get_metrics()["var"] == pytest.approx(-np.quantile(r, 0.05))
+
+def test_kernel_for_is_shared_across_threads():
+    series = [np.arange(1.0, 50.0) + i for i in range(300)]
+    with ThreadPoolExecutor(8) as pool:
+        kernels = list(pool.map(kernel_for, series * 4))
+    for i, k in enumerate(kernels[-len(series):]):
+        assert np.array_equal(k.prices, series[i])
+    assert kernel_for(series[-1]) is kernels[-1]
@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta
+import pytest # type: ignore
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint
+from src.data_loader import ticks_to_panel
+from src.patterns.strategy import MeanReversionStrategy, BreakoutStrategy
+
+
+def _ticks(n=200, symbols=("AAPL", "MSFT", "TSLA"), seed=11):
+    rnd = random.Random(seed)
+    t0 = datetime(2024, 1, 2, 9, 30)
+    px = {s: 100.0 for s in symbols}
+    out = []
+    for i in range(n):
+        for s in symbols:
+            if rnd.random() < 0.8:  # leave gaps so the panel has NaNs
+                px[s] = round(px[s] + rnd.gauss(0, 1), 2)
+                out.append(MarketDataPoint(s, t0 + timedelta(minutes=i), px[s]))
+    return out
+
+@pytest.mark.parametrize("make", [lambda: MeanReversionStrategy(window=5, k=0.5),
+                                  lambda: BreakoutStrategy(lookback=10)])
+def test_batch_matches_tick_path(make, capsys):
+    ticks = _ticks()
+    tick_engine = Engine(StrategyTickAdapter(make()))
+    for t in ticks:
+        tick_engine.on_tick(t)
+
+    batch_engine = Engine(StrategyTickAdapter(make()))
+    batch_engine.run_batch(ticks_to_panel(ticks))
+
+    assert tick_engine.book["positions"]
+    assert batch_engine.book["positions"] == tick_engine.book["positions"]
+    assert batch_engine.book["cash"] == pytest.approx(tick_engine.book["cash"])
+
+def test_on_tick_executes_signal_through_invoker(capsys):
+    engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)))
+    for p in [100, 101, 105]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    assert engine.get_position("AAPL") == 2
+    engine.undo_last_trade()
+    assert engine.get_position("AAPL") == 1
+
+def test_micro_batched_engine_nets_to_same_book(capsys):
+    ticks = _ticks()
+    tick_engine = Engine(StrategyTickAdapter(MeanReversionStrategy(window=5, k=0.5)))
+    for t in ticks:
+        tick_engine.on_tick(t)
+
+    batched = Engine(StrategyTickAdapter(MeanReversionStrategy(window=5, k=0.5)), batch_ticks=16)
+    for t in ticks:
+        batched.on_tick(t)
+    batched.flush()
+
+    assert batched.book["positions"] == tick_engine.book["positions"]
+    assert batched.book["cash"] == pytest.approx(tick_engine.book["cash"])
+    assert len(batched.invoker) < len(tick_engine.invoker)
+
+def test_undo_reverts_whole_micro_batch(capsys):
+    engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=2)), batch_ticks=10)
+    for p in [100, 101, 105, 106]:
+        engine.on_tick(MarketDataPoint("AAPL", datetime(2024, 1, 2), p))
+    assert engine.get_position("AAPL") == 0  # still pending
+    assert engine.flush() == 1
+    assert engine.get_position("AAPL") == 3
+    engine.undo_last_trade()
+    assert engine.get_position("AAPL") == 0 and engine.book["cash"] == 1000000
@@ -47,4 +47,53 @@ def test_create_etf():
 def test_invalid_type_raises():
     bad = {"symbol": "X", "name": "Bad", "instrument_type": "Crypto"}
     with pytest.raises(ValueError):
-        InstrumentFactory.create_instrument(bad)
\ No newline at end of file
+        InstrumentFactory.create_instrument(bad)
+
+def test_from_csv_maps_header_aliases(tmp_path):
+    path = tmp_path / "instruments.csv"
+    path.write_text("symbol,type,price,sector,issuer,maturity,coupon\n"
+                    "AAPL,Stock,172.35,Technology,Apple Inc.,,\n"
+                    "US10Y,Bond,100.00,Government,US Treasury,2035-10-01,4.25\n"
+                    "SPY,ETF,430.50,Index,State Street,,\n", encoding="utf-8")
+    insts = InstrumentFactory.from_csv(path)
+    assert [type(i) for i in insts] == [Stock, Bond, ETF]
+    assert insts[0].name == "Apple Inc." and insts[0].exchange == "N/A"
+    assert insts[1] == Bond("US10Y", "US Treasury", "Bond", 4.25, "2035-10-01")
+    assert not hasattr(insts[0], "__dict__")
+    with pytest.raises(AttributeError):  # frozen, so hashing by value is safe
+        insts[0].name = "Apple"
+
+
+def test_iter_csv_chunks_and_registry(tmp_path):
+    from dataclasses import dataclass
+    from src.models import Instrument
+
+    @dataclass(frozen=True, slots=True)
+    class Future(Instrument):
+        expiry: str
+
+    InstrumentFactory.register("Future", Future, (("expiry", str, "N/A"),))
+    try:
+        path = tmp_path / "master.csv"
+        rows = [f"F{i},Fut {i},future,2025-12" for i in range(5)]
+        path.write_text("symbol,name,instrument_type,expiry\n" + "\n".join(rows), encoding="utf-8")
+        chunks = list(InstrumentFactory.iter_csv(path, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert chunks[0][0] == Future("F0", "Fut 0", "Future", "2025-12")
+    finally:
+        InstrumentFactory._registry.pop("future")
+
+
+def test_instrument_table_columns_and_filters():
+    from pathlib import Path
+    from patterns.factory import InstrumentTable
+
+    path = Path(__file__).resolve().parents[1] / "data" / "instruments.csv"
+    table = InstrumentTable.from_csv(path, chunk_size=2)
+    assert len(table) == 4
+    assert table.index["US10Y"] == 2
+    assert list(table["price"]) == [172.35, 328.10, 100.00, 430.50]
+    stocks = table.take(table.of_type("stock") & (table["price"] > 200))
+    assert list(stocks.symbols) == ["MSFT"]
+    assert table.instrument("US10Y") == InstrumentFactory.from_csv(path)[2]
+    assert table.row("SPY")["instrument_type"] == "ETF"
@@ -0,0 +1,91 @@
+import logging
+
+import numpy as np
+import pytest
+
+from src.engine import Engine
+from src.instrumentation import Instrumentation, LatencyHistogram
+from src.main import StrategyTickAdapter
+from src.bars import BarAggregator
+from src.models import MarketDataPoint
+from src.patterns.observer import AlertObserver, LoggerObserver, observer_labels
+from src.patterns.strategy import BreakoutStrategy
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(10, 1.5, 20000).astype(np.int64)
+    h = LatencyHistogram()
+    for v in values.tolist():
+        h.record(v)
+    assert h.count == len(values)
+    assert h.min == values.min() and h.max == values.max()
+    for p in (50, 90, 99, 99.9):
+        exact = np.percentile(values, p, method="inverted_cdf")
+        assert h.percentile(p) == pytest.approx(exact, rel=2 ** -6)
+
+
+def test_histogram_small_values_are_exact_and_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in (1, 2, 3):
+        a.record(v)
+    for v in (4, 5):
+        b.record(v)
+    a.merge(b)
+    assert (a.count, a.min, a.max, a.percentile(50)) == (5, 1, 5, 3)
+
+
+def _ticks():
+    prices = [10, 11, 12, 9, 8, 13, 14, 7, 15, 6]
+    return [MarketDataPoint("AAPL", None, p) for p in prices]
+
+
+def test_instrumented_engine_matches_plain_engine_and_records_stages(caplog):
+    plain = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    instr = Instrumentation()
+    timed = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)), instrumentation=instr)
+    for engine in (plain, timed):
+        engine.attach_observer(LoggerObserver())
+        engine.attach_observer(AlertObserver())
+        engine.attach_observer(LoggerObserver())
+        for t in _ticks():
+            engine.on_tick(t)
+
+    assert timed.book["cash"] == plain.book["cash"]
+    assert timed.get_position("AAPL") == plain.get_position("AAPL")
+
+    summary = instr.summary()
+    trades = summary["execute"]["count"]
+    assert summary["tick"]["count"] == summary["strategy"]["count"] == 10
+    assert summary["notify"]["count"] == trades == len(timed.invoker) > 0
+    for label in ("LoggerObserver", "AlertObserver", "LoggerObserver#1"):
+        assert summary[f"observer:{label}"]["count"] == trades
+
+    with caplog.at_level(logging.INFO, logger="instrumentation"):
+        instr.dump()
+    assert any("strategy" in r.getMessage() for r in caplog.records)
+
+
+def test_instrumented_batched_engine_times_listeners_separately(capsys):
+    def make(instr=None):
+        engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)),
+                        instrumentation=instr, batch_ticks=4)
+        engine.attach_tick_listener(BarAggregator(ticks=2))
+        engine.attach_observer(LoggerObserver())
+        for t in _ticks():
+            engine.on_tick(t)
+        engine.flush()
+        return engine
+
+    instr = Instrumentation()
+    plain, timed = make(), make(instr)
+    assert timed.book["cash"] == plain.book["cash"]
+    assert timed.book["positions"] == plain.book["positions"]
+    summary = instr.summary()
+    assert summary["listeners"]["count"] == summary["strategy"]["count"] == 10
+    assert summary["notify"]["count"] == summary["observer:LoggerObserver"]["count"] > 0
+
+
+def test_observer_labels():
+    assert observer_labels([LoggerObserver(), AlertObserver(), LoggerObserver()]) == [
+        "LoggerObserver", "AlertObserver", "LoggerObserver#1"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest # type: ignore
+from src.ledger import Ledger
+from src.patterns.command import ExecuteOrderCommand, CommandInvoker
+
+
+def test_dict_book_compatibility():
+    book = Ledger(cash=1000)
+    book["cash"] -= 200
+    book["positions"]["AAPL"] = book["positions"].get("AAPL", 0) + 2
+    assert book["cash"] == 800
+    assert book["positions"] == {"AAPL": 2.0}
+    assert book.symbols == ["AAPL"]
+
+
+def test_command_undo_redo_restores_position_and_avg_cost():
+    book = Ledger(cash=1000)
+    invoker = CommandInvoker()
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 2, 100))
+    invoker.do(ExecuteOrderCommand(book, "AAPL", "BUY", 2, 110))
+    assert book.avg_cost("AAPL") == 105
+    invoker.undo()
+    assert (book.position("AAPL"), book.avg_cost("AAPL"), book.cash) == (2, 100, 800)
+    invoker.redo()
+    assert (book.position("AAPL"), book.avg_cost("AAPL"), book.cash) == (4, 105, 580)
+
+
+def test_avg_cost_reduce_and_flip():
+    book = Ledger()
+    book.apply_fill("X", 10, 5.0)
+    book.apply_fill("X", -4, 9.0)
+    assert book.avg_cost("X") == 5.0
+    book.apply_fill("X", -10, 7.0)
+    assert (book.position("X"), book.avg_cost("X")) == (-4, 7.0)
+
+
+def test_apply_fills_batch_and_revert():
+    book = Ledger(cash=1000)
+    token = book.apply_fills(["A", "B", "A"], [1, 2, -3], [10.0, 20.0, 12.0])
+    assert book["positions"] == {"A": -2.0, "B": 2.0}
+    assert book.cash == pytest.approx(1000 - 10 - 40 + 36)
+    book.revert_fills(token)
+    assert book.cash == 1000
+    assert book.position_array.tolist() == [0.0, 0.0]
+
+
+def test_apply_fills_avg_cost_matches_sequential_fills():
+    rng = np.random.default_rng(3)
+    syms = rng.choice(["A", "B", "C"], 200).tolist()
+    qtys = rng.integers(-5, 6, 200).astype(float)
+    prices = rng.uniform(90, 110, 200).round(2)
+    batch, seq = Ledger(cash=1000), Ledger(cash=1000)
+    seq.apply_fill("A", -3, 100.0)
+    batch.apply_fill("A", -3, 100.0)
+    for start in range(0, 200, 25):
+        sl = slice(start, start + 25)
+        batch.apply_fills(syms[sl], qtys[sl], prices[sl])
+        for s, q, p in zip(syms[sl], qtys[sl], prices[sl]):
+            seq.apply_fill(s, q, p)
+    for s in "ABC":
+        assert batch.position(s) == seq.position(s)
+        assert batch.avg_cost(s) == pytest.approx(seq.avg_cost(s))
+    assert batch.cash == pytest.approx(seq.cash)
+
+
+def test_market_value_is_dot_product():
+    book = Ledger(cash=100)
+    book.apply_fills(["A", "B"], [2, 3], [0.0, 0.0])
+    assert book.market_value({"A": 10.0, "B": 1.0}) == 123.0
+    assert book.market_value(np.array([10.0, 1.0])) == 123.0
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+import sys
+import pytest # type: ignore
+from src.models import MarketDataPoint, TickBatch, intern_meta
+
+
+def test_market_data_point_is_slotted_and_frozen():
+    mdp = MarketDataPoint("AAPL", datetime(2020, 1, 1), 1.0)
+    assert not hasattr(mdp, "__dict__")
+    with pytest.raises(Exception):
+        mdp.price = 2.0
+
+
+def test_intern_meta_shares_one_read_only_mapping():
+    a = intern_meta({"source": "yahoo"})
+    b = intern_meta({"source": "yahoo"})
+    assert a is b and a == {"source": "yahoo"}
+    with pytest.raises(TypeError):
+        a["source"] = "other"
+
+
+def test_tick_batch_round_trip():
+    t = datetime(2025, 10, 1, 9, 30, tzinfo=timezone.utc)
+    ticks = [MarketDataPoint("AAPL", t, 1.5, intern_meta({"source": "yahoo"})),
+             MarketDataPoint("MSFT", t, 2.5, intern_meta({"source": "bloomberg"})),
+             MarketDataPoint("AAPL", t, 3.5, None)]
+    batch = TickBatch.from_ticks(ticks)
+    assert len(batch) == 3
+    assert batch.symbol_id.tolist() == [0, 1, 0]
+    assert batch.symbols == ["AAPL", "MSFT"]
+    assert list(batch) == ticks
+
+
+def test_tick_batch_rejects_mixed_naive_and_aware_times():
+    aware = datetime(2025, 10, 1, 9, 30, tzinfo=timezone.utc)
+    ticks = [MarketDataPoint("AAPL", aware.replace(tzinfo=None), 1.5), MarketDataPoint("AAPL", aware, 2.5)]
+    with pytest.raises(ValueError):
+        TickBatch.from_ticks(ticks)
+    with pytest.raises(ValueError):
+        TickBatch.from_ticks(ticks[::-1])
+
+
+def test_signal_slots_and_dict_protocol():
+    from src.models import BUY, SELL, Order, Signal
+
+    s = Signal("AAPL", "buy", 2, 101.5)
+    assert not hasattr(s, "__dict__")
+    assert Order is Signal
+    assert s.side_code == BUY and s["side"] == "BUY"
+    assert s.get("price") == 101.5 and s.get("time", "n/a") == "n/a"
+    assert s.setdefault("qty", 9) == 2
+    s["side"] = "SELL"
+    assert s.side_code == SELL
+    assert s == {"symbol": "AAPL", "side": "SELL", "qty": 2, "price": 101.5}
+    assert Signal.from_dict({"symbol": "MSFT", "side": "BUY"}).qty == 1
+    assert s.symbol is sys.intern("AAPL")
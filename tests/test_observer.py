@@ -1,4 +1,5 @@
-from src.patterns.observer import SignalPublisher, LoggerObserver, AlertObserver
+import threading
+from src.patterns.observer import SignalPublisher, AsyncSignalPublisher, LoggerObserver, AlertObserver
 
 def test_logger_and_alert_observers():
     pub = SignalPublisher()
@@ -17,4 +18,63 @@ def test_logger_and_alert_observers():
     sig2 = {"symbol": "GOOG", "qty": 5, "price": 2000}
     pub.notify(sig2)
     assert alert.alerts[-1]["symbol"] == "GOOG"
-    assert len(logger.log) == 2
\ No newline at end of file
+    assert len(logger.log) == 2
+
+
+def test_async_publisher_delivers_batches():
+    logger = LoggerObserver()
+    alert = AlertObserver()
+    with AsyncSignalPublisher(batch_size=8) as pub:
+        pub.attach(logger)
+        pub.attach(alert)
+        for i in range(50):
+            pub.notify({"symbol": "AAPL", "qty": 1, "price": 999 + i})
+        assert pub.flush(timeout=5)
+        metrics = pub.lag_metrics()
+    assert [s["price"] for s in logger.log] == [999 + i for i in range(50)]
+    assert len(alert.alerts) == 48  # prices 1001..1048
+    assert metrics["LoggerObserver"]["delivered"] == 50
+    assert metrics["LoggerObserver"]["batches"] >= 50 // 8
+
+
+class _Gate:
+    """Observer that blocks the dispatch thread until released."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        self.seen = []
+
+    def update(self, signal):
+        self.entered.set()
+        self.release.wait(5)
+        self.seen.append(signal)
+
+
+def _stalled(policy):
+    gate = _Gate()
+    pub = AsyncSignalPublisher(capacity=2, batch_size=1, policy=policy)
+    pub.attach(gate)
+    pub.notify({"symbol": "X", "price": 0})
+    assert gate.entered.wait(5)  # worker is now stuck on the first signal
+    return pub, gate
+
+
+def test_drop_oldest_policy():
+    pub, gate = _stalled("drop_oldest")
+    for i in range(1, 5):
+        pub.notify({"symbol": "X", "price": i})
+    gate.release.set()
+    pub.close(timeout=5)
+    assert [s["price"] for s in gate.seen] == [0, 3, 4]
+    assert pub.dropped == 2
+
+
+def test_coalesce_policy_keeps_latest_per_symbol():
+    pub, gate = _stalled("coalesce")
+    for i in range(1, 5):
+        pub.notify({"symbol": "X", "price": i})
+    pub.notify({"symbol": "Y", "price": 9})
+    gate.release.set()
+    pub.close(timeout=5)
+    assert [(s["symbol"], s["price"]) for s in gate.seen] == [("X", 0), ("X", 4), ("Y", 9)]
+    assert pub.coalesced == 3
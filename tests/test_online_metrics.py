@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import VolatilityDecorator, BetaDecorator, DrawdownDecorator
+from src.online_metrics import (
+    OnlineVolatility, OnlineBeta, OnlineDrawdown, OnlineMetricsTracker,
+)
+from src.models import MarketDataPoint
+
+
+class DummyInstrument:
+    symbol = "AAPL"
+    name = "Apple"
+    instrument_type = "Stock"
+
+
+def _walk(n, seed):
+    rng = np.random.default_rng(seed)
+    return (100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))).tolist()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 50])
+def test_cumulative_matches_decorators(n):
+    p, m = _walk(n, 1), _walk(n, 2)
+    vol, beta, dd = OnlineVolatility(), OnlineBeta(), OnlineDrawdown()
+    for x, y in zip(p, m):
+        vol.update(x)
+        beta.update(x, y)
+        dd.update(x)
+    batch = DrawdownDecorator(BetaDecorator(VolatilityDecorator(DummyInstrument(), p), p, m), p).get_metrics()
+    for key, got in (("volatility", vol.value), ("beta", beta.value), ("max_drawdown", dd.max_drawdown)):
+        want = batch[key]
+        assert (math.isnan(got) and math.isnan(want)) or got == pytest.approx(want, rel=1e-9, abs=1e-12)
+
+
+def test_window_matches_trailing_slice():
+    p, m = _walk(60, 3), _walk(60, 4)
+    vol, beta = OnlineVolatility(window=10), OnlineBeta(window=10)
+    for x, y in zip(p, m):
+        vol.update(x)
+        beta.update(x, y)
+    assert vol.value == pytest.approx(VolatilityDecorator(DummyInstrument(), p[-11:]).get_metrics()["volatility"])
+    assert beta.value == pytest.approx(BetaDecorator(DummyInstrument(), p[-11:], m[-11:]).get_metrics()["beta"])
+
+
+def test_window_recovers_after_a_spike_leaves_it():
+    rng = np.random.default_rng(5)
+    calm = (1000 * np.exp(np.cumsum(rng.normal(0, 1e-7, 30)))).tolist()
+    p = [1.0, 1000.0] + calm
+    vol = OnlineVolatility(window=5)
+    for x in p:
+        vol.update(x)
+    want = VolatilityDecorator(DummyInstrument(), p[-6:]).get_metrics()["volatility"]
+    assert vol.value == pytest.approx(want, rel=1e-6)
+
+def test_window_drawdown_forgets_old_peak():
+    dd = OnlineDrawdown(window=3)
+    for x in [100, 50, 60, 70, 80, 90]:
+        dd.update(x)
+    assert dd.peak == 90
+    assert dd.max_drawdown == 0.0
+
+
+def test_ew_volatility_matches_pandas_adjust_false():
+    p = _walk(40, 5)
+    vol = OnlineVolatility(alpha=0.2)
+    for x in p:
+        vol.update(x)
+    r = pd.Series(p).pct_change().dropna()
+    want = math.sqrt(r.ewm(alpha=0.2, adjust=False).var(bias=True).iloc[-1])
+    assert vol.value == pytest.approx(want)
+
+
+def test_tracker_on_engine_tick_flow():
+    from src.engine import Engine
+
+    class Quiet:
+        def generate_signals(self, tick):
+            return []
+
+    engine = Engine(Quiet())
+    tracker = OnlineMetricsTracker(market_symbol="SPY")
+    engine.attach_tick_listener(tracker)
+    p, m = _walk(20, 6), _walk(20, 7)
+    for t, (x, y) in enumerate(zip(p, m)):
+        engine.on_tick(MarketDataPoint("SPY", pd.Timestamp(t, unit="s"), y))
+        engine.on_tick(MarketDataPoint("AAPL", pd.Timestamp(t, unit="s"), x))
+    got = tracker.get_metrics("AAPL")
+    assert got["volatility"] == pytest.approx(VolatilityDecorator(DummyInstrument(), p).get_metrics()["volatility"])
+    assert got["beta"] == pytest.approx(BetaDecorator(DummyInstrument(), p, m).get_metrics()["beta"])
+    assert tracker.get_metrics("SPY")["beta"] == pytest.approx(1.0)
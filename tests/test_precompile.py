@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src import precompile
+from src.models import Bond
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cache_roundtrip_and_staleness(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text('{"strategy_params": {"breakout": {"lookback": 7}}}', encoding="utf-8")
+    inst = tmp_path / "instruments.csv"
+    inst.write_text("symbol,type,issuer,maturity\nUS10Y,Bond,US Treasury,2035-10-01\n", encoding="utf-8")
+    cache = tmp_path / "cache.pickle"
+
+    assert precompile.lookup("config", cfg, cache) is None  # no cache yet
+    precompile.build(cfg, inst, cache)
+    assert precompile.lookup("config", cfg, cache) == {"strategy_params": {"breakout": {"lookback": 7}}}
+    assert precompile.load_instruments(inst, cache) == [Bond("US10Y", "US Treasury", "Bond", 0.0, "2035-10-01")]
+
+    cfg.write_text('{"changed": true}', encoding="utf-8")
+    os.utime(cfg, ns=(0, 1))
+    assert precompile.lookup("config", cfg, cache) is None
+    assert precompile.load_config(cfg, cache) == {"changed": True}
+
+
+def test_main_import_does_not_load_pandas():
+    code = "import sys, src.main; print('pandas' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint
+from src.patterns.observer import LoggerObserver
+from src.patterns.strategy import MeanReversionStrategy
+from src.sharded_engine import ShardedEngine, ShardError, shard_of
+
+
+class _Failing:
+    """Tick strategy that raises (or kills its process) on the 'BOOM' symbol."""
+    def __init__(self, hard=False):
+        self.hard = hard
+
+    def generate_signals(self, tick):
+        if tick.symbol == "BOOM":
+            if self.hard:
+                os._exit(3)
+            raise ValueError("bad tick")
+        return []
+
+
+def _ticks(n=200, symbols=("AAPL", "MSFT", "TSLA", "NVDA", "AMZN"), seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, len(symbols))), axis=0))
+    return [MarketDataPoint(sym, pd.Timestamp(t, unit="s"), float(prices[t, j]))
+            for t in range(n) for j, sym in enumerate(symbols)]
+
+
+def test_shard_of_is_stable_and_in_range():
+    assert shard_of("AAPL", 4) == shard_of("AAPL", 4)
+    assert {shard_of(s, 3) for s in ("AAPL", "MSFT", "TSLA", "NVDA", "AMZN", "IBM")} <= {0, 1, 2}
+
+
+def test_sharded_book_matches_single_engine():
+    ticks = _ticks()
+    single = Engine(StrategyTickAdapter(MeanReversionStrategy(window=5, k=1.0)))
+    for t in ticks:
+        single.on_tick(t)
+
+    with ShardedEngine(StrategyTickAdapter(MeanReversionStrategy(window=5, k=1.0)),
+                       shards=3, batch_size=64) as sharded:
+        sharded.on_ticks(ticks[:500])
+        mid = sharded.sync()
+        assert sharded.ticks_processed == 500
+        assert set(mid.symbols) <= set(single.book.symbols)
+        sharded.on_ticks(ticks[500:])
+    book = sharded.book
+
+    assert sharded.ticks_processed == len(ticks)
+    assert book["cash"] == pytest.approx(single.book["cash"])
+    for sym in single.book.symbols:
+        assert book.position(sym) == single.book.position(sym)
+        assert book.avg_cost(sym) == pytest.approx(single.book.avg_cost(sym))
+
+
+def test_observers_run_inside_workers_and_come_back(capsys):
+    ticks = _ticks(n=100)
+    with ShardedEngine(StrategyTickAdapter(MeanReversionStrategy(window=5, k=1.0)),
+                       shards=2, observers=[LoggerObserver()]) as sharded:
+        sharded.on_ticks(ticks)
+    logged = sum(len(obs[0].log) for obs in sharded.shard_observers.values())
+    assert set(sharded.shard_observers) == {0, 1}
+    assert logged > 0
+
+
+@pytest.mark.parametrize("hard, match", [(False, "ValueError: bad tick"), (True, "exited with code 3")])
+def test_failing_worker_raises_instead_of_hanging(hard, match):
+    with pytest.raises(ShardError, match=match):
+        with ShardedEngine(_Failing(hard), shards=2, poll_s=0.1) as sharded:
+            sharded.on_ticks([MarketDataPoint("BOOM", pd.Timestamp(0, unit="s"), 1.0)])
+            sharded.sync()
@@ -25,4 +25,33 @@ def test_breakout_up_and_down():
 
 def test_breakout_empty():
     strat = BreakoutStrategy(lookback=3)
-    assert strat.generate_signals([]) == []
\ No newline at end of file
+    assert strat.generate_signals([]) == []
+
+def _random_walk(n, seed=7):
+    import random
+    rnd = random.Random(seed)
+    p, out = 100.0, []
+    for _ in range(n):
+        p += rnd.gauss(0, 1)
+        out.append(round(p, 2))
+    return out
+
+def test_mean_reversion_update_matches_batch():
+    prices = _random_walk(300)
+    strat = MeanReversionStrategy(window=10, k=0.8)
+    streamed = [strat.update(p) for p in prices]
+    assert streamed == strat.generate_signals(prices)
+
+def test_breakout_update_matches_batch():
+    prices = _random_walk(300, seed=3)
+    strat = BreakoutStrategy(lookback=7)
+    streamed = [strat.update(p) for p in prices]
+    assert streamed == strat.generate_signals(prices)
+
+def test_clone_has_fresh_state():
+    strat = BreakoutStrategy(lookback=3)
+    for p in [100, 101, 102]:
+        strat.update(p)
+    twin = strat.clone()
+    assert twin.lookback == 3
+    assert twin.update(50) == 0  # no prior window yet
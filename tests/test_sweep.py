@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine import Engine
+from src.patterns.strategy import MeanReversionStrategy, BreakoutStrategy
+from src.sweep import expand_grid, sweep
+
+
+def _panel(n=300, symbols=("AAPL", "MSFT", "TSLA"), seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, len(symbols))), axis=0))
+    panel = pd.DataFrame(prices, columns=list(symbols))
+    panel.iloc[::7, 1] = np.nan  # a gappy column
+    return panel
+
+
+def test_expand_grid():
+    assert expand_grid({"window": [5, 10], "k": [1.0]}) == [{"window": 5, "k": 1.0}, {"window": 10, "k": 1.0}]
+
+
+def test_sweep_row_matches_engine_run_batch():
+    panel = _panel()
+    out = sweep(MeanReversionStrategy, {"window": [5, 20], "k": [0.5, 1.5]}, panel, max_workers=0)
+    assert list(out["rank"]) == [1, 2, 3, 4]
+    assert out["pnl"].is_monotonic_decreasing
+
+    row = out[(out.window == 20) & (out.k == 0.5)].iloc[0]
+    engine = Engine(MeanReversionStrategy(window=20, k=0.5))
+    res = engine.run_batch(panel)
+    assert row["trades"] == int((res["signals"] != 0).sum().sum())
+    value = engine.get_portfolio_value(panel.ffill().iloc[-1].to_dict())
+    assert row["pnl"] == pytest.approx(value - 1000000)
+
+
+def test_process_pool_matches_in_process():
+    panel = _panel(seed=1)
+    grid = {"lookback": [3, 5, 10, 20, 40]}
+    serial = sweep(BreakoutStrategy, grid, panel, max_workers=0)
+    parallel = sweep(BreakoutStrategy, grid, panel, max_workers=2)
+    pd.testing.assert_frame_equal(serial, parallel)
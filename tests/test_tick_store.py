@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+import pytest # type: ignore
+from src.engine import Engine
+from src.main import StrategyTickAdapter
+from src.models import MarketDataPoint, intern_meta
+from src.patterns.strategy import BreakoutStrategy
+from src.tick_store import write_tick_store, TickStoreReader, to_ns
+
+
+def _ticks():
+    t0 = datetime(2024, 1, 2, 9, 30)
+    out = []
+    for i in range(50):
+        out.append(MarketDataPoint("MSFT", t0 + timedelta(seconds=i), 300.0 + (i % 7)))
+        if i % 2 == 0:
+            out.append(MarketDataPoint("AAPL", t0 + timedelta(seconds=i), 100.0 + (i % 5)))
+    return out
+
+
+def test_round_trip_in_time_order(tmp_path):
+    ticks = _ticks()
+    write_tick_store(tmp_path / "store", ticks)
+    reader = TickStoreReader(tmp_path / "store")
+    assert len(reader) == len(ticks)
+    assert reader.symbols == ["MSFT", "AAPL"]
+    replay = list(reader.iter_ticks(chunk_size=7))
+    assert [(t.symbol, t.time, t.price) for t in replay] == [(t.symbol, t.time, t.price) for t in ticks]
+
+
+def test_round_trip_keeps_tick_meta(tmp_path):
+    t0 = datetime(2024, 1, 2, 9, 30, tzinfo=timezone.utc)
+    ticks = [MarketDataPoint("AAPL", t0, 1.0, intern_meta({"source": "yahoo"})),
+             MarketDataPoint("AAPL", t0 + timedelta(seconds=1), 2.0, intern_meta({"source": "bloomberg"})),
+             MarketDataPoint("MSFT", t0 + timedelta(seconds=2), 3.0)]
+    reader = write_tick_store(tmp_path / "store", ticks)
+    assert list(reader.iter_ticks()) == ticks
+
+
+def test_mixed_naive_and_aware_ticks_are_rejected(tmp_path):
+    t0 = datetime(2024, 1, 2, 9, 30)
+    ticks = [MarketDataPoint("AAPL", t0, 1.0), MarketDataPoint("AAPL", t0.replace(tzinfo=timezone.utc), 2.0)]
+    with pytest.raises(ValueError):
+        write_tick_store(tmp_path / "store", ticks)
+
+
+def test_symbol_time_slice_is_zero_copy_view(tmp_path):
+    reader = write_tick_store(tmp_path / "store", _ticks())
+    t0 = datetime(2024, 1, 2, 9, 30)
+    times, prices = reader.slice("AAPL", t0 + timedelta(seconds=10), t0 + timedelta(seconds=20))
+    assert times.tolist() == [to_ns(t0 + timedelta(seconds=s)) for s in range(10, 20, 2)]
+    assert prices.tolist() == [100.0 + (s % 5) for s in range(10, 20, 2)]
+    assert not prices.flags.owndata
+
+
+def test_batch_replay_from_store_matches_ticks(tmp_path, capsys):
+    ticks = _ticks()
+    reader = write_tick_store(tmp_path / "store", ticks)
+
+    tick_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    for t in reader.iter_ticks():
+        tick_engine.on_tick(t)
+    batch_engine = Engine(StrategyTickAdapter(BreakoutStrategy(lookback=3)))
+    batch_engine.run_batch(reader.to_panel())
+
+    assert batch_engine.book["positions"] == tick_engine.book["positions"]